@@ -6,8 +6,13 @@ import asyncio
 import json
 import sqlite3
 import re
-from datetime import datetime, timezone, date
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone, date, timedelta
 from typing import List, Optional, Union, Any, Dict, Tuple
+from urllib.parse import urlparse, parse_qs
 
 import discord
 from discord.ext import commands
@@ -18,14 +23,83 @@ load_dotenv()
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, "rocket.db")
 
+# ─── Database access ─────────────────────────────
+DB_READER_THREADS = 3
+
+
+class Database:
+    """Long-lived SQLite connections (WAL mode) used from worker threads.
+
+    All writes go through one writer thread, so they are serialized without
+    blocking the event loop; reads run on a small pool of reader threads,
+    which WAL lets proceed while a write is in progress. Each thread keeps
+    its own connection.
+    """
+
+    def __init__(self, path: str, readers: int = DB_READER_THREADS):
+        self.path = path
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+        self._readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="db-reader")
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None)  # autocommit; transaction() opens its own
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+        return conn
+
+    async def _run(self, executor: ThreadPoolExecutor, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+    async def execute(self, sql: str, params: tuple = ()) -> int:
+        """Run one write statement; returns the affected row count."""
+        return await self._run(self._writer, lambda: self._conn().execute(sql, params).rowcount)
+
+    async def executemany(self, sql: str, seq: list) -> int:
+        return await self._run(self._writer, lambda: self._conn().executemany(sql, seq).rowcount)
+
+    async def fetchone(self, sql: str, params: tuple = ()) -> Optional[tuple]:
+        return await self._run(self._readers, lambda: self._conn().execute(sql, params).fetchone())
+
+    async def fetchall(self, sql: str, params: tuple = ()) -> List[tuple]:
+        return await self._run(self._readers, lambda: self._conn().execute(sql, params).fetchall())
+
+    async def transaction(self, fn):
+        """Run fn(cursor) on the writer thread inside BEGIN IMMEDIATE ... COMMIT
+        (rolled back if fn raises). Returns fn's result."""
+        def run():
+            conn = self._conn()
+            c = conn.cursor()
+            c.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(c)
+            except BaseException:
+                c.execute("ROLLBACK")
+                raise
+            c.execute("COMMIT")
+            return result
+        return await self._run(self._writer, run)
+
+
+db = Database(DB_PATH)
+
 # ─── Daily Limits ─────────────────────────────
 ADMIN_DATE_LIMIT_PER_DAY = 5
 USER_DATE_LIMIT_PER_DAY = 3
 
 # ─── DB Init ─────────────────────────────
-def init_db():
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
+# Schema changes are numbered migrations: MIGRATIONS[n - 1] upgrades a database
+# from PRAGMA user_version n - 1 to n. Append new steps, never edit applied ones.
+# Every statement is IF NOT EXISTS, so databases created before the version was
+# tracked (user_version 0) adopt the current schema without losing rows.
+BACKFILL_CHUNK_SIZE = 500
+
+
+def _migrate_e_date_records(c: sqlite3.Cursor):
     # Single source of truth for all e-date activity
     c.execute(
         """
@@ -41,57 +115,745 @@ def init_db():
         )
         """
     )
-    conn.commit()
-    conn.close()
 
 
-async def reset_heartthrob_role(guild: discord.Guild, role_name: str, top_member_id: int) -> Optional[discord.Role]:
-    """Remove the Heartthrob role from anyone except the top scorer."""
-    role = discord.utils.get(guild.roles, name=role_name)
-    if not role:
-        return None
+def _migrate_gems(c: sqlite3.Cursor):
+    # Gems balances (replaces the "name - id - points" leaderboard message)
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS gems_ledger (
+            user_id INTEGER PRIMARY KEY,  -- Discord user id
+            name TEXT,                    -- last known display name
+            gems INTEGER NOT NULL DEFAULT 0,
+            updated_at TEXT               -- full ISO timestamp
+        )
+        """
+    )
+    c.execute("CREATE INDEX IF NOT EXISTS idx_gems_ledger_gems ON gems_ledger (gems DESC)")
+    # Message ids of every page a ChannelMirror owns, so restarts edit instead of re-posting
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS mirror_pages (
+            channel_id INTEGER,
+            page INTEGER,
+            message_id INTEGER,
+            PRIMARY KEY (channel_id, page)
+        )
+        """
+    )
+    # Applied gem transactions, so a retried purchase/transfer/grant is not applied twice
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS gem_transactions (
+            idem_key TEXT PRIMARY KEY,    -- e.g. "buy:<interaction id>"
+            kind TEXT,                    -- 'credit' | 'debit' | 'transfer' | 'purchase'
+            result TEXT,                  -- JSON {user_id: balance} returned to the caller
+            created_at TEXT
+        )
+        """
+    )
+
+
+def _migrate_daily_quests(c: sqlite3.Cursor):
+    # Daily quest completions; one row per finished quest, pruned after a few days
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS daily_quests (
+            date TEXT,                    -- server-local date (YYYY-MM-DD)
+            guild_id INTEGER,
+            user_id INTEGER,
+            quest_id TEXT,                -- key of DAILY_QUESTS
+            completed_at TEXT,
+            PRIMARY KEY (date, guild_id, user_id, quest_id)
+        )
+        """
+    )
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS daily_quest_claims (
+            date TEXT,
+            guild_id INTEGER,
+            user_id INTEGER,
+            claimed_at TEXT,
+            PRIMARY KEY (date, guild_id, user_id)
+        )
+        """
+    )
+
+
+def _migrate_dial_reports(c: sqlite3.Cursor):
+    # Rocket Dial reports, mirrored from the ADMIN_REPORTED/REPORTER_MEMBERS channels
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS dial_reports (
+            kind TEXT,                    -- 'reported' | 'reporter'
+            user_id INTEGER,
+            name TEXT,                    -- alias (reported) or display name (reporter)
+            count INTEGER NOT NULL DEFAULT 0,
+            reason TEXT,
+            message_id INTEGER,           -- admin channel message showing this row
+            updated_at TEXT,
+            PRIMARY KEY (kind, user_id)
+        )
+        """
+    )
+    c.execute("CREATE INDEX IF NOT EXISTS idx_dial_reports_message ON dial_reports (message_id)")
+
+
+def _migrate_catch_records(c: sqlite3.Cursor):
+    # Pokémon catch event totals per guild
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS catch_records (
+            guild_id INTEGER,
+            user_id INTEGER,
+            name TEXT,                    -- last known display name
+            catches INTEGER NOT NULL DEFAULT 0,
+            updated_at TEXT,
+            PRIMARY KEY (guild_id, user_id)
+        )
+        """
+    )
+    c.execute("CREATE INDEX IF NOT EXISTS idx_catch_records_rank ON catch_records (guild_id, catches DESC)")
+
+
+def _migrate_inventory(c: sqlite3.Cursor):
+    # Pokebag items (replaces the "name - id | emoji Nx item" inventory message)
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS inventory_owners (
+            user_id INTEGER PRIMARY KEY,
+            name TEXT                     -- last known display name
+        )
+        """
+    )
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS inventory_items (
+            user_id INTEGER,
+            emoji TEXT,
+            item_name TEXT,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, emoji, item_name)
+        )
+        """
+    )
+    c.execute("CREATE INDEX IF NOT EXISTS idx_inventory_items_emoji ON inventory_items (emoji)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_inventory_items_name ON inventory_items (item_name COLLATE NOCASE)")
+
+
+def _migrate_e_date_points(c: sqlite3.Cursor):
+    # Covering indexes for the daily limit, pending lookup and incoming history queries
+    c.execute(
+        "CREATE INDEX IF NOT EXISTS idx_e_date_sent ON e_date_records (guild_id, e_date_sender_id, date)"
+    )
+    c.execute(
+        "CREATE INDEX IF NOT EXISTS idx_e_date_pending "
+        "ON e_date_records (guild_id, e_date_sender_id, user_id, status)"
+    )
+    c.execute(
+        "CREATE INDEX IF NOT EXISTS idx_e_date_incoming "
+        "ON e_date_records (guild_id, user_id, timestamp DESC, date, e_date_sender_id, status, reason)"
+    )
+    # Accepted e-dates per member, kept current by update_status (read by `.tr datelb`)
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS e_date_points (
+            guild_id INTEGER,
+            user_id INTEGER,
+            points INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (guild_id, user_id)
+        )
+        """
+    )
+    c.execute("CREATE INDEX IF NOT EXISTS idx_e_date_points_rank ON e_date_points (guild_id, points DESC)")
+    # Progress of chunked backfills queued by migrations (see run_backfills)
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_backfills (
+            name TEXT PRIMARY KEY,
+            last_id INTEGER NOT NULL DEFAULT 0,  -- highest rowid already processed
+            end_id INTEGER NOT NULL DEFAULT 0,   -- highest rowid when the backfill was queued
+            done_at TEXT
+        )
+        """
+    )
+    c.execute("SELECT 1 FROM e_date_points LIMIT 1")
+    if c.fetchone() is None:
+        _register_backfill(c, "e_date_points", "e_date_records")
+
+
+def _migrate_legacy_import(c: sqlite3.Cursor):
+    # Lightning Round totals (replaces the "name - id | score" admin message)
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS lightning_scores (
+            user_id INTEGER PRIMARY KEY,
+            name TEXT,                    -- last known display name
+            score INTEGER NOT NULL DEFAULT 0,
+            updated_at TEXT
+        )
+        """
+    )
+    c.execute("CREATE INDEX IF NOT EXISTS idx_lightning_scores_rank ON lightning_scores (score DESC)")
+    # Resumable progress of the legacy channel import (RocketBackfill), one row per source
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS legacy_imports (
+            source TEXT PRIMARY KEY,      -- 'gems' | 'inventory' | 'lightning' | 'daily_quests' | 'reported' | 'reporter'
+            channel_id INTEGER,
+            before_id INTEGER,            -- oldest message imported so far; the next page starts below it
+            messages INTEGER NOT NULL DEFAULT 0,
+            parsed INTEGER NOT NULL DEFAULT 0,
+            inserted INTEGER NOT NULL DEFAULT 0,
+            skipped INTEGER NOT NULL DEFAULT 0,
+            started_at TEXT,
+            done_at TEXT
+        )
+        """
+    )
+
+
+def _migrate_news_tickers(c: sqlite3.Cursor):
+    # Rocket News tickers still animating, so a restart resumes them
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS news_tickers (
+            message_id INTEGER PRIMARY KEY,
+            channel_id INTEGER,
+            title TEXT,
+            details TEXT,
+            ticker TEXT,
+            position INTEGER NOT NULL DEFAULT 0,  -- current rotation offset into ticker
+            started_at TEXT,
+            last_activity_at TEXT                 -- last reaction on the announcement
+        )
+        """
+    )
+
+
+def _migrate_dial_webhooks(c: sqlite3.Cursor):
+    # Rocket Dial webhook pool: one reusable webhook per dial channel
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS dial_webhooks (
+            channel_id INTEGER PRIMARY KEY,
+            webhook_id INTEGER NOT NULL,
+            token TEXT NOT NULL
+        )
+        """
+    )
+
+
+def _migrate_drawing_submissions(c: sqlite3.Cursor):
+    # Image submissions in the drawing channel (one row per message; a user's latest is the highest id)
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS drawing_submissions (
+            message_id INTEGER PRIMARY KEY,
+            user_id INTEGER NOT NULL,
+            url TEXT,
+            width INTEGER,
+            height INTEGER
+        )
+        """
+    )
+    c.execute("CREATE INDEX IF NOT EXISTS idx_drawing_submissions_user ON drawing_submissions(user_id, message_id)")
+
+
+def _migrate_legacy_import_users(c: sqlite3.Cursor):
+    # Users whose legacy line is accounted for, per source: imported already, or
+    # present in SQLite when the import started (so their row includes it)
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS legacy_import_users (
+            source TEXT,
+            user_id INTEGER,
+            PRIMARY KEY (source, user_id)
+        )
+        """
+    )
+
+
+MIGRATIONS = [
+    _migrate_e_date_records,
+    _migrate_gems,
+    _migrate_daily_quests,
+    _migrate_dial_reports,
+    _migrate_catch_records,
+    _migrate_inventory,
+    _migrate_e_date_points,
+    _migrate_legacy_import,
+    _migrate_news_tickers,
+    _migrate_dial_webhooks,
+    _migrate_drawing_submissions,
+    _migrate_legacy_import_users,
+]
+
+
+def _register_backfill(c: sqlite3.Cursor, name: str, table: str):
+    """Queue an online backfill over the rows of `table` that exist right now.
+    Rows added later are maintained by the normal write path."""
+    c.execute(
+        f"INSERT OR IGNORE INTO schema_backfills (name, end_id) SELECT ?, COALESCE(MAX(rowid), 0) FROM {table}",
+        (name,)
+    )
+
+
+def backfill_pending(c: sqlite3.Cursor, name: str, row_id: int) -> bool:
+    """True if backfill `name` has not reached row_id yet, so the write path must leave
+    that row to the backfill (otherwise it would be counted twice)."""
+    c.execute("SELECT last_id, end_id FROM schema_backfills WHERE name=? AND done_at IS NULL", (name,))
+    row = c.fetchone()
+    return bool(row) and row[0] < row_id <= row[1]
+
+
+def _backfill_e_date_points(c: sqlite3.Cursor, after_id: int, end_id: int):
+    c.execute(
+        """
+        INSERT INTO e_date_points (guild_id, user_id, points)
+        SELECT guild_id, uid, COUNT(*) FROM (
+            SELECT guild_id, user_id AS uid FROM e_date_records WHERE status='yes' AND id > ? AND id <= ?
+            UNION ALL
+            SELECT guild_id, e_date_sender_id FROM e_date_records WHERE status='yes' AND id > ? AND id <= ?
+        )
+        GROUP BY guild_id, uid
+        ON CONFLICT(guild_id, user_id) DO UPDATE SET points = points + excluded.points
+        """,
+        (after_id, end_id, after_id, end_id)
+    )
+
+
+# Backfill name -> fn(cursor, after_id, end_id) processing rowids in (after_id, end_id]
+BACKFILLS = {
+    "e_date_points": _backfill_e_date_points,
+}
+
+
+async def run_backfills(chunk_size: int = BACKFILL_CHUNK_SIZE):
+    """Work through queued backfills one chunk per transaction, yielding to the
+    event loop between chunks. Progress is stored, so a restart resumes."""
+    for name, fn in BACKFILLS.items():
+        while True:
+            def step(c: sqlite3.Cursor) -> Optional[bool]:
+                c.execute("SELECT last_id, end_id FROM schema_backfills WHERE name=? AND done_at IS NULL", (name,))
+                row = c.fetchone()
+                if not row:
+                    return None  # nothing queued
+                last_id, end_id = row
+                upto = min(last_id + chunk_size, end_id)
+                if upto > last_id:
+                    fn(c, last_id, upto)
+                c.execute(
+                    "UPDATE schema_backfills SET last_id=?, done_at=? WHERE name=?",
+                    (upto, iso_now() if upto >= end_id else None, name)
+                )
+                return upto < end_id
 
-    for member in guild.members:
-        if role in member.roles and member.id != top_member_id:
             try:
-                await member.remove_roles(role, reason="Reset Heartthrob role")
+                more = await db.transaction(step)
             except Exception as e:
-                print(f"[ERROR] Cannot remove role from {member}: {e}")
-    return role
+                print(f"[ERROR] Backfill {name} failed: {e}")
+                break
+            if more is None:
+                break
+            if not more:
+                print(f"[DEBUG] Backfill {name} complete")
+                break
+            await asyncio.sleep(0)
+
+
+async def init_db():
+    """Apply pending migrations (each in its own transaction, together with its
+    user_version bump), then start the online backfills in the background."""
+    (version,) = await db.fetchone("PRAGMA user_version")
+    for number, migrate in enumerate(MIGRATIONS, start=1):
+        if number <= version:
+            continue
+
+        def apply(c: sqlite3.Cursor, migrate=migrate, number=number):
+            migrate(c)
+            c.execute(f"PRAGMA user_version = {number}")
+
+        await db.transaction(apply)
+        print(f"[DEBUG] Applied migration {number}: {migrate.__name__}")
+    return asyncio.create_task(run_backfills())
+
+
+# ─── Title roles ─────────────────────────────
+ROLE_EDIT_INTERVAL = 0.5  # seconds between role edits in one guild
+
+
+class RoleReconciler:
+    """Keeps leaderboard title roles (Heartthrob, Rocket Elites, Lightning Ace, ...)
+    on exactly the desired members.
+
+    set_holders() only records the desired holders and returns; a worker per
+    guild diffs role.members against that set and applies the minimal adds and
+    removes, paced by ROLE_EDIT_INTERVAL. A newer set for the same role replaces
+    a queued one (and interrupts one being applied), so a burst of leaderboard
+    views costs a single reconciliation.
+    """
+
+    def __init__(self, interval: float = ROLE_EDIT_INTERVAL):
+        self.interval = interval
+        self._desired: Dict[Tuple[int, int], Tuple[discord.Role, set, str]] = {}  # (guild, role) -> target
+        self._workers: Dict[int, asyncio.Task] = {}
+
+    def set_holders(self, role: discord.Role, member_ids, reason: str):
+        key = (role.guild.id, role.id)
+        self._desired[key] = (role, set(member_ids), reason)
+        worker = self._workers.get(role.guild.id)
+        if not worker or worker.done():
+            self._workers[role.guild.id] = asyncio.create_task(self._run(role.guild.id))
+
+    async def _run(self, guild_id: int):
+        while True:
+            key = next((k for k in self._desired if k[0] == guild_id), None)
+            if key is None:
+                break
+            role, desired, reason = self._desired.pop(key)
+            try:
+                await self._apply(key, role, desired, reason)
+            except Exception as e:
+                print(f"[ERROR] Role reconcile for {role.name} failed: {e}")
+        self._workers.pop(guild_id, None)
+
+    async def _apply(self, key: Tuple[int, int], role: discord.Role, desired: set, reason: str):
+        guild = role.guild
+        current = {m.id for m in role.members}
+        changes = [(uid, False) for uid in current - desired] + [(uid, True) for uid in desired - current]
+        for uid, add in changes:
+            if key in self._desired:
+                return  # superseded; the worker picks up the newer target next
+            member = guild.get_member(uid)
+            if not member:
+                continue
+            try:
+                if add:
+                    await member.add_roles(role, reason=reason)
+                else:
+                    await member.remove_roles(role, reason=reason)
+            except discord.HTTPException as e:
+                if e.status == 429:
+                    await asyncio.sleep(getattr(e, "retry_after", 5))
+                print(f"[ERROR] Cannot {'add' if add else 'remove'} {role.name} for {member}: {e}")
+            await asyncio.sleep(self.interval)
+
+
+TITLE_ROLES = RoleReconciler()
+
+# ─── Live messages ─────────────────────────────
+LIVE_EDIT_INTERVAL = 3.0      # minimum seconds between edits of one live message
+LIVE_EDITS_PER_MINUTE = 60    # bot-wide edit budget; intervals stretch as it runs out
+LIVE_MAX_SLOWDOWN = 4.0
+
+
+def relative_time(seconds: float) -> str:
+    """A Discord timestamp "in N seconds" that every client counts down by itself."""
+    return discord.utils.format_dt(datetime.now(timezone.utc) + timedelta(seconds=seconds), "R")
+
+
+class LiveMessages:
+    """Owns edits of messages that change while a game runs (join lists, timers, boards).
+
+    update() stores the newest content and returns; one flusher per message
+    sends at most one edit per interval, so intermediate states are dropped,
+    and an update identical to the last sent one costs nothing. The interval
+    stretches when the bot-wide budget is nearly spent. Countdowns should show
+    relative_time() once instead of editing every second.
+    """
+
+    def __init__(self, interval: float = LIVE_EDIT_INTERVAL, per_minute: int = LIVE_EDITS_PER_MINUTE):
+        self.interval = interval
+        self.per_minute = per_minute
+        self._pending: Dict[int, Tuple[discord.Message, Dict[str, Any]]] = {}
+        self._sent: Dict[int, str] = {}       # message_id -> signature of the last edit
+        self._latest: Dict[int, Dict[str, Any]] = {}  # message_id -> newest fields queued
+        self._tasks: Dict[int, asyncio.Task] = {}
+        self._recent: List[float] = []        # monotonic times of edits in the last minute
+
+    @staticmethod
+    def _signature(fields: Dict[str, Any]) -> str:
+        return repr(sorted(
+            (k, v.to_dict() if isinstance(v, discord.Embed) else v) for k, v in fields.items()
+        ))
+
+    def _delay(self) -> float:
+        now = time.monotonic()
+        self._recent = [t for t in self._recent if now - t < 60]
+        half = self.per_minute / 2
+        load = max(0.0, (len(self._recent) - half) / half)
+        return self.interval * min(LIVE_MAX_SLOWDOWN, 1 + load * (LIVE_MAX_SLOWDOWN - 1))
+
+    def update(self, message: discord.Message, **fields):
+        """Queue an edit; later calls before it is sent replace earlier ones."""
+        pending = self._pending.get(message.id)
+        merged = {**pending[1], **fields} if pending else dict(fields)
+        if not pending and self._sent.get(message.id) == self._signature(merged):
+            return
+        self._pending[message.id] = (message, merged)
+        self._latest[message.id] = merged
+        task = self._tasks.get(message.id)
+        if not task or task.done():
+            self._tasks[message.id] = asyncio.create_task(self._flush(message.id))
+
+    async def _flush(self, message_id: int):
+        while message_id in self._pending:
+            message, fields = self._pending.pop(message_id)
+            signature = self._signature(fields)
+            if self._sent.get(message_id) != signature:
+                try:
+                    await message.edit(**fields)
+                    self._sent[message_id] = signature
+                    self._recent.append(time.monotonic())
+                except discord.NotFound:
+                    break
+                except discord.HTTPException as e:
+                    print(f"[ERROR] Live message edit failed: {e}")
+            await asyncio.sleep(self._delay())
+        self._tasks.pop(message_id, None)
+
+    async def finish(self, message: discord.Message, **fields):
+        """Apply a final edit now (e.g. "time's up") instead of any queued one; then forget
+        the message. Without fields, the newest queued update is sent if it isn't yet."""
+        self._pending.pop(message.id, None)
+        task = self._tasks.pop(message.id, None)
+        if task:
+            task.cancel()
+        sent = self._sent.pop(message.id, None)
+        latest = self._latest.pop(message.id, None)
+        if not fields and latest and self._signature(latest) != sent:
+            fields = latest
+        if fields:
+            try:
+                await message.edit(**fields)
+            except discord.HTTPException as e:
+                print(f"[ERROR] Live message edit failed: {e}")
+
+
+LIVE = LiveMessages()
+
+
+# ─── Role index ─────────────────────────────
+class RoleIndex:
+    """Per-guild role id -> member id sets, so role checks are set lookups.
+
+    A guild is indexed from the member cache the first time it is queried;
+    after that RocketCache applies member join/update/remove and role
+    create/update/delete events.
+    """
+
+    def __init__(self):
+        self._holders: Dict[int, Dict[int, set]] = {}  # guild_id -> role_id -> member ids
+        self._names: Dict[int, Dict[int, str]] = {}    # guild_id -> role_id -> lowercased name
+        self._bots: set = set()
+
+    def _ensure(self, guild: discord.Guild) -> Dict[int, set]:
+        if guild.id not in self._holders:
+            self._names[guild.id] = {r.id: r.name.lower() for r in guild.roles}
+            holders: Dict[int, set] = {r.id: set() for r in guild.roles}
+            for member in guild.members:
+                self._add_member(holders, member)
+            self._holders[guild.id] = holders
+        return self._holders[guild.id]
+
+    def _add_member(self, holders: Dict[int, set], member: discord.Member):
+        if member.bot:
+            self._bots.add(member.id)
+        for role in member.roles:
+            holders.setdefault(role.id, set()).add(member.id)
+
+    def role_ids(self, guild: discord.Guild, names) -> set:
+        """Ids of the guild roles named (case-insensitively) any of `names`."""
+        self._ensure(guild)
+        wanted = {n.lower() for n in names}
+        return {rid for rid, name in self._names[guild.id].items() if name in wanted}
+
+    def holders(self, guild: discord.Guild, role_id: int) -> set:
+        return self._ensure(guild).get(role_id, set())
+
+    def members_with_any(self, guild: discord.Guild, names, include_bots: bool = False) -> set:
+        holders = self._ensure(guild)
+        ids = set()
+        for rid in self.role_ids(guild, names):
+            ids |= holders.get(rid, set())
+        return ids if include_bots else ids - self._bots
+
+    def has_any(self, member: discord.Member, names) -> bool:
+        guild = getattr(member, "guild", None)
+        if guild is None:
+            return False
+        holders = self._ensure(guild)
+        return any(member.id in holders.get(rid, ()) for rid in self.role_ids(guild, names))
+
+    # ---- Event updates (ignored for guilds that are not indexed yet) ----
+    def member_join(self, member: discord.Member):
+        if member.guild.id in self._holders:
+            self._add_member(self._holders[member.guild.id], member)
+
+    def member_remove(self, guild_id: int, user_id: int):
+        for ids in self._holders.get(guild_id, {}).values():
+            ids.discard(user_id)
+
+    def member_update(self, before: discord.Member, after: discord.Member):
+        holders = self._holders.get(after.guild.id)
+        if holders is None:
+            return
+        old, new = {r.id for r in before.roles}, {r.id for r in after.roles}
+        for rid in old - new:
+            holders.get(rid, set()).discard(after.id)
+        for rid in new - old:
+            holders.setdefault(rid, set()).add(after.id)
+
+    def role_update(self, role: discord.Role):
+        if role.guild.id in self._names:
+            self._names[role.guild.id][role.id] = role.name.lower()
+            self._holders[role.guild.id].setdefault(role.id, set())
+
+    def role_delete(self, role: discord.Role):
+        if role.guild.id in self._names:
+            self._names[role.guild.id].pop(role.id, None)
+            self._holders[role.guild.id].pop(role.id, None)
+
+
+ROLE_INDEX = RoleIndex()
+
+# ─── Member resolver ─────────────────────────────
+MEMBER_CACHE_TTL = 600      # seconds a resolved name or "left the guild" answer is trusted
+MEMBER_QUERY_BATCH = 100    # most user ids one gateway member query may ask for
+
+
+class MemberResolver:
+    """Resolves user ids to members for leaderboards and rosters.
+
+    Members already in the client cache are used directly; the rest are asked
+    for in batches through the gateway (guild.query_members) instead of one
+    fetch_member REST call each. Display names, and ids that are no longer in
+    the guild, are remembered for MEMBER_CACHE_TTL.
+    """
+
+    def __init__(self, ttl: float = MEMBER_CACHE_TTL):
+        self.ttl = ttl
+        self._names: Dict[Tuple[int, int], Tuple[float, Optional[str]]] = {}  # (guild, user) -> (expires, name or None if gone)
+
+    def _remember(self, guild_id: int, user_id: int, name: Optional[str]):
+        self._names[(guild_id, user_id)] = (time.monotonic() + self.ttl, name)
+
+    def _cached(self, guild_id: int, user_id: int) -> Tuple[bool, Optional[str]]:
+        entry = self._names.get((guild_id, user_id))
+        if entry and entry[0] > time.monotonic():
+            return True, entry[1]
+        return False, None
+
+    async def resolve(self, guild: discord.Guild, user_ids) -> Dict[int, discord.Member]:
+        """Return {user_id: member} for the ids still in the guild."""
+        found: Dict[int, discord.Member] = {}
+        missing = []
+        for uid in dict.fromkeys(user_ids):
+            member = guild.get_member(uid)
+            if member:
+                found[uid] = member
+                self._remember(guild.id, uid, member.display_name)
+            elif not self._cached(guild.id, uid)[0]:
+                missing.append(uid)
+
+        for i in range(0, len(missing), MEMBER_QUERY_BATCH):
+            batch = missing[i:i + MEMBER_QUERY_BATCH]
+            try:
+                members = await guild.query_members(user_ids=batch, cache=True)
+            except (asyncio.TimeoutError, discord.ClientException) as e:
+                print(f"[ERROR] Member query failed in {guild.id}: {e}")
+                continue
+            for member in members:
+                found[member.id] = member
+                self._remember(guild.id, member.id, member.display_name)
+            for uid in set(batch) - {m.id for m in members}:
+                self._remember(guild.id, uid, None)
+        return found
+
+    async def get(self, guild: discord.Guild, user_id: int) -> Optional[discord.Member]:
+        return (await self.resolve(guild, [user_id])).get(user_id)
+
+    async def names(self, guild: discord.Guild, user_ids) -> Dict[int, str]:
+        """Return {user_id: display name}; ids that left the guild are omitted."""
+        user_ids = list(user_ids)
+        names = {uid: m.display_name for uid, m in (await self.resolve(guild, user_ids)).items()}
+        for uid in user_ids:
+            if uid not in names:
+                known, name = self._cached(guild.id, uid)
+                if known and name:
+                    names[uid] = name
+        return names
+
+    def forget(self, guild_id: int, user_id: int):
+        self._names.pop((guild_id, user_id), None)
+
+
+MEMBERS = MemberResolver()
+
+# ─── Channel registry ─────────────────────────────
+# role -> test on the lowercased channel name; the first match in channel order wins
+CHANNEL_ROLES = {
+    "dial": lambda name: "rocket-dial" in name,
+    "catch": lambda name: "catch" in name,
+    "secret": lambda name: "secret" in name,
+    "freeze-status": lambda name: name == "freeze-status",
+    "rocketbot": lambda name: name == "rocketbot",
+}
+
+
+class ChannelRegistry:
+    """The channel each guild uses for a role (dial, catch, secret, ...), so
+    lookups don't scan channel names. A guild is indexed on first use and
+    re-indexed by RocketCache whenever one of its channels is created,
+    renamed, moved or deleted."""
+
+    def __init__(self):
+        self._channels: Dict[int, Dict[str, int]] = {}  # guild_id -> role -> channel_id
+
+    def rebuild(self, guild: discord.Guild):
+        found: Dict[str, int] = {}
+        for channel in guild.text_channels:  # sorted by position
+            name = channel.name.lower()
+            for role, matches in CHANNEL_ROLES.items():
+                if role not in found and matches(name):
+                    found[role] = channel.id
+        self._channels[guild.id] = found
+
+    def remove_guild(self, guild_id: int):
+        self._channels.pop(guild_id, None)
+
+    def get(self, guild: discord.Guild, role: str) -> Optional[discord.TextChannel]:
+        if guild.id not in self._channels:
+            self.rebuild(guild)
+        channel_id = self._channels[guild.id].get(role)
+        return guild.get_channel(channel_id) if channel_id else None
+
+
+CHANNELS = ChannelRegistry()
 
 # ─── Role-based checks ─────────────────────────────
+EDATE_ROLE_NAMES = ("Team Rocket", "Catching PokeMen", "Catching PokeWomen", "Catching 'em all")
+GENDER_ROLE_EMOJIS = (("Rocket PokeWoman ♀️", "♀️"), ("Rocket PokeMan ♂️", "♂️"), ("Rocket PokePal ⚧", "⚧"))
+
+
 def is_edate_gamer(member: discord.Member) -> bool:
     """Return True if member has either PokeCandidates or TEAM ROCKET roles."""
-    role_names = {r.name.lower() for r in member.roles}
-    allowed_roles = {"team rocket","catching pokemen", "catching pokewomen", "catching 'em all"}
-    return bool(role_names & allowed_roles)  # True if at least one matches
+    return ROLE_INDEX.has_any(member, EDATE_ROLE_NAMES)
 
 
 def get_gender_emoji(member: discord.Member) -> str:
-    role_names = {r.name.lower() for r in member.roles}
-    if "rocket pokewoman ♀️" in role_names:
-        return "♀️"
-    if "rocket pokeman ♂️" in role_names:
-        return "♂️"
-    if "rocket pokepal ⚧" in role_names:
-        return "⚧"
+    for role_name, emoji in GENDER_ROLE_EMOJIS:
+        if ROLE_INDEX.has_any(member, (role_name,)):
+            return emoji
     return "❓"
 
 
 def get_guild_contestants(guild: discord.Guild) -> list[discord.Member]:
-    """Return all members in the guild who have at least one Catching role."""
-    catch_role_names = {"Catching PokeMen", "Catching PokeWomen", "Catching 'em all","Team Rocket"}
-
-    # Map role names to actual role objects
-    catch_roles = {role for role in guild.roles if role.name in catch_role_names}
-    if not catch_roles:
-        return []
-
-    # Return members with at least one catch role (excluding bots)
-    return [
-        member for member in guild.members
-        if not member.bot and any(role in member.roles for role in catch_roles)
-    ]
+    """Return all members in the guild who have at least one Catching role (excluding bots)."""
+    members = (guild.get_member(uid) for uid in ROLE_INDEX.members_with_any(guild, EDATE_ROLE_NAMES))
+    return [m for m in members if m]
 
 
 # ─── Time helpers ─────────────────────────────
@@ -102,42 +864,37 @@ def utc_today_str() -> str:
 def iso_now() -> str:
     return datetime.now(timezone.utc).isoformat()
 
+
+def local_today_str() -> str:
+    """Server-local date; daily quests reset at local midnight, as the admin-channel quest log did."""
+    return date.today().isoformat()
+
 # ─── Records helpers ─────────────────────────────
-def count_sent_today(guild_id: int, sender_id: int) -> int:
+async def count_sent_today(guild_id: int, sender_id: int) -> int:
     today = utc_today_str()
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute(
+    (count,) = await db.fetchone(
         """
         SELECT COUNT(*) FROM e_date_records
         WHERE guild_id=? AND e_date_sender_id=? AND date=?
         """,
         (guild_id, sender_id, today)
     )
-    (count,) = c.fetchone()
-    conn.close()
     return int(count or 0)
 
 
-def insert_record(guild_id: int, user_id: int, sender_id: int) -> None:
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute(
+async def insert_record(guild_id: int, user_id: int, sender_id: int) -> None:
+    await db.execute(
         """
         INSERT INTO e_date_records (guild_id, date, user_id, e_date_sender_id, status, reason, timestamp)
         VALUES (?, ?, ?, ?, 'pending', '', ?)
         """,
         (guild_id, utc_today_str(), user_id, sender_id, iso_now())
     )
-    conn.commit()
-    conn.close()
 
 
-def get_pending_between(guild_id: int, sender_id: int, receiver_id: int) -> Optional[int]:
+async def get_pending_between(guild_id: int, sender_id: int, receiver_id: int) -> Optional[int]:
     """Return record id of a pending request from sender->receiver, else None."""
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute(
+    row = await db.fetchone(
         """
         SELECT id FROM e_date_records
         WHERE guild_id=? AND e_date_sender_id=? AND user_id=? AND status='pending'
@@ -145,27 +902,34 @@ def get_pending_between(guild_id: int, sender_id: int, receiver_id: int) -> Opti
         """,
         (guild_id, sender_id, receiver_id)
     )
-    row = c.fetchone()
-    conn.close()
     return row[0] if row else None
 
 
-def update_status(record_id: int, status: str, reason: str = "") -> None:
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute(
-        "UPDATE e_date_records SET status=?, reason=? WHERE id=?",
-        (status, reason, record_id)
-    )
-    conn.commit()
-    conn.close()
+async def update_status(record_id: int, status: str, reason: str = "") -> None:
+    """Set a record's status; accepting (or un-accepting) it moves both players' e_date_points."""
+    def apply(c: sqlite3.Cursor):
+        c.execute("SELECT guild_id, user_id, e_date_sender_id, status FROM e_date_records WHERE id=?", (record_id,))
+        row = c.fetchone()
+        if not row:
+            return
+        guild_id, receiver_id, sender_id, old_status = row
+        c.execute("UPDATE e_date_records SET status=?, reason=? WHERE id=?", (status, reason, record_id))
+        delta = (status == "yes") - (old_status == "yes")
+        if delta and not backfill_pending(c, "e_date_points", record_id):
+            c.executemany(
+                """
+                INSERT INTO e_date_points (guild_id, user_id, points) VALUES (?, ?, ?)
+                ON CONFLICT(guild_id, user_id) DO UPDATE SET points = points + excluded.points
+                """,
+                [(guild_id, uid, delta) for uid in (receiver_id, sender_id)]
+            )
 
+    await db.transaction(apply)
 
-def fetch_incoming_history(guild_id: int, receiver_id: int) -> List[Tuple[str, int, str, str]]:
+
+async def fetch_incoming_history(guild_id: int, receiver_id: int) -> List[Tuple[str, int, str, str]]:
     """Return list of (date, sender_id, status, reason) for a receiver, newest first."""
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute(
+    return await db.fetchall(
         """
         SELECT date, e_date_sender_id, status, reason
         FROM e_date_records
@@ -174,35 +938,19 @@ def fetch_incoming_history(guild_id: int, receiver_id: int) -> List[Tuple[str, i
         """,
         (guild_id, receiver_id)
     )
-    rows = c.fetchall()
-    conn.close()
-    return rows
 
 
-def compute_points(guild: discord.Guild) -> Dict[int, int]:
-    """Compute dynamic points per user: +1 for each accepted ('yes') participation
-    (both sender and receiver earn a point per accepted record)."""
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute(
-        "SELECT user_id FROM e_date_records WHERE guild_id=? AND status='yes'",
+async def compute_points(guild: discord.Guild) -> Dict[int, int]:
+    """Points per user, highest first: +1 for each accepted ('yes') participation
+    (both sender and receiver earn a point per accepted record). Read from e_date_points."""
+    rows = await db.fetchall(
+        "SELECT user_id, points FROM e_date_points WHERE guild_id=? AND points>0 ORDER BY points DESC",
         (guild.id,)
     )
-    recv_rows = [r[0] for r in c.fetchall()]
-    c.execute(
-        "SELECT e_date_sender_id FROM e_date_records WHERE guild_id=? AND status='yes'",
-        (guild.id,)
-    )
-    send_rows = [r[0] for r in c.fetchall()]
-    conn.close()
-
-    points: Dict[int, int] = {}
-    for uid in recv_rows + send_rows:
-        points[uid] = points.get(uid, 0) + 1
 
     # Keep only members with the right roles
-    valid_ids = {m.id for m in get_guild_contestants(guild)}
-    return {uid: pts for uid, pts in points.items() if uid in valid_ids}
+    valid_ids = ROLE_INDEX.members_with_any(guild, EDATE_ROLE_NAMES)
+    return {uid: pts for uid, pts in rows if uid in valid_ids}
 
 # ─── Messaging & Pagination ─────────────────────────────
 async def safe_send(ctx: Union[commands.Context, discord.Interaction], content: str = None, embed=None, view=None, ephemeral=False):
@@ -366,8 +1114,301 @@ def load_json_file(filename: str, default: Any):
     return default
 
 
-LEADERBOARD_LOCK = asyncio.Lock()
-channel_id = int(os.getenv("LEADERBOARD_CHANNEL_ID", 0))
+# ─── Channel mirrors ─────────────────────────────
+MIRROR_PAGE_LIMIT = 1900        # stay below Discord's 2000-character message limit
+MIRROR_DEBOUNCE_SECONDS = 5     # bursts of writes inside this window become one edit per page
+MIRROR_RETRY_SECONDS = 30
+
+
+def paginate_lines(lines: List[str], limit: int = MIRROR_PAGE_LIMIT) -> List[str]:
+    """Pack lines into as few pages as possible, never splitting a line."""
+    pages: List[str] = []
+    current: List[str] = []
+    size = 0
+    for line in lines:
+        line = line[:limit]
+        if current and size + len(line) + 1 > limit:
+            pages.append("\n".join(current))
+            current, size = [], 0
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        pages.append("\n".join(current))
+    return pages
+
+
+async def load_mirror_pages(channel_id: int) -> List[int]:
+    rows = await db.fetchall("SELECT message_id FROM mirror_pages WHERE channel_id=? ORDER BY page", (channel_id,))
+    return [r[0] for r in rows]
+
+
+async def save_mirror_pages(channel_id: int, message_ids: List[int]) -> None:
+    def write(c):
+        c.execute("DELETE FROM mirror_pages WHERE channel_id=?", (channel_id,))
+        c.executemany(
+            "INSERT INTO mirror_pages (channel_id, page, message_id) VALUES (?, ?, ?)",
+            [(channel_id, i, mid) for i, mid in enumerate(message_ids)]
+        )
+    await db.transaction(write)
+
+
+class ChannelMirror:
+    """Write-behind display of local state in an admin channel.
+
+    Writers only call mark_dirty(); a background task waits MIRROR_DEBOUNCE_SECONDS,
+    renders the lines once, splits them into pages and edits only the pages whose
+    text changed. Commands never wait on these edits.
+    """
+
+    def __init__(self, channel_id: int, render, empty_text: str = "Nothing here yet."):
+        self.channel_id = channel_id
+        self.render = render  # async () -> List[str]
+        self.empty_text = empty_text
+        self.bot: Optional[discord.Client] = None
+        self._message_ids: Optional[List[int]] = None  # loaded lazily from mirror_pages
+        self._pages: List[Optional[str]] = []  # last text written to each page
+        self._dirty = False
+        self._task: Optional[asyncio.Task] = None
+
+    def mark_dirty(self, bot: discord.Client):
+        if not self.channel_id:
+            return
+        self.bot = bot
+        self._dirty = True
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while self._dirty:
+            await asyncio.sleep(MIRROR_DEBOUNCE_SECONDS)
+            self._dirty = False
+            try:
+                await self.flush()
+            except discord.HTTPException as e:
+                print(f"[ERROR] Mirror flush for channel {self.channel_id} failed: {e}")
+                self._dirty = True
+                await asyncio.sleep(MIRROR_RETRY_SECONDS)
+            except Exception as e:
+                print(f"[ERROR] Mirror flush for channel {self.channel_id} crashed: {e}")
+
+    async def _get_channel(self):
+        return self.bot.get_channel(self.channel_id) or await self.bot.fetch_channel(self.channel_id)
+
+    async def flush(self):
+        channel = await self._get_channel()
+        if not channel:
+            print(f"[DEBUG] Mirror channel {self.channel_id} not found.")
+            return
+
+        if self._message_ids is None:
+            self._message_ids = await load_mirror_pages(self.channel_id)
+            self._pages = [None] * len(self._message_ids)
+
+        pages = paginate_lines(await self.render()) or [self.empty_text]
+        message_ids = list(self._message_ids)
+
+        for i, text in enumerate(pages):
+            if i < len(message_ids):
+                if self._pages[i] == text:
+                    continue  # page unchanged, no edit needed
+                try:
+                    await channel.get_partial_message(message_ids[i]).edit(content=text)
+                except discord.NotFound:
+                    message_ids[i] = (await channel.send(text)).id
+            else:
+                message_ids.append((await channel.send(text)).id)
+
+        # Drop pages that are no longer needed
+        for mid in message_ids[len(pages):]:
+            try:
+                await channel.get_partial_message(mid).delete()
+            except discord.NotFound:
+                pass
+
+        self._message_ids = message_ids[:len(pages)]
+        self._pages = list(pages)
+        await save_mirror_pages(self.channel_id, self._message_ids)
+
+
+# ─── Gems ledger ─────────────────────────────
+LEADERBOARD_CHANNEL_ID = int(os.getenv("LEADERBOARD_CHANNEL_ID", 0))
+GEM_LOCK_STRIPES = 64
+_GEM_LOCKS = [asyncio.Lock() for _ in range(GEM_LOCK_STRIPES)]
+
+
+@asynccontextmanager
+async def gem_locks(*user_ids: int):
+    """Hold the lock stripe of every given user. Stripes are taken in index order,
+    so two transfers in opposite directions can't deadlock; unrelated users rarely
+    share a stripe and run in parallel."""
+    stripes = sorted({uid % GEM_LOCK_STRIPES for uid in user_ids})
+    for i in stripes:
+        await _GEM_LOCKS[i].acquire()
+    try:
+        yield
+    finally:
+        for i in reversed(stripes):
+            _GEM_LOCKS[i].release()
+
+
+async def get_user_gems(user_id: int) -> int:
+    """Return the gem balance of a user (0 if they never earned any)."""
+    row = await db.fetchone("SELECT gems FROM gems_ledger WHERE user_id=?", (user_id,))
+    return int(row[0]) if row else 0
+
+
+async def apply_gem_transaction(
+    deltas: List[Tuple[int, Optional[str], int]],
+    idem_key: Optional[str] = None,
+    kind: str = "credit",
+    require_funds: bool = False,
+    item: Optional[Tuple[int, Optional[str], str, str]] = None,
+    consume: Optional[Tuple[int, str, Optional[str]]] = None
+) -> Optional[Dict[int, int]]:
+    """Apply (user_id, name, delta) changes, and optionally give one
+    (user_id, name, emoji, item_name) item or take one (user_id, emoji,
+    item_name) item, in a single SQLite transaction.
+
+    Returns {user_id: new balance}, or None when require_funds is set and a
+    balance would go below zero, or when the item to consume is missing
+    (nothing is written then). If idem_key was already applied, the stored
+    result is returned and nothing changes.
+    """
+    totals: Dict[int, int] = {}
+    names: Dict[int, Optional[str]] = {}
+    for uid, name, delta in deltas:
+        totals[uid] = totals.get(uid, 0) + delta
+        names[uid] = name or names.get(uid)
+    now = iso_now()
+
+    def apply(c) -> Optional[Dict[int, int]]:
+        if idem_key:
+            c.execute("SELECT result FROM gem_transactions WHERE idem_key=?", (idem_key,))
+            row = c.fetchone()
+            if row:
+                return {int(uid): gems for uid, gems in json.loads(row[0]).items()}
+
+        if require_funds:
+            for uid, delta in totals.items():
+                if delta >= 0:
+                    continue
+                c.execute("SELECT gems FROM gems_ledger WHERE user_id=?", (uid,))
+                row = c.fetchone()
+                if (row[0] if row else 0) + delta < 0:
+                    return None  # nothing written yet
+
+        if consume and not InventoryStore.take_item(c, *consume):
+            return None  # nothing else written yet
+
+        c.executemany(
+            """
+            INSERT INTO gems_ledger (user_id, name, gems, updated_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(user_id) DO UPDATE SET
+                gems = gems + excluded.gems,
+                name = COALESCE(excluded.name, gems_ledger.name),
+                updated_at = excluded.updated_at
+            """,
+            [(uid, names[uid], delta, now) for uid, delta in totals.items()]
+        )
+        if item:
+            InventoryStore.write_item(c, *item)
+
+        user_ids = list(totals)
+        placeholders = ",".join("?" * len(user_ids))
+        c.execute(f"SELECT user_id, gems FROM gems_ledger WHERE user_id IN ({placeholders})", user_ids)
+        balances = {uid: int(gems) for uid, gems in c.fetchall()}
+
+        if idem_key:
+            c.execute(
+                "INSERT INTO gem_transactions (idem_key, kind, result, created_at) VALUES (?, ?, ?, ?)",
+                (idem_key, kind, json.dumps(balances), now)
+            )
+        return balances
+
+    balances = await db.transaction(apply)
+    if item:
+        INVENTORY.invalidate(item[0])
+    if consume:
+        INVENTORY.invalidate(consume[0])
+    return balances
+
+
+async def render_gems_lines() -> List[str]:
+    """Leaderboard mirror text, ordered by user id so pages stay stable between awards."""
+    rows = await db.fetchall("SELECT user_id, name, gems FROM gems_ledger ORDER BY user_id")
+    return [f"{name or uid} - {uid} - {gems}" for uid, name, gems in rows]
+
+
+LEADERBOARD_MIRROR = ChannelMirror(LEADERBOARD_CHANNEL_ID, render_gems_lines, empty_text="No gems yet.")
+
+
+async def fetch_gems_leaderboard(limit: Optional[int] = None) -> List[Tuple[int, str, int]]:
+    """Return (user_id, name, gems) rows sorted by gems, highest first."""
+    if limit:
+        return await db.fetchall("SELECT user_id, name, gems FROM gems_ledger ORDER BY gems DESC LIMIT ?", (limit,))
+    return await db.fetchall("SELECT user_id, name, gems FROM gems_ledger ORDER BY gems DESC")
+
+
+# ─── Notification digest ─────────────────────────────
+DIGEST_WINDOW_SECONDS = 3  # notices to one destination inside this window share one embed
+GEMS_DIGEST_TITLE = "💎 Gems Awarded"
+# Where gem notices go when the caller gives no channel. Not the leaderboard channel:
+# that one holds LEADERBOARD_MIRROR's pages, which notices would split up.
+GEMS_NOTICE_CHANNEL_ID = int(os.getenv("GEMS_NOTICE_CHANNEL_ID", 0))
+
+
+class NotificationDigest:
+    """Buffers short notices per destination (a channel, or a user for DMs) and
+    title, and sends each buffer as one embed once the window closes. A burst of
+    awards costs one message instead of one per player.
+
+    If a DM can't be delivered, its lines are moved to the fallback channel.
+    """
+
+    def __init__(self, window: float = DIGEST_WINDOW_SECONDS):
+        self.window = window
+        self._buffers: Dict[Tuple[int, str], Dict[str, Any]] = {}
+        self._tasks: Dict[Tuple[int, str], asyncio.Task] = {}
+
+    def add(self, destination: discord.abc.Messageable, lines: List[str], title: str = GEMS_DIGEST_TITLE,
+            fallback: Optional[discord.abc.Messageable] = None):
+        if not destination or not lines:
+            return
+        key = (destination.id, title)
+        buffer = self._buffers.setdefault(key, {"destination": destination, "lines": [], "fallback": None})
+        buffer["lines"].extend(lines)
+        buffer["fallback"] = buffer["fallback"] or fallback
+        task = self._tasks.get(key)
+        if not task or task.done():
+            self._tasks[key] = asyncio.create_task(self._flush(key))
+
+    async def _flush(self, key: Tuple[int, str]):
+        await asyncio.sleep(self.window)
+        self._tasks.pop(key, None)
+        buffer = self._buffers.pop(key, None)
+        if not buffer:
+            return
+        title = key[1]
+        try:
+            for page in paginate_lines(buffer["lines"], limit=4000):
+                await buffer["destination"].send(
+                    embed=discord.Embed(title=title, description=page, color=discord.Color.gold())
+                )
+        except discord.Forbidden:
+            # User has DMs closed
+            self.add(buffer["fallback"], buffer["lines"], title)
+        except discord.HTTPException as e:
+            print(f"[ERROR] Digest send failed: {e}")
+
+
+DIGEST = NotificationDigest()
+
+
+def gem_notice(name: str, points: int) -> str:
+    return f"{name} {'earned' if points >= 0 else 'lost'} {'+' if points >= 0 else '-'}{abs(points):,} gems"
+
+
 async def award_points(
     bot: discord.Client,
     user: discord.Member,
@@ -375,121 +1416,775 @@ async def award_points(
     notify_channel=None,
     dm=False
 ):
-    if channel_id is None:
-        print("[DEBUG] No leaderboard channel provided.")
-        return
+    async with gem_locks(user.id):
+        await apply_gem_transaction([(user.id, user.display_name, points)])
+    LEADERBOARD_MIRROR.mark_dirty(bot)
 
-    # Determine the sign for messages
-    sign = "+" if points >= 0 else "-"
-    abs_points = abs(points)
+    # Notification goes through the digest, batched with other awards to the same place
+    line = gem_notice(user.display_name, points)
+    if dm:
+        DIGEST.add(user, [line], fallback=notify_channel)
+    else:
+        DIGEST.add(notify_channel or (bot.get_channel(GEMS_NOTICE_CHANNEL_ID) if GEMS_NOTICE_CHANNEL_ID else None), [line])
 
-    # Fetch leaderboard channel
-    channel = bot.get_channel(channel_id) or await bot.fetch_channel(channel_id)
-    if not channel:
-        print(f"[DEBUG] Leaderboard channel {channel_id} not found.")
-        return
 
-    async with LEADERBOARD_LOCK:
-        # Get last message
-        try:
-            msg = [m async for m in channel.history(limit=1, oldest_first=False)][0]
-        except IndexError:
-            # No leaderboard exists yet
-            msg = await channel.send(f"{user.display_name} - {user.id} - {points}")
-            if notify_channel:
-                action = "earned" if points >= 0 else "lost"
-                await notify_channel.send(f"💎 {user.mention} {action} **{abs_points:,} gems**!")
-            return
+async def award_points_many(
+    bot: discord.Client,
+    awards: List[Tuple[discord.abc.User, int]],
+    notify_channel=None,
+    title: str = GEMS_DIGEST_TITLE
+) -> Dict[int, int]:
+    """Award gems to several members at once: one ledger transaction, one mirror
+    update and one combined notification. Returns {user_id: new balance}."""
+    # Merge repeated members so each one gets a single line
+    totals: Dict[int, int] = {}
+    members: Dict[int, discord.abc.User] = {}
+    for member, points in awards:
+        if not points:
+            continue
+        totals[member.id] = totals.get(member.id, 0) + points
+        members[member.id] = member
+    if not totals:
+        return {}
+
+    async with gem_locks(*totals):
+        balances = await apply_gem_transaction(
+            [(uid, members[uid].display_name, delta) for uid, delta in totals.items()]
+        )
+    LEADERBOARD_MIRROR.mark_dirty(bot)
+
+    channel = notify_channel or (bot.get_channel(GEMS_NOTICE_CHANNEL_ID) if GEMS_NOTICE_CHANNEL_ID else None)
+    DIGEST.add(channel, [
+        gem_notice(members[uid].display_name, delta)
+        for uid, delta in sorted(totals.items(), key=lambda kv: kv[1], reverse=True)
+    ], title)
+    return balances
+
+
+# ─── Gem transactions ─────────────────────────────
+# Every call takes the lock stripes of the users involved and commits in one
+# SQLite transaction. Pass a key derived from the triggering interaction or
+# message (e.g. f"buy:{interaction.message.id}") to make retries safe.
+
+async def credit(bot: discord.Client, user: discord.abc.User, amount: int,
+                 key: Optional[str] = None) -> Dict[int, int]:
+    """Add gems unconditionally (amount may be negative for admin corrections)."""
+    async with gem_locks(user.id):
+        balances = await apply_gem_transaction([(user.id, user.display_name, amount)], key, "credit")
+    LEADERBOARD_MIRROR.mark_dirty(bot)
+    return balances
+
+
+async def debit(bot: discord.Client, user: discord.abc.User, amount: int,
+                key: Optional[str] = None) -> Optional[Dict[int, int]]:
+    """Take gems if the user can afford it; None otherwise."""
+    async with gem_locks(user.id):
+        balances = await apply_gem_transaction(
+            [(user.id, user.display_name, -amount)], key, "debit", require_funds=True
+        )
+    if balances is not None:
+        LEADERBOARD_MIRROR.mark_dirty(bot)
+    return balances
 
-        lines = msg.content.splitlines()
-        user_found = False
-        new_lines = []
 
-        for line in lines:
-            parts = [p.strip() for p in line.split("-")]
-            if len(parts) != 3:
-                new_lines.append(line)
-                continue
+async def transfer(bot: discord.Client, sender: discord.abc.User, receiver: discord.abc.User,
+                   amount: int, key: Optional[str] = None,
+                   consume: Optional[Tuple[int, str, Optional[str]]] = None) -> Optional[Dict[int, int]]:
+    """Move gems between two users; None if the sender can't cover it.
 
-            name, uid_str, pts_str = parts
-            try:
-                uid = int(uid_str)
-                pts = int(pts_str)
-            except:
-                new_lines.append(line)
-                continue
+    With consume=(user_id, emoji, item_name), one of that item is taken in the
+    same transaction, and nothing happens if it is missing.
+    """
+    async with gem_locks(sender.id, receiver.id):
+        balances = await apply_gem_transaction(
+            [(sender.id, sender.display_name, -amount), (receiver.id, receiver.display_name, amount)],
+            key, "transfer", require_funds=True, consume=consume
+        )
+    if balances is not None:
+        LEADERBOARD_MIRROR.mark_dirty(bot)
+        if consume:
+            INVENTORY_MIRROR.mark_dirty(bot)
+    return balances
+
+
+async def purchase(bot: discord.Client, user: discord.abc.User, price: int, emoji: str, item_name: str,
+                   key: Optional[str] = None) -> Optional[Dict[int, int]]:
+    """Debit the price and add the item in one transaction; None if the user can't afford it."""
+    async with gem_locks(user.id):
+        balances = await apply_gem_transaction(
+            [(user.id, user.display_name, -price)], key, "purchase", require_funds=True,
+            item=(user.id, user.display_name, emoji, item_name)
+        )
+    if balances is not None:
+        LEADERBOARD_MIRROR.mark_dirty(bot)
+        INVENTORY_MIRROR.mark_dirty(bot)
+    return balances
 
-            if uid == user.id:
-                pts += points
-                user_found = True
-                new_lines.append(f"{name} - {uid} - {pts}")
-            else:
-                new_lines.append(line)
 
-        # If user not found, add them
-        if not user_found:
-            new_lines.append(f"{user.display_name} - {user.id} - {points}")
+# ─── Inventory ─────────────────────────────
+INVENTORY_CHANNEL_ID = int(os.getenv("INVENTORY_CHANNEL_ID", 0))
 
-        # Edit the last leaderboard message
-        await msg.edit(content="\n".join(new_lines))
 
-        # Notification message
-        action = "earned" if points >= 0 else "lost"
-        message = f"💎 {user.display_name} {action} {sign}{abs_points:,} gems!"
+class InventoryStore:
+    """Pokebag items in SQLite, shared by RocketShop and RocketSabotage.
 
-        if dm:
-            try:
-                await user.send(message)
-            except discord.Forbidden:
-                # User has DMs closed
-                if notify_channel:
-                    await notify_channel.send(message)
+    Reads go through a per-user cache; every write drops that user's entry,
+    so the next read sees the committed row counts.
+    """
+
+    def __init__(self):
+        self._cache: Dict[int, Dict[Tuple[str, str], int]] = {}
+
+    def invalidate(self, user_id: int):
+        self._cache.pop(user_id, None)
+
+    @staticmethod
+    def write_item(c: sqlite3.Cursor, user_id: int, user_name: Optional[str], emoji: str, item_name: str,
+                   count: int = 1) -> None:
+        """Add items using an open cursor, so callers can make it part of a larger transaction."""
+        c.execute(
+            """
+            INSERT INTO inventory_owners (user_id, name) VALUES (?, ?)
+            ON CONFLICT(user_id) DO UPDATE SET name = COALESCE(excluded.name, inventory_owners.name)
+            """,
+            (user_id, user_name)
+        )
+        c.execute(
+            """
+            INSERT INTO inventory_items (user_id, emoji, item_name, count) VALUES (?, ?, ?, ?)
+            ON CONFLICT(user_id, emoji, item_name) DO UPDATE SET count = count + excluded.count
+            """,
+            (user_id, emoji, item_name.strip().replace("’", "'"), count)
+        )
+
+    async def get_items(self, user_id: int) -> Dict[Tuple[str, str], int]:
+        """Return {(emoji, item_name): count} for a user."""
+        if user_id not in self._cache:
+            rows = await db.fetchall(
+                "SELECT emoji, item_name, count FROM inventory_items WHERE user_id=? AND count>0 ORDER BY rowid",
+                (user_id,)
+            )
+            self._cache[user_id] = {(emoji, name): count for emoji, name, count in rows}
+        return dict(self._cache[user_id])
+
+    async def count_item(self, user_id: int, item_name: str) -> int:
+        """How many of an item (matched by name, case-insensitive) a user holds."""
+        return sum(count for (_, name), count in (await self.get_items(user_id)).items()
+                   if name.lower() == item_name.lower())
+
+    async def holders(self, emoji: Optional[str] = None, item_name: Optional[str] = None) -> List[int]:
+        """User ids holding at least one matching item (uses the emoji / name indexes)."""
+        if emoji is not None:
+            rows = await db.fetchall("SELECT DISTINCT user_id FROM inventory_items WHERE emoji=? AND count>0", (emoji,))
         else:
-            if notify_channel:
-                await notify_channel.send(message)
-            elif channel_id:
-                channel = bot.get_channel(channel_id)
-                if channel:
-                    await channel.send(message)
+            rows = await db.fetchall(
+                "SELECT DISTINCT user_id FROM inventory_items WHERE item_name=? COLLATE NOCASE AND count>0",
+                (item_name,)
+            )
+        return [r[0] for r in rows]
+
+    async def add_item(self, user_id: int, user_name: Optional[str], emoji: str, item_name: str,
+                       count: int = 1) -> int:
+        """Give a user items and return their new count of that item."""
+        item_name = item_name.strip().replace("’", "'")
+
+        def add(c: sqlite3.Cursor) -> int:
+            self.write_item(c, user_id, user_name, emoji, item_name, count)
+            c.execute(
+                "SELECT count FROM inventory_items WHERE user_id=? AND emoji=? AND item_name=?",
+                (user_id, emoji, item_name)
+            )
+            return int(c.fetchone()[0])
+
+        new_count = await db.transaction(add)
+        self.invalidate(user_id)
+        return new_count
+
+    @staticmethod
+    def take_item(c: sqlite3.Cursor, user_id: int, emoji: str, item_name: Optional[str] = None) -> bool:
+        """Take one item (by emoji, optionally also by name) using an open cursor.
+        Returns False if the user has none."""
+        if item_name is None:
+            where, params = "user_id=? AND emoji=? AND count>0", (user_id, emoji)
+        else:
+            where = "user_id=? AND emoji=? AND item_name=? COLLATE NOCASE AND count>0"
+            params = (user_id, emoji, item_name.strip().replace("’", "'"))
+        c.execute(
+            f"UPDATE inventory_items SET count = count - 1 "
+            f"WHERE rowid = (SELECT rowid FROM inventory_items WHERE {where} LIMIT 1)",
+            params
+        )
+        used = c.rowcount > 0
+        if used:
+            c.execute("DELETE FROM inventory_items WHERE user_id=? AND count<=0", (user_id,))
+        return used
+
+    async def use_item(self, user_id: int, emoji: str, item_name: Optional[str] = None) -> bool:
+        """Atomically take one item (by emoji, optionally also by name).
+        Returns False if the user has none."""
+        used = await db.transaction(lambda c: self.take_item(c, user_id, emoji, item_name))
+        self.invalidate(user_id)
+        return used
+
+    async def all_inventories(self) -> List[Tuple[int, Optional[str], Dict[Tuple[str, str], int]]]:
+        """(user_id, name, items) for every known owner, for the channel mirror."""
+        owners = await db.fetchall("SELECT user_id, name FROM inventory_owners ORDER BY rowid")
+        items: Dict[int, Dict[Tuple[str, str], int]] = {}
+        for uid, emoji, name, count in await db.fetchall(
+            "SELECT user_id, emoji, item_name, count FROM inventory_items WHERE count>0 ORDER BY rowid"
+        ):
+            items.setdefault(uid, {})[(emoji, name)] = count
+        return [(uid, name, items.get(uid, {})) for uid, name in owners]
+
+INVENTORY = InventoryStore()
+
+
+async def render_inventory_lines() -> List[str]:
+    lines = []
+    for uid, name, items in await INVENTORY.all_inventories():
+        item_str = " | ".join(f"{emoji} {count}x {iname}" for (emoji, iname), count in items.items())
+        lines.append(f"{name or uid} - {uid} | {item_str}" if item_str else f"{name or uid} - {uid} |")
+    return lines
+
+
+INVENTORY_MIRROR = ChannelMirror(INVENTORY_CHANNEL_ID, render_inventory_lines, empty_text="No inventory yet.")
 
 
 # ---------------- DAILY QUEST ----------------
-# Admin channel ID for daily quests
-DAILY_QUEST_CHANNEL_ID = int(os.getenv("DAILY_QUEST_CHANNEL_ID", 0))
+DAILY_QUEST_REWARD = 100
+DAILY_QUEST_RETENTION_DAYS = 7
+
+# Quest id -> the event that completes it and the label shown in `.tr quest`.
+# Adding a quest is one entry here plus an emit_quest_event() call in the command.
+DAILY_QUESTS: Dict[str, Dict[str, str]] = {
+    "a": {"event": "thunderbolt", "label": "⚡ Thunderbolt someone"},
+    "b": {"event": "roast", "label": "🔥 Roast someone"},
+    "c": {"event": "drama", "label": "🎭 Drama someone"},
+    "d": {"event": "press_quest", "label": "📰 Press quest"},
+}
+DAILY_QUEST_IDS = list(DAILY_QUESTS)
+_QUESTS_BY_EVENT: Dict[str, List[str]] = {}
+for _qid, _quest in DAILY_QUESTS.items():
+    _QUESTS_BY_EVENT.setdefault(_quest["event"], []).append(_qid)
 
-# All daily quest IDs in order
-DAILY_QUEST_IDS = ["a", "b", "c", "d"]
-async def update_daily_quest(bot: commands.Bot, member: discord.Member, quest_id: str):
-    channel = bot.get_channel(DAILY_QUEST_CHANNEL_ID)
-    if not channel:
-        return  # channel not found
+_last_quest_prune: Optional[str] = None
 
-    # Get the last message in the channel
-    last_message = None
-    async for msg in channel.history(limit=1):
-        last_message = msg
-        break
 
-    if not last_message:
-        return  # no messages, nothing to do
+def _prune_daily_quests(c: sqlite3.Cursor, today: str) -> None:
+    """On the first write of a new day, drop rows older than the retention window."""
+    global _last_quest_prune
+    if _last_quest_prune == today:
+        return
+    cutoff = (datetime.strptime(today, "%Y-%m-%d") - timedelta(days=DAILY_QUEST_RETENTION_DAYS)).strftime("%Y-%m-%d")
+    c.execute("DELETE FROM daily_quests WHERE date < ?", (cutoff,))
+    c.execute("DELETE FROM daily_quest_claims WHERE date < ?", (cutoff,))
+    _last_quest_prune = today
 
-    lines = last_message.content.splitlines()
-    updated_lines = []
 
-    for line in lines:
-        if str(member.id) in line:
-            # Update quest_id from 0 → 1
-            updated_line = line.replace(f"{quest_id}0", f"{quest_id}1")
-            updated_lines.append(updated_line)
-        else:
-            updated_lines.append(line)
+async def emit_quest_event(member: discord.Member, event: str) -> List[str]:
+    """Mark every quest completed by `event` as done for today. Returns the newly completed ids."""
+    quest_ids = _QUESTS_BY_EVENT.get(event)
+    if not quest_ids:
+        return []
+    today = local_today_str()
+    guild_id = member.guild.id if getattr(member, "guild", None) else 0
+
+    def mark(c: sqlite3.Cursor) -> List[str]:
+        _prune_daily_quests(c, today)
+        completed = []
+        for qid in quest_ids:
+            c.execute(
+                "INSERT OR IGNORE INTO daily_quests (date, guild_id, user_id, quest_id, completed_at) VALUES (?, ?, ?, ?, ?)",
+                (today, guild_id, member.id, qid, iso_now())
+            )
+            if c.rowcount:
+                completed.append(qid)
+        return completed
+
+    return await db.transaction(mark)
 
-    # Only edit if a change was made
-    if lines != updated_lines:
-        await last_message.edit(content="\n".join(updated_lines))
+
+def _quest_reward_key(guild_id: int, user_id: int, day: str) -> str:
+    return f"quest:{guild_id}:{user_id}:{day}"
+
+
+async def get_daily_quest_progress(guild_id: int, user_id: int, day: Optional[str] = None) -> Tuple[set, bool]:
+    """Return (completed quest ids, reward claimed) for a user on a day (default today)."""
+    day = day or local_today_str()
+    rows = await db.fetchall(
+        "SELECT quest_id FROM daily_quests WHERE date=? AND guild_id=? AND user_id=?",
+        (day, guild_id, user_id)
+    )
+    # Legacy claims were imported into daily_quest_claims; new ones are paid through the ledger
+    claimed = await db.fetchone(
+        "SELECT 1 FROM daily_quest_claims WHERE date=? AND guild_id=? AND user_id=? "
+        "UNION ALL SELECT 1 FROM gem_transactions WHERE idem_key=?",
+        (day, guild_id, user_id, _quest_reward_key(guild_id, user_id, day))
+    )
+    return {r[0] for r in rows}, claimed is not None
+
+
+async def claim_daily_quest_reward(bot: discord.Client, member: discord.Member, amount: int,
+                                   day: Optional[str] = None) -> Optional[int]:
+    """Pay the daily reward, once per member and day, through the idempotent gem ledger.
+    Returns the new balance, or None if the reward was already claimed."""
+    day = day or local_today_str()
+    key = _quest_reward_key(member.guild.id, member.id, day)
+    # The user's lock stripe serializes every ledger write for them, so the check and the
+    # keyed credit can't interleave with another claim; a failed credit leaves it unclaimed
+    async with gem_locks(member.id):
+        _, claimed = await get_daily_quest_progress(member.guild.id, member.id, day)
+        if claimed:
+            return None
+        balances = await apply_gem_transaction([(member.id, member.display_name, amount)], key, "quest")
+    LEADERBOARD_MIRROR.mark_dirty(bot)
+    return balances[member.id]
 
 
 ONGOING_SESSIONS = {
     "mystery_date": {},  # guild.id -> True/False
     "talk_to_stranger": {}  # guild.id -> True/False
 }
+
+
+# ─── Dial reports ─────────────────────────────
+def parse_report_line(text: str) -> Optional[Tuple[int, str, int, str]]:
+    """Parse "{user_id} | {name} | {N}x | {reason}" into (user_id, name, count, reason)."""
+    parts = [p.strip() for p in text.split("|", maxsplit=3)]
+    if len(parts) < 3:
+        return None
+    try:
+        user_id = int(parts[0])
+        count = int(re.sub(r"\D", "", parts[2]))
+    except ValueError:
+        return None
+    return user_id, parts[1], count, parts[3] if len(parts) > 3 else ""
+
+
+async def load_dial_reports() -> List[Tuple[str, int, int, Optional[int]]]:
+    """Return (kind, user_id, count, message_id) for every stored report row."""
+    return await db.fetchall("SELECT kind, user_id, count, message_id FROM dial_reports")
+
+
+async def save_dial_reports(rows: List[Tuple[str, int, str, int, str, Optional[int]]]) -> None:
+    """Upsert (kind, user_id, name, count, reason, message_id) rows."""
+    await db.executemany(
+        """
+        INSERT INTO dial_reports (kind, user_id, name, count, reason, message_id, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(kind, user_id) DO UPDATE SET
+            name = excluded.name,
+            count = excluded.count,
+            reason = excluded.reason,
+            message_id = excluded.message_id,
+            updated_at = excluded.updated_at
+        """,
+        [(*row, iso_now()) for row in rows]
+    )
+
+
+async def delete_dial_report_message(message_id: int) -> List[Tuple[str, int]]:
+    """Drop the rows shown by a deleted admin message. Returns the removed (kind, user_id)."""
+    def delete(c: sqlite3.Cursor) -> List[Tuple[str, int]]:
+        c.execute("SELECT kind, user_id FROM dial_reports WHERE message_id=?", (message_id,))
+        removed = c.fetchall()
+        c.execute("DELETE FROM dial_reports WHERE message_id=?", (message_id,))
+        return removed
+
+    return await db.transaction(delete)
+
+
+# ─── Dial webhooks ─────────────────────────────
+async def load_dial_webhooks() -> List[Tuple[int, int, str]]:
+    """Return (channel_id, webhook_id, token) for every pooled webhook."""
+    return await db.fetchall("SELECT channel_id, webhook_id, token FROM dial_webhooks")
+
+
+async def save_dial_webhook(channel_id: int, webhook_id: int, token: str) -> None:
+    await db.execute(
+        "INSERT OR REPLACE INTO dial_webhooks (channel_id, webhook_id, token) VALUES (?, ?, ?)",
+        (channel_id, webhook_id, token)
+    )
+
+
+async def delete_dial_webhook(channel_id: int) -> None:
+    await db.execute("DELETE FROM dial_webhooks WHERE channel_id=?", (channel_id,))
+
+
+# ─── Premium members ─────────────────────────────
+ROCKET_DIAL_PREMIUM_CHANNEL_ID = int(os.getenv("ROCKET_DIAL_PREMIUM", 0))
+ADMIN_GOLD_MEMBERS_CHANNEL_ID = int(os.getenv("ADMIN_GOLD_MEMBERS", 0))
+
+
+class PremiumMembers:
+    """Premium entitlements listed as "{user_id} | ..." messages in the premium channels.
+
+    Loaded once on ready, then kept current by RocketCache from message
+    create/edit/delete events, so is_premium() never touches the API.
+    """
+
+    def __init__(self, channel_ids: List[int]):
+        self.channel_ids = {cid for cid in channel_ids if cid}
+        self._by_message: Dict[int, int] = {}  # message_id -> user_id
+        self._counts: Dict[int, int] = {}      # user_id -> number of listing messages
+        self.loaded = False
+
+    @staticmethod
+    def parse(content: str) -> Optional[int]:
+        uid_str = content.split("|")[0].strip()
+        return int(uid_str) if uid_str.isdigit() else None
+
+    def _add(self, message_id: int, user_id: int):
+        self._by_message[message_id] = user_id
+        self._counts[user_id] = self._counts.get(user_id, 0) + 1
+
+    def _remove(self, message_id: int):
+        user_id = self._by_message.pop(message_id, None)
+        if user_id is None:
+            return
+        self._counts[user_id] -= 1
+        if self._counts[user_id] <= 0:
+            del self._counts[user_id]
+
+    def is_premium(self, user_id: int) -> bool:
+        return user_id in self._counts
+
+    def watches(self, channel_id: int) -> bool:
+        return channel_id in self.channel_ids
+
+    def upsert(self, message_id: int, content: str):
+        self._remove(message_id)
+        user_id = self.parse(content)
+        if user_id is not None:
+            self._add(message_id, user_id)
+
+    def delete(self, message_id: int):
+        self._remove(message_id)
+
+    async def load(self, bot: discord.Client):
+        """Read every premium channel once. Later changes arrive through events."""
+        for channel_id in self.channel_ids:
+            channel = bot.get_channel(channel_id)
+            if not channel:
+                try:
+                    channel = await bot.fetch_channel(channel_id)
+                except discord.HTTPException:
+                    print(f"⚠️ Could not find premium channel with ID {channel_id}")
+                    continue
+            async for msg in channel.history(limit=None):
+                self.upsert(msg.id, msg.content)
+        self.loaded = True
+        print(f"[DEBUG] Loaded {len(self._counts)} premium members")
+
+
+PREMIUM = PremiumMembers([ROCKET_DIAL_PREMIUM_CHANNEL_ID, ADMIN_GOLD_MEMBERS_CHANNEL_ID])
+
+
+def is_premium(user_id: int) -> bool:
+    return PREMIUM.is_premium(user_id)
+
+
+# ─── Lightning Round scores ─────────────────────────────
+async def add_lightning_scores(scores: List[Tuple[int, str, int]]) -> None:
+    """Add (user_id, name, points) from one round to the running totals."""
+    await db.executemany(
+        """
+        INSERT INTO lightning_scores (user_id, name, score, updated_at) VALUES (?, ?, ?, ?)
+        ON CONFLICT(user_id) DO UPDATE SET
+            score = score + excluded.score,
+            name = excluded.name,
+            updated_at = excluded.updated_at
+        """,
+        [(uid, name, points, iso_now()) for uid, name, points in scores]
+    )
+
+
+async def fetch_lightning_leaderboard(limit: Optional[int] = None) -> List[Tuple[int, str, int]]:
+    """Return (user_id, name, score) rows, highest first."""
+    if limit:
+        return await db.fetchall("SELECT user_id, name, score FROM lightning_scores ORDER BY score DESC LIMIT ?",
+                                 (limit,))
+    return await db.fetchall("SELECT user_id, name, score FROM lightning_scores ORDER BY score DESC")
+
+
+# ─── Legacy channel text ─────────────────────────────
+_SNOWFLAKE = re.compile(r"(?<!\d)\d{15,20}(?!\d)")
+_LEGACY_LEADING_SEP = re.compile(r"^\s*[-—|]\s*")
+_LEGACY_DASH_SEP = re.compile(r"\s+[-—]\s+")  # " - " between fields; "-50" is a value, not a separator
+
+
+def parse_legacy_line(line: str) -> Optional[Tuple[int, str, List[str]]]:
+    """Tolerant parser for the lines admin channels used as storage:
+    gems "name - id - 120", inventory "name - id | 🎁 2x Item | ...",
+    Lightning Round "name - id | 5", daily quests "name — id | a1 | b0 | YES"
+    and reports "id | alias | 3x | reason".
+
+    Anchored on the user id, so names containing "-" or "|" still parse.
+    Returns (user_id, name, fields after the id) or None if there is no id."""
+    match = _SNOWFLAKE.search(line)
+    if not match:
+        return None
+    name = line[:match.start()].strip(" \t-—|:")
+    # Drop exactly one separator after the id, so a negative first field keeps its sign
+    rest = _LEGACY_LEADING_SEP.sub("", line[match.end():]).strip()
+    fields = rest.split("|") if "|" in rest else _LEGACY_DASH_SEP.split(rest)
+    fields = [f.strip() for f in fields] if rest else []
+    return int(match.group()), name, [f for f in fields if f]
+
+
+def legacy_int(text: str) -> Optional[int]:
+    """First integer in a field like "120", "1,250 💎" or "3x"."""
+    match = re.search(r"-?\d+", text.replace(",", ""))
+    return int(match.group()) if match else None
+
+
+async def legacy_import_done(source: str) -> bool:
+    """True once RocketBackfill has finished importing `source` from its channel."""
+    row = await db.fetchone("SELECT done_at FROM legacy_imports WHERE source=?", (source,))
+    return bool(row and row[0])
+
+
+# ─── Drawing submissions ─────────────────────────────
+DRAWING_SUBMISSION_CHANNEL_ID = int(os.getenv("DRAWING_SUBMISSION_CHANNEL", 0))
+DRAWING_URL_MIN_TTL = 3600  # a stored link is reused only if it outlives a whole drawing date
+
+
+def cdn_url_expires_at(url: str) -> Optional[int]:
+    """Unix time a signed Discord CDN link expires (its hex `ex` parameter), or None if unsigned."""
+    ex = parse_qs(urlparse(url).query).get("ex")
+    try:
+        return int(ex[0], 16) if ex else None
+    except ValueError:
+        return None
+
+
+def image_attachment(message: discord.Message) -> Optional[discord.Attachment]:
+    return next((a for a in message.attachments if a.content_type and a.content_type.startswith("image/")), None)
+
+
+def drawing_submission_row(message: discord.Message) -> Optional[Tuple[int, int, str, Optional[int], Optional[int]]]:
+    """(message_id, user_id, url, width, height) for a message with an image, else None."""
+    attachment = image_attachment(message)
+    if not attachment:
+        return None
+    return message.id, message.author.id, attachment.url, attachment.width, attachment.height
+
+
+async def record_drawing_submission(message: discord.Message) -> None:
+    row = drawing_submission_row(message)
+    if row:
+        await db.execute(
+            "INSERT OR REPLACE INTO drawing_submissions (message_id, user_id, url, width, height) VALUES (?, ?, ?, ?, ?)",
+            row
+        )
+
+
+async def delete_drawing_submissions(message_ids: List[int]) -> None:
+    await db.executemany("DELETE FROM drawing_submissions WHERE message_id=?", [(mid,) for mid in message_ids])
+
+
+async def latest_drawing(bot: discord.Client, user_id: int) -> Optional[str]:
+    """Image URL of a user's newest submission, looked up by id in drawing_submissions.
+
+    The stored CDN link is returned while it stays valid for DRAWING_URL_MIN_TTL;
+    otherwise the message is fetched for a fresh link, which is stored. Rows whose
+    message is gone are dropped and the next newest is used; any other HTTP error
+    returns None and keeps the row.
+    """
+    while True:
+        row = await db.fetchone(
+            "SELECT message_id, url FROM drawing_submissions WHERE user_id=? ORDER BY message_id DESC LIMIT 1",
+            (user_id,)
+        )
+        if not row:
+            return None
+        message_id, url = row
+        expires_at = cdn_url_expires_at(url) if url else None
+        if expires_at and expires_at - time.time() > DRAWING_URL_MIN_TTL:
+            return url
+
+        channel = bot.get_channel(DRAWING_SUBMISSION_CHANNEL_ID)
+        if not channel:
+            return None
+        try:
+            fresh = drawing_submission_row(await channel.fetch_message(message_id))
+        except discord.NotFound:
+            fresh = None
+        except discord.HTTPException as e:
+            print(f"[ERROR] Failed to fetch drawing {message_id}: {e}")
+            return None
+        if fresh:
+            await db.execute(
+                "UPDATE drawing_submissions SET url=?, width=?, height=? WHERE message_id=?",
+                (*fresh[2:], message_id)
+            )
+            return fresh[2]
+        await delete_drawing_submissions([message_id])
+
+
+# ─── Pokémon catch records ─────────────────────────────
+CATCH_LEADERBOARD_SIZE = 20
+
+
+class CatchLeaderboard:
+    """Catch totals in catch_records plus an in-memory top-K per guild.
+
+    Totals only ever grow, so a catch can only move its catcher into the
+    top-K; the list never needs a rescan after it is loaded.
+    """
+
+    def __init__(self, size: int = CATCH_LEADERBOARD_SIZE):
+        self.size = size
+        self._top: Dict[int, Dict[int, Tuple[str, int]]] = {}  # guild_id -> user_id -> (name, catches)
+
+    async def _load(self, guild_id: int) -> Dict[int, Tuple[str, int]]:
+        if guild_id not in self._top:
+            rows = await db.fetchall(
+                "SELECT user_id, name, catches FROM catch_records WHERE guild_id=? ORDER BY catches DESC LIMIT ?",
+                (guild_id, self.size)
+            )
+            self._top.setdefault(guild_id, {uid: (name, catches) for uid, name, catches in rows})
+        return self._top[guild_id]
+
+    async def record(self, guild_id: int, user_id: int, name: str) -> int:
+        """Add one catch and return the user's new total."""
+        def add(c: sqlite3.Cursor) -> int:
+            c.execute(
+                """
+                INSERT INTO catch_records (guild_id, user_id, name, catches, updated_at) VALUES (?, ?, ?, 1, ?)
+                ON CONFLICT(guild_id, user_id) DO UPDATE SET
+                    catches = catches + 1,
+                    name = excluded.name,
+                    updated_at = excluded.updated_at
+                """,
+                (guild_id, user_id, name, iso_now())
+            )
+            c.execute("SELECT catches FROM catch_records WHERE guild_id=? AND user_id=?", (guild_id, user_id))
+            return c.fetchone()[0]
+
+        catches = await db.transaction(add)
+        top = await self._load(guild_id)
+        if user_id in top or len(top) < self.size or catches > min(n for _, n in top.values()):
+            top[user_id] = (name, catches)
+            if len(top) > self.size:
+                del top[min(top, key=lambda uid: top[uid][1])]
+        return catches
+
+    def invalidate(self):
+        """Forget the loaded top-K lists, e.g. after catch_records changed outside record()."""
+        self._top.clear()
+
+    async def top(self, guild_id: int) -> List[Tuple[int, str, int]]:
+        """(user_id, name, catches) for the top catchers, highest first."""
+        top = await self._load(guild_id)
+        return sorted(((uid, name, n) for uid, (name, n) in top.items()), key=lambda r: r[2], reverse=True)
+
+
+CATCH_LEADERBOARD = CatchLeaderboard()
+
+
+# ─── Admin content cache ─────────────────────────────
+CONTENT_HISTORY_LIMIT = 50  # newest messages kept per watched channel
+
+
+class ContentCache:
+    """Game config posted in admin channels (JSON attachments and plain text).
+
+    Each watched channel is read once (newest CONTENT_HISTORY_LIMIT messages);
+    after that RocketCache applies message create/edit/delete events, so games
+    read config from memory. Parsed JSON is keyed by attachment id: a file is
+    downloaded once and a new upload replaces it naturally. Validation runs on
+    every read, since callers reading the same channel may check different shapes.
+    """
+
+    def __init__(self, history_limit: int = CONTENT_HISTORY_LIMIT):
+        self.history_limit = history_limit
+        self._watched: set = set()
+        # channel_id -> {message_id: (content, [(attachment_id, filename, url)])}
+        self._messages: Dict[int, Dict[int, Tuple[str, List[Tuple[int, str, str]]]]] = {}
+        self._parsed: Dict[int, Any] = {}  # attachment_id -> parsed JSON, not yet validated
+        self._locks: Dict[int, asyncio.Lock] = {}
+
+    def watch(self, channel_id: int):
+        if channel_id:
+            self._watched.add(channel_id)
+
+    def watches(self, channel_id: int) -> bool:
+        return channel_id in self._watched
+
+    def upsert(self, channel_id: int, message_id: int, content: str,
+               attachments: Optional[List[Tuple[int, str, str]]] = None):
+        messages = self._messages.get(channel_id)
+        if messages is None:
+            return  # not loaded yet; the first read will pick it up from history
+        old = messages.get(message_id)
+        if attachments is None:
+            attachments = old[1] if old else []
+        messages[message_id] = (content, attachments)
+        while len(messages) > self.history_limit:
+            del messages[min(messages)]
+
+    def delete(self, channel_id: int, message_id: int):
+        messages = self._messages.get(channel_id)
+        if messages:
+            messages.pop(message_id, None)
+
+    async def _ensure(self, bot: discord.Client, channel_id: int) -> Dict[int, Tuple[str, List[Tuple[int, str, str]]]]:
+        self.watch(channel_id)
+        if channel_id in self._messages:
+            return self._messages[channel_id]
+        lock = self._locks.setdefault(channel_id, asyncio.Lock())
+        async with lock:
+            if channel_id not in self._messages:
+                channel = bot.get_channel(channel_id)
+                messages = {}
+                if channel:
+                    async for msg in channel.history(limit=self.history_limit):
+                        messages[msg.id] = (msg.content, [(a.id, a.filename, a.url) for a in msg.attachments])
+                else:
+                    print(f"[DEBUG] Content channel {channel_id} not found")
+                self._messages[channel_id] = messages
+        return self._messages[channel_id]
+
+    async def recent_texts(self, bot: discord.Client, channel_id: int, n: int) -> List[Tuple[int, str]]:
+        """The last n messages as (message_id, content), oldest first."""
+        messages = await self._ensure(bot, channel_id)
+        newest = sorted(messages, reverse=True)[:n]
+        return [(mid, messages[mid][0]) for mid in reversed(newest)]
+
+    async def json_attachment(self, bot: discord.Client, channel_id: int, filename: Optional[str] = None,
+                              nth: int = 0, validate=None) -> Any:
+        """Parsed content of the nth newest .json attachment (optionally with an exact filename).
+        Returns None if there is none or it fails to parse/validate."""
+        messages = await self._ensure(bot, channel_id)
+        matches = []
+        for mid in sorted(messages, reverse=True):
+            for att_id, att_name, url in messages[mid][1]:
+                if (att_name == filename) if filename else att_name.endswith(".json"):
+                    matches.append((mid, att_id, att_name, url))
+        if len(matches) <= nth:
+            return None
+
+        message_id, att_id, att_name, url = matches[nth]
+        if att_id not in self._parsed:
+            try:
+                try:
+                    data_bytes = await bot.http.get_from_cdn(url)
+                except discord.HTTPException:
+                    # Signed CDN links expire; fetch the message for a fresh one
+                    msg = await bot.get_channel(channel_id).fetch_message(message_id)
+                    att = next(a for a in msg.attachments if a.id == att_id)
+                    data_bytes = await att.read()
+                self._parsed[att_id] = json.loads(data_bytes.decode("utf-8"))
+            except Exception as e:
+                print(f"[ERROR] Failed to load {att_name}: {e}")
+                return None  # not cached, so a later call retries
+
+        data = self._parsed[att_id]
+        if validate and not validate(data):
+            print(f"[ERROR] {att_name} (attachment {att_id}) failed validation")
+            return None
+        return data
+
+
+CONTENT = ContentCache()
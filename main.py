@@ -5,7 +5,7 @@ import asyncio
 import discord
 from discord.ext import commands
 from dotenv import load_dotenv
-from helpers import init_db  # our SQLite helpers
+from helpers import init_db, CHANNELS  # our SQLite helpers
 from keep_alive import keep_alive  # optional for Replit/Railway
 
 print("🚀 Running Bot Version: v4 - SQLite Ready!")
@@ -23,9 +23,6 @@ if not TOKEN:
     print("❌ DISCORD_TOKEN not set in .env")
     exit(1)
 
-# ─── Initialize database ─────────────────────────────
-init_db()
-
 # ─── Bot setup ─────────────────────────────
 intents = discord.Intents.default()
 intents.guilds = True
@@ -48,7 +45,7 @@ async def on_message(message):
 
 @bot.event
 async def on_guild_join(guild):
-    channel = discord.utils.get(guild.text_channels, name="rocketbot")
+    channel = CHANNELS.get(guild, "rocketbot")
     message = (
         "🚀 **Hey Rocket Players!**\n"
         "Thanks for letting me land—I promise I won’t crash your channel… at least not on purpose! 😎\n\n"
@@ -70,6 +67,8 @@ async def on_guild_join(guild):
 # ─── Load all extensions from py folder ─────────────
 async def load_extensions():
     extensions = [
+        "py.rocket_cache",
+        "py.rocket_backfill",
         "py.rocket_slash_commands",
         "py.rocket_date_game",
         "py.rocket_campfire",
@@ -110,6 +109,8 @@ async def on_ready():
 
 # ─── Start bot ─────────────────────────────
 async def main():
+    # Migrations run before any cog reads the database; backfills continue in the background
+    bot.db_backfills = await init_db()
     await load_extensions()
     try:
         await bot.start(TOKEN)
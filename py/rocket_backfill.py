@@ -0,0 +1,445 @@
+import os
+import re
+import asyncio
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import discord
+from discord.ext import commands
+from helpers import (
+    db, is_admin, iso_now, parse_legacy_line, legacy_int, drawing_submission_row, load_mirror_pages, BASE_DIR,
+    LEADERBOARD_CHANNEL_ID, INVENTORY_CHANNEL_ID, INVENTORY, DAILY_QUESTS, DAILY_QUEST_RETENTION_DAYS,
+    DRAWING_SUBMISSION_CHANNEL_ID, CHANNELS
+)
+
+LEGACY_IMPORT_CONCURRENCY = 2   # channels paging history at the same time
+LEGACY_IMPORT_PAGE_SIZE = 100   # messages per history request / per transaction
+LEGACY_SKIPPED_SAMPLES = 10     # unparsed lines kept per source for the report
+LEGACY_IMPORT_REPORT = os.path.join(BASE_DIR, "legacy_import_report.txt")
+
+# Source -> admin channel that used to hold its state as text
+LEGACY_SOURCES: Dict[str, int] = {
+    "gems": LEADERBOARD_CHANNEL_ID,
+    "inventory": INVENTORY_CHANNEL_ID,
+    "lightning": int(os.getenv("ADMIN_LIGHTNING_ROUND_ID", 0)),
+    "daily_quests": int(os.getenv("DAILY_QUEST_CHANNEL_ID", 0)),
+    "reported": int(os.getenv("ADMIN_REPORTED_MEMBERS", 0)),
+    "reporter": int(os.getenv("ADMIN_REPORTER_MEMBERS", 0)),
+    "drawings": DRAWING_SUBMISSION_CHANNEL_ID,
+    "catches": 0,  # the main guild's catch channel, resolved on ready
+}
+
+# Source -> (table, WHERE clause) counted in the reconciliation report
+LEGACY_TABLES = {
+    "gems": ("gems_ledger", ""),
+    "inventory": ("inventory_owners", ""),
+    "lightning": ("lightning_scores", ""),
+    "daily_quests": ("daily_quest_claims", ""),
+    "reported": ("dial_reports", "WHERE kind='reported'"),
+    "reporter": ("dial_reports", "WHERE kind='reporter'"),
+    "drawings": ("drawing_submissions", ""),
+    "catches": ("catch_records", ""),
+}
+
+# Sources whose rows live code also writes while the import runs. Legacy values for
+# users created after the import started are added to those rows instead of ignored.
+LEGACY_MERGED_TABLES = {
+    "gems": "gems_ledger",
+    "inventory": "inventory_owners",
+    "lightning": "lightning_scores",
+}
+
+INVENTORY_ITEM_RE = re.compile(r"(\S+)\s+(\d+)x\s+(.+)")
+QUEST_STATUS_RE = re.compile(r"^([a-z])([01])$", re.IGNORECASE)
+QUEST_DATE_RE = re.compile(r"(\d{4}-\d{2}-\d{2})")
+CATCH_NOTICE_RE = re.compile(r"💎\s*<@!?(\d+)>")
+
+
+class RocketBackfill(commands.Cog):
+    """One-shot, resumable import of the state admin channels used to keep as text
+    (plus the drawing submissions index, built from the submission channel, and
+    catch totals, counted from the catch channel's old gem notices).
+
+    Each source pages through its channel newest first, one history page per
+    transaction, and stores the oldest imported message id so a restart resumes
+    where it stopped. The newest message wins within a channel. Users already in
+    SQLite when a source starts keep their row; gems, items and Lightning scores
+    of users created while the import runs are added to what they earned since.
+    Mirror pages and anything the bot posted after a source started are skipped,
+    since they show SQLite state rather than legacy text.
+    """
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.guild_id = int(os.getenv("MAIN_GUILD", 0))
+        self._semaphore = asyncio.Semaphore(LEGACY_IMPORT_CONCURRENCY)
+        self._task: Optional[asyncio.Task] = None
+        self._skipped_samples: Dict[str, List[str]] = {}
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        self.start()
+
+    def start(self) -> bool:
+        if self._task and not self._task.done():
+            return False
+        self._task = asyncio.create_task(self.run())
+        return True
+
+    async def run(self):
+        if not LEGACY_SOURCES["catches"]:
+            guild = self.bot.get_guild(self.guild_id)
+            channel = CHANNELS.get(guild, "catch") if guild else None
+            LEGACY_SOURCES["catches"] = channel.id if channel else 0
+        sources = [s for s, channel_id in LEGACY_SOURCES.items() if channel_id]
+        results = await asyncio.gather(*(self.import_source(s) for s in sources), return_exceptions=True)
+        for source, result in zip(sources, results):
+            if isinstance(result, Exception):
+                print(f"[ERROR] Legacy import of {source} failed: {result}")
+            elif result:
+                self.bot.dispatch("legacy_import", source)
+        if LEGACY_SOURCES["drawings"]:
+            try:
+                await self.catch_up_drawings()
+            except Exception as e:
+                print(f"[ERROR] Drawing submissions catch-up failed: {e}")
+        try:
+            report = await self.build_report()
+            with open(LEGACY_IMPORT_REPORT, "w", encoding="utf-8") as f:
+                f.write(report)
+        except Exception as e:
+            print(f"[ERROR] Failed to write legacy import report: {e}")
+
+    # ---------------------------
+    # Paging
+    # ---------------------------
+    async def import_source(self, source: str) -> bool:
+        """Import one source until its channel is exhausted. Returns True if anything was imported this run."""
+        channel_id = LEGACY_SOURCES[source]
+
+        def begin(c: sqlite3.Cursor):
+            c.execute(
+                "INSERT OR IGNORE INTO legacy_imports (source, channel_id, started_at) VALUES (?, ?, ?)",
+                (source, channel_id, iso_now())
+            )
+            if c.rowcount and source in LEGACY_MERGED_TABLES:
+                # Rows that exist before the first page already carry their legacy state
+                c.execute(
+                    f"INSERT OR IGNORE INTO legacy_import_users (source, user_id) "
+                    f"SELECT ?, user_id FROM {LEGACY_MERGED_TABLES[source]}",
+                    (source,)
+                )
+
+        await db.transaction(begin)
+        before_id, started_at, done_at = await db.fetchone(
+            "SELECT before_id, started_at, done_at FROM legacy_imports WHERE source=?", (source,)
+        )
+        if done_at:
+            return False
+        started_at = datetime.fromisoformat(started_at)
+
+        channel = self.bot.get_channel(channel_id)
+        if not channel:
+            print(f"[DEBUG] Legacy import: channel for {source} not found")
+            return False
+
+        writer = {
+            "gems": self._write_gems,
+            "inventory": self._write_inventory,
+            "lightning": self._write_lightning,
+            "daily_quests": self._write_daily_quests,
+            "drawings": self._write_drawings,
+            "catches": self._write_catches,
+        }.get(source, self._write_reports)
+        imported = False
+        while True:
+            async with self._semaphore:
+                before = discord.Object(id=before_id) if before_id else None
+                page = [m async for m in channel.history(limit=LEGACY_IMPORT_PAGE_SIZE, before=before)]
+            mirror_ids = set(await load_mirror_pages(channel_id))
+
+            def write(c: sqlite3.Cursor, page=page) -> bool:
+                parsed = inserted = skipped = 0
+                stop = False
+                for message in page:
+                    if self._is_live_message(message, mirror_ids, started_at):
+                        continue
+                    p, i, s, stop = writer(c, source, message)
+                    parsed, inserted, skipped = parsed + p, inserted + i, skipped + s
+                    if stop:
+                        break
+                done = stop or len(page) < LEGACY_IMPORT_PAGE_SIZE
+                c.execute(
+                    """
+                    UPDATE legacy_imports SET
+                        before_id = ?, messages = messages + ?, parsed = parsed + ?,
+                        inserted = inserted + ?, skipped = skipped + ?, done_at = ?
+                    WHERE source=?
+                    """,
+                    (page[-1].id if page else before_id, len(page), parsed, inserted, skipped,
+                     iso_now() if done else None, source)
+                )
+                return done
+
+            done = await db.transaction(write)
+            imported = True
+            if page:
+                before_id = page[-1].id
+            if done:
+                print(f"[DEBUG] Legacy import of {source} complete")
+                return imported
+            await asyncio.sleep(0)
+
+    async def catch_up_drawings(self) -> int:
+        """Index submissions newer than the newest indexed one, e.g. posted while the bot
+        was offline. Runs after every import, since "drawings" is only imported once."""
+        channel = self.bot.get_channel(LEGACY_SOURCES["drawings"])
+        if not channel:
+            return 0
+        (after_id,) = await db.fetchone("SELECT MAX(message_id) FROM drawing_submissions")
+        added = 0
+        while True:
+            async with self._semaphore:
+                after = discord.Object(id=after_id) if after_id else None
+                page = [m async for m in channel.history(limit=LEGACY_IMPORT_PAGE_SIZE, after=after, oldest_first=True)]
+            if not page:
+                break
+
+            def write(c: sqlite3.Cursor, page=page) -> int:
+                return sum(self._write_drawings(c, "drawings", m)[1] for m in page)
+
+            added += await db.transaction(write)
+            after_id = page[-1].id
+            if len(page) < LEGACY_IMPORT_PAGE_SIZE:
+                break
+            await asyncio.sleep(0)
+        if added:
+            print(f"[DEBUG] Indexed {added} drawing submissions posted while offline")
+        return added
+
+    def _is_live_message(self, message: discord.Message, mirror_ids, started_at: datetime) -> bool:
+        """Messages the bot writes now (mirror pages, new report posts) already show SQLite state."""
+        if message.id in mirror_ids:
+            return True
+        return message.author.id == self.bot.user.id and message.created_at > started_at
+
+    def _lines(self, source: str, content: str):
+        """Parsed lines of a message; unparsed non-empty lines are counted (and sampled) as skipped."""
+        parsed, skipped = [], 0
+        for line in content.splitlines():
+            if not line.strip():
+                continue
+            entry = parse_legacy_line(line)
+            if entry:
+                parsed.append(entry)
+            else:
+                skipped += 1
+                samples = self._skipped_samples.setdefault(source, [])
+                if len(samples) < LEGACY_SKIPPED_SAMPLES:
+                    samples.append(line[:200])
+        return parsed, skipped
+
+    @staticmethod
+    def _claim(c, source, user_id) -> bool:
+        """True the first time a user's line is seen for a merged source (newest message wins)."""
+        c.execute("INSERT OR IGNORE INTO legacy_import_users (source, user_id) VALUES (?, ?)", (source, user_id))
+        return c.rowcount == 1
+
+    # ---------------------------
+    # Writers: (cursor, source, message) -> (parsed, inserted, skipped, stop)
+    # ---------------------------
+    def _write_gems(self, c, source, message):
+        lines, skipped = self._lines(source, message.content)
+        inserted = 0
+        for user_id, name, fields in lines:
+            gems = legacy_int(fields[-1]) if fields else None
+            if gems is None:
+                skipped += 1
+                continue
+            if not self._claim(c, source, user_id):
+                continue
+            c.execute(
+                """
+                INSERT INTO gems_ledger (user_id, name, gems, updated_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(user_id) DO UPDATE SET
+                    gems = gems + excluded.gems,
+                    name = COALESCE(gems_ledger.name, excluded.name)
+                """,
+                (user_id, name or None, gems, iso_now())
+            )
+            inserted += 1
+        return len(lines), inserted, skipped, False
+
+    def _write_inventory(self, c, source, message):
+        lines, skipped = self._lines(source, message.content)
+        inserted = 0
+        for user_id, name, fields in lines:
+            if not self._claim(c, source, user_id):
+                continue  # newer text or a row from before the import already covers this user
+            c.execute("INSERT OR IGNORE INTO inventory_owners (user_id, name) VALUES (?, ?)", (user_id, name or None))
+            for field in fields:
+                match = INVENTORY_ITEM_RE.match(field)
+                if match:
+                    emoji, count, item_name = match.groups()
+                    if int(count) > 0:
+                        INVENTORY.write_item(c, user_id, None, emoji, item_name, int(count))
+            INVENTORY.invalidate(user_id)
+            inserted += 1
+        return len(lines), inserted, skipped, False
+
+    def _write_lightning(self, c, source, message):
+        # The channel also holds the question and config messages; only "name - id | score" lines parse
+        lines, _ = self._lines(source, message.content)
+        inserted = 0
+        for user_id, name, fields in lines:
+            score = legacy_int(fields[0]) if fields else None
+            if score is None or not self._claim(c, source, user_id):
+                continue
+            c.execute(
+                """
+                INSERT INTO lightning_scores (user_id, name, score, updated_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(user_id) DO UPDATE SET
+                    score = score + excluded.score,
+                    name = COALESCE(lightning_scores.name, excluded.name)
+                """,
+                (user_id, name or None, score, iso_now())
+            )
+            inserted += 1
+        return len(lines), inserted, 0, False
+
+    def _write_daily_quests(self, c, source, message):
+        # "Daily Quest — YYYY-MM-DD" then "name — id | a1 | b0 | c1 | d0 | YES" per user
+        content, created_at = message.content, message.created_at
+        header = QUEST_DATE_RE.search(content.split("\n", 1)[0])
+        if not header:
+            return 0, 0, 0, False
+        day = header.group(1)
+        cutoff = (datetime.now() - timedelta(days=DAILY_QUEST_RETENTION_DAYS)).strftime("%Y-%m-%d")
+        if day < cutoff:
+            return 0, 0, 0, True  # older days would be pruned anyway
+        lines, skipped = self._lines(source, content.split("\n", 1)[1] if "\n" in content else "")
+        inserted = 0
+        for user_id, _, fields in lines:
+            for field in fields:
+                match = QUEST_STATUS_RE.match(field)
+                if match and match.group(2) == "1" and match.group(1).lower() in DAILY_QUESTS:
+                    c.execute(
+                        "INSERT OR IGNORE INTO daily_quests (date, guild_id, user_id, quest_id, completed_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (day, self.guild_id, user_id, match.group(1).lower(), created_at.isoformat())
+                    )
+            if fields and fields[-1].upper() == "YES":
+                c.execute(
+                    "INSERT OR IGNORE INTO daily_quest_claims (date, guild_id, user_id, claimed_at) VALUES (?, ?, ?, ?)",
+                    (day, self.guild_id, user_id, created_at.isoformat())
+                )
+            inserted += 1
+        return len(lines), inserted, skipped, False
+
+    def _write_reports(self, c, source, message):
+        # "{user_id} | {name} | {N}x | {reason}", one message per user. Counts only grow, so a
+        # report filed during the import keeps its row and message but never drops the legacy count.
+        lines, skipped = self._lines(source, message.content)
+        inserted = 0
+        for user_id, _, fields in lines:
+            count = legacy_int(fields[1]) if len(fields) > 1 else None
+            if count is None:
+                skipped += 1
+                continue
+            c.execute(
+                """
+                INSERT INTO dial_reports (kind, user_id, name, count, reason, message_id, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(kind, user_id) DO UPDATE SET count = excluded.count WHERE excluded.count > dial_reports.count
+                """,
+                (source, user_id, fields[0], count, " | ".join(fields[2:]), message.id, iso_now())
+            )
+            inserted += c.rowcount
+        return len(lines), inserted, skipped, False
+
+    def _write_drawings(self, c, source, message):
+        # Every image message is a submission; the user's latest is looked up by highest message id
+        row = drawing_submission_row(message)
+        if not row:
+            return 0, 0, 0, False
+        c.execute(
+            "INSERT OR IGNORE INTO drawing_submissions (message_id, user_id, url, width, height) VALUES (?, ?, ?, ?, ?)",
+            row
+        )
+        return 1, c.rowcount, 0, False
+
+    def _write_catches(self, c, source, message):
+        # The old `.pc lb` counted the bot's "💎 @user earned **1 gems**!" catch notices.
+        # Live catch notices are digest embeds, so content matches are always legacy.
+        if message.author.id != self.bot.user.id or not message.guild:
+            return 0, 0, 0, False
+        user_ids = [int(uid) for uid in CATCH_NOTICE_RE.findall(message.content)]
+        c.executemany(
+            """
+            INSERT INTO catch_records (guild_id, user_id, name, catches, updated_at) VALUES (?, ?, NULL, 1, ?)
+            ON CONFLICT(guild_id, user_id) DO UPDATE SET catches = catches + 1
+            """,
+            [(message.guild.id, uid, iso_now()) for uid in user_ids]
+        )
+        return len(user_ids), len(user_ids), 0, False
+
+    # ---------------------------
+    # Reconciliation report
+    # ---------------------------
+    async def build_report(self) -> str:
+        rows = {r[0]: r[1:] for r in await db.fetchall(
+            "SELECT source, channel_id, messages, parsed, inserted, skipped, started_at, done_at FROM legacy_imports"
+        )}
+        out = [f"Legacy import report — {iso_now()}", ""]
+        for source, channel_id in LEGACY_SOURCES.items():
+            table, where = LEGACY_TABLES[source]
+            (stored,) = await db.fetchone(f"SELECT COUNT(*) FROM {table} {where}")
+            if source not in rows:
+                status = "not configured" if not channel_id else "not started"
+                out.append(f"[{source}] {status}; {table}: {stored} rows")
+                continue
+            _, messages, parsed, inserted, skipped, started_at, done_at = rows[source]
+            out.append(f"[{source}] channel {channel_id} — {'done ' + done_at if done_at else 'in progress'}")
+            out.append(f"  messages scanned: {messages}")
+            out.append(f"  lines parsed:     {parsed}")
+            out.append(f"  rows imported:    {inserted}")
+            out.append(f"  already stored:   {parsed - inserted}")
+            out.append(f"  lines skipped:    {skipped}")
+            out.append(f"  {table} now holds {stored} rows")
+            for sample in self._skipped_samples.get(source, []):
+                out.append(f"    skipped: {sample}")
+        return "\n".join(out) + "\n"
+
+    # ---------------------------
+    # Admin commands
+    # ---------------------------
+    @commands.group(name="backfill", invoke_without_command=True)
+    async def backfill(self, ctx: commands.Context):
+        """📦 Legacy channel import status (sends the reconciliation report)."""
+        if not is_admin(ctx.author):
+            return await ctx.send("🚫 You don’t have permission to use this command!")
+        report = await self.build_report()
+        with open(LEGACY_IMPORT_REPORT, "w", encoding="utf-8") as f:
+            f.write(report)
+        running = "⏳ Import running." if self._task and not self._task.done() else "✅ Import idle."
+        await ctx.send(running, file=discord.File(LEGACY_IMPORT_REPORT, filename="legacy_import_report.txt"))
+
+    @backfill.command(name="run")
+    async def backfill_run(self, ctx: commands.Context, source: Optional[str] = None):
+        """Re-import a source from the newest message (or resume all unfinished sources)."""
+        if not is_admin(ctx.author):
+            return await ctx.send("🚫 You don’t have permission to use this command!")
+        if source:
+            if source not in LEGACY_SOURCES:
+                return await ctx.send(f"⚠️ Unknown source. Use one of: {', '.join(LEGACY_SOURCES)}")
+            await db.execute("DELETE FROM legacy_imports WHERE source=?", (source,))
+            await db.execute("DELETE FROM legacy_import_users WHERE source=?", (source,))
+            self._skipped_samples.pop(source, None)
+        if self.start():
+            await ctx.send("📦 Legacy import started. Use `.backfill` for the report.")
+        else:
+            await ctx.send("⏳ An import is already running; it will pick this up next run.")
+
+
+async def setup(bot):
+    await bot.add_cog(RocketBackfill(bot))
@@ -0,0 +1,112 @@
+import discord
+from discord.ext import commands
+from helpers import PREMIUM, CONTENT, ROLE_INDEX, MEMBERS, CHANNELS
+
+
+class RocketCache(commands.Cog):
+    """Keeps the shared in-memory indexes in helpers current from gateway events."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        for guild in self.bot.guilds:
+            CHANNELS.rebuild(guild)
+        if not PREMIUM.loaded:
+            try:
+                await PREMIUM.load(self.bot)
+            except discord.HTTPException as e:
+                print(f"[ERROR] Failed to load premium members: {e}")
+
+    # ---- Premium members / admin content ----
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        if PREMIUM.watches(message.channel.id):
+            PREMIUM.upsert(message.id, message.content)
+        if CONTENT.watches(message.channel.id):
+            CONTENT.upsert(message.channel.id, message.id, message.content,
+                           [(a.id, a.filename, a.url) for a in message.attachments])
+
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent):
+        content = payload.data.get("content")
+        if content is not None and PREMIUM.watches(payload.channel_id):
+            PREMIUM.upsert(payload.message_id, content)
+        if content is not None and CONTENT.watches(payload.channel_id):
+            attachments = payload.data.get("attachments")
+            if attachments is not None:
+                attachments = [(int(a["id"]), a["filename"], a["url"]) for a in attachments]
+            CONTENT.upsert(payload.channel_id, payload.message_id, content, attachments)
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        if PREMIUM.watches(payload.channel_id):
+            PREMIUM.delete(payload.message_id)
+        if CONTENT.watches(payload.channel_id):
+            CONTENT.delete(payload.channel_id, payload.message_id)
+
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent):
+        for message_id in payload.message_ids:
+            if PREMIUM.watches(payload.channel_id):
+                PREMIUM.delete(message_id)
+            if CONTENT.watches(payload.channel_id):
+                CONTENT.delete(payload.channel_id, message_id)
+
+    # ---- Role index ----
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        ROLE_INDEX.member_join(member)
+        MEMBERS.forget(member.guild.id, member.id)  # drop a cached "left the guild" answer
+
+    @commands.Cog.listener()
+    async def on_raw_member_remove(self, payload: discord.RawMemberRemoveEvent):
+        ROLE_INDEX.member_remove(payload.guild_id, payload.user.id)
+        MEMBERS.forget(payload.guild_id, payload.user.id)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        if before.roles != after.roles:
+            ROLE_INDEX.member_update(before, after)
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role: discord.Role):
+        ROLE_INDEX.role_update(role)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        if before.name != after.name:
+            ROLE_INDEX.role_update(after)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        ROLE_INDEX.role_delete(role)
+
+    # ---- Channel registry ----
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild):
+        CHANNELS.rebuild(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        CHANNELS.remove_guild(guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
+        if isinstance(channel, discord.TextChannel):
+            CHANNELS.rebuild(channel.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        if isinstance(after, discord.TextChannel) and (before.name != after.name or before.position != after.position):
+            CHANNELS.rebuild(after.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        if isinstance(channel, discord.TextChannel):
+            CHANNELS.rebuild(channel.guild)
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(RocketCache(bot))
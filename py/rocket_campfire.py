@@ -1,9 +1,9 @@
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 import asyncio
 import random
 from datetime import datetime, timedelta
-from helpers import (award_points)
+from helpers import award_points_many, relative_time
 
 MAX_CAMPERS = 15
 MIN_CAMPERS = 2
@@ -12,15 +12,14 @@ CONFESS_TIMEOUT = 60  # in seconds
 REACTION_COUNTDOWN = 15  # 30s to react
 LIT_COOLDOWN_HOURS = 5
 TIMEOUT_DURATION = 60  # 1 minute freeze for kicked players after campfire
+VOTE_EMOJIS = ("👍", "👎")
 
 class RocketCampfire(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.campfires = {}  # guild_id -> campfire state
         self.user_lit_timestamp = {}  # user_id -> last lit time
-
-    async def cog_load(self):
-        self.reaction_cleaner.start()
+        self.confession_votes = {}  # confession message_id -> {"👍": {user_ids}, "👎": {user_ids}}
 
     # ----------------- CC Group -----------------
     @commands.group(name="cc", invoke_without_command=True)
@@ -101,15 +100,11 @@ class RocketCampfire(commands.Cog):
     async def join_countdown(self, guild, channel):
         guild_id = str(guild.id)
         record = self.campfires[guild_id]
-        remaining = JOIN_COUNTDOWN
-        status_msg = await channel.send(f"⏳ Campfire join countdown: {remaining}s remaining...")
-
-        while remaining > 0:
-            await asyncio.sleep(1)
-            remaining -= 1
-            try:
-                await status_msg.edit(content=f"⏳ Campfire join countdown: {remaining}s remaining...")
-            except: pass
+        status_msg = await channel.send(f"⏳ Campfire join countdown: joining closes {relative_time(JOIN_COUNTDOWN)}")
+        await asyncio.sleep(JOIN_COUNTDOWN)
+        try:
+            await status_msg.edit(content="⏳ Campfire joining is closed.")
+        except: pass
 
         record["joining_phase"] = False
         if len(record["campers"]) < MIN_CAMPERS:
@@ -122,8 +117,16 @@ class RocketCampfire(commands.Cog):
 
     # ----------------- Confession Loop -----------------
     async def start_confession_loop(self, guild, channel):
-        guild_id = str(guild.id)
-        record = self.campfires[guild_id]
+        record = self.campfires[str(guild.id)]
+        try:
+            await self.run_confessions(guild, channel, record)
+        finally:
+            # Stop tracking votes even when the session aborted partway
+            record["active"] = False
+            for conf in record["confessions"]:
+                self.confession_votes.pop(conf["msg"].id, None)
+
+    async def run_confessions(self, guild, channel, record):
         kicked = record["kicked_campers"]
         remaining_campers = [u for u in record["campers"] if u not in kicked]
         survivors = []
@@ -183,41 +186,51 @@ class RocketCampfire(commands.Cog):
                 )
                 embed.set_author(name=sender_name)
                 confess_msg = await channel.send(embed=embed)
+                self.confession_votes[confess_msg.id] = {emoji: set() for emoji in VOTE_EMOJIS}
+                record["confessions"].append({"author_id": chosen_id, "anon": anon, "msg": confess_msg})
                 await confess_msg.add_reaction("👍")
                 await confess_msg.add_reaction("👎")
-                record["confessions"].append({"author_id": chosen_id, "anon": anon, "msg": confess_msg})
                 await member.send(f"✅ Your confession delivered here: {confess_msg.jump_url}")
                 break  # exit while loop
 
             if not confess_success:
                 kicked.append(chosen_id)
+                continue  # nothing to vote on
 
             # Reaction countdown
-            countdown_msg = await channel.send(f"⏳ 30s to react! Campers, vote 👍 or 👎!")
-            for remaining in range(REACTION_COUNTDOWN, 0, -1):
-                try:
-                    await countdown_msg.edit(content=f"⏳ {remaining}s to react! Campers, vote 👍 or 👎!")
-                except: pass
-                await asyncio.sleep(1)
-
-            # Count votes and kick if majority 👎
-            msg = await channel.fetch_message(confess_msg.id)
-            thumbs_up = sum(r.count - 1 for r in msg.reactions if str(r.emoji) == "👍")
-            thumbs_down = sum(r.count - 1 for r in msg.reactions if str(r.emoji) == "👎")
+            countdown_msg = await channel.send(f"⏳ Voting closes {relative_time(REACTION_COUNTDOWN)}! Campers, vote 👍 or 👎!")
+            await asyncio.sleep(REACTION_COUNTDOWN)
+
+            # Count votes and kick if majority 👎; the verdict replaces the countdown
+            votes = self.confession_votes.get(confess_msg.id, {})
+            thumbs_up = len(votes.get("👍", ()))
+            thumbs_down = len(votes.get("👎", ()))
             if thumbs_down > thumbs_up:
                 kicked.append(chosen_id)
-                await channel.send(f"❌ Camper got majority 👎 and will be frozen after campfire!")
+                verdict = f"❌ Camper got majority 👎 and will be frozen after campfire!"
             else:
                 survivors.append(chosen_id)
-                await channel.send(f"✅ Camper's confession passed!")
+                verdict = f"✅ Camper's confession passed!"
+            try:
+                await countdown_msg.edit(content=f"⏰ Voting closed! {verdict}")
+            except discord.HTTPException:
+                await channel.send(verdict)
 
         # ----------------- Freeze all kicked players after campfire ends -----------------
-        await channel.send("🔥 Campfire ended! All kicked players are frozen ❄️ and will be rewarded 3 gems 💎.")
-        await channel.send("🎉 All surviving campers are rewarded with 5 gems 💎!")
+        summary = [
+            "🔥 Campfire ended! All kicked players are frozen ❄️ and will be rewarded 3 gems 💎.",
+            "🎉 All surviving campers are rewarded with 5 gems 💎!",
+        ]
+        awards = []
         for camper in survivors:
             member = guild.get_member(camper)
-            await member.send(f"🎉 Congratulations camper! You survived the campfire confession and earned bonus gems! 💎")
-            await award_points(self.bot, member, 5, dm=True)
+            if not member:
+                continue
+            awards.append((member, 5))
+            try:
+                await member.send(f"🎉 Congratulations camper! You survived the campfire confession and earned bonus gems! 💎")
+            except discord.Forbidden:
+                pass
 
         for user_id in kicked:
             member = guild.get_member(user_id)
@@ -226,30 +239,41 @@ class RocketCampfire(commands.Cog):
                 until = discord.utils.utcnow() + timedelta(seconds=TIMEOUT_DURATION)
                 try:
                     await member.edit(timed_out_until=until, reason="Campfire ended - auto freeze")
-                    await member.send(f"❄️ You were kicked during the campfire and are now frozen for {TIMEOUT_DURATION//60} minutes!")
-                    await member.send(f"You still earned bonus gems just for joining the campfire!")
-                    await award_points(self.bot, member, 3, dm=True)
+                    await member.send(f"❄️ You were kicked during the campfire and are now frozen for {TIMEOUT_DURATION//60} minutes!"
+                                      f"\nYou still earned bonus gems just for joining the campfire!")
                 except:
-                    await channel.send(f"⚠️ Could not freeze {member.display_name}.")
+                    summary.append(f"⚠️ Could not freeze {member.display_name}.")
+                awards.append((member, 3))
+
+        await channel.send("\n".join(summary))
+        await award_points_many(self.bot, awards, notify_channel=channel, title="🔥 Campfire Rewards")
 
-        record["active"] = False
         record["finished"] = True
 
-    # ----------------- Reaction Cleaner -----------------
-    @tasks.loop(seconds=2)
-    async def reaction_cleaner(self):
-        await self.bot.wait_until_ready()
-        for guild_id, record in self.campfires.items():
-            for conf in record.get("confessions", []):
-                try:
-                    msg = await conf["msg"].channel.fetch_message(conf["msg"].id)
-                    for reaction in msg.reactions:
-                        if str(reaction.emoji) not in ("👍","👎"):
-                            users = await reaction.users().flatten()
-                            for u in users:
-                                if u != self.bot.user:
-                                    await msg.remove_reaction(reaction.emoji,u)
-                except: continue
+    # ----------------- Confession Reactions -----------------
+    @commands.Cog.listener()
+    async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent):
+        votes = self.confession_votes.get(payload.message_id)
+        if votes is None or payload.user_id == self.bot.user.id:
+            return
+        emoji = str(payload.emoji)
+        if emoji in votes:
+            votes[emoji].add(payload.user_id)
+            return
+        # Only 👍/👎 are allowed on confessions
+        channel = self.bot.get_channel(payload.channel_id)
+        if channel:
+            try:
+                await channel.get_partial_message(payload.message_id).remove_reaction(
+                    payload.emoji, discord.Object(payload.user_id))
+            except discord.HTTPException:
+                pass
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_remove(self, payload: discord.RawReactionActionEvent):
+        votes = self.confession_votes.get(payload.message_id)
+        if votes is not None and str(payload.emoji) in votes:
+            votes[str(payload.emoji)].discard(payload.user_id)
 
 async def setup(bot):
     await bot.add_cog(RocketCampfire(bot))
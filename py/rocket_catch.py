@@ -1,14 +1,11 @@
 import os
-import json
 import random
 import asyncio
 import discord
 from datetime import datetime, timedelta
 from discord.ext import commands
 from discord import app_commands
-from helpers import award_points, is_admin  # your helpers
-import re
-from collections import defaultdict
+from helpers import award_points, is_admin, CATCH_LEADERBOARD, TITLE_ROLES, CONTENT, CHANNELS  # your helpers
 
 ADMIN_ROCKET_LIST_CHANNEL_ID = int(os.getenv("ADMIN_ROCKET_LIST_CHANNEL_ID", 0))
 CATCH_CHANNEL_NAME_KEYWORD = "catch"  # Look for channels containing this keyword
@@ -130,6 +127,7 @@ class CatchView(discord.ui.View):
                 title = f"✅ {user.display_name} caught **{pokemon_name}!**"
                 line = random.choice(SUCCESS_LINES).format(pokemon=pokemon_name)
                 color = discord.Color.green()
+                await CATCH_LEADERBOARD.record(interaction.guild.id, user.id, user.display_name)
                 await award_points(self.bot, user, 1, notify_channel=interaction.channel)
             else:
                 title = f"❌ {user.display_name} chose a Wrong Gadget! Failed to catch **{pokemon_name}!**"
@@ -167,11 +165,9 @@ class CatchView(discord.ui.View):
                 color=discord.Color.dark_gray()
             )
 
-            # Send to the first channel containing "catch"
-            for channel in self.bot.get_all_channels():
-                if isinstance(channel, discord.TextChannel) and CATCH_CHANNEL_NAME_KEYWORD in channel.name.lower():
-                    await channel.send(embed=embed)
-                    break
+            # Send to the catch channel this Pokémon was posted in
+            if self.message:
+                await self.message.channel.send(embed=embed)
 
             if self.next_callback:
                 await self.next_callback()
@@ -189,32 +185,19 @@ class RocketCatch(commands.Cog):
         self.pokemon_queue = []
         self.user_attempts = {}
         self.cooldowns = {}
-        self._lb_running = False
+        CONTENT.watch(ADMIN_ROCKET_LIST_CHANNEL_ID)
 
     async def load_second_latest_json_from_channel(self):
-        channel = self.bot.get_channel(ADMIN_ROCKET_LIST_CHANNEL_ID)
-        if not channel:
-            print("⚠️ Admin channel not found.")
+        data = await CONTENT.json_attachment(
+            self.bot, ADMIN_ROCKET_LIST_CHANNEL_ID, nth=1,
+            validate=lambda d: isinstance(d, list) and all("pokemon" in p and "choices" in p for p in d)
+        )
+        if data is None:
+            print("⚠️ No valid second-latest JSON attachment found.")
             return []
+        return data
 
-        found_count = 0
-        async for message in channel.history(limit=5):
-            if message.attachments:
-                for attachment in message.attachments:
-                    if attachment.filename.endswith(".json"):
-                        found_count += 1
-                        if found_count == 2:
-                            try:
-                                data = await attachment.read()
-                                return json.loads(data.decode("utf-8"))
-                            except Exception as e:
-                                print(f"⚠️ Failed to parse JSON: {e}")
-                                return []
-
-        print("⚠️ No second-latest JSON attachment found in last 5 messages.")
-        return []
-
-    async def post_next_pokemon(self):
+    async def post_next_pokemon(self, guild: discord.Guild):
         if not self.pokemon_data:
             self.pokemon_data = await self.load_second_latest_json_from_channel()
             if not self.pokemon_data:
@@ -237,17 +220,13 @@ class RocketCatch(commands.Cog):
         )
         embed.set_thumbnail(url=pokemon.get("img_url", ""))
 
-        # Find the first channel containing "catch"
-        channel = None
-        for ch in self.bot.get_all_channels():
-            if isinstance(ch, discord.TextChannel) and CATCH_CHANNEL_NAME_KEYWORD in ch.name.lower():
-                channel = ch
-                break
+        # The catch channel of the guild running the event
+        channel = CHANNELS.get(guild, "catch")
         if not channel:
-            print("⚠️ Catch channel not found.")
+            print(f"⚠️ Catch channel not found in {guild.name}.")
             return
 
-        view = CatchView(self.bot, pokemon, self.post_next_pokemon)
+        view = CatchView(self.bot, pokemon, lambda: self.post_next_pokemon(guild))
         msg = await channel.send(embed=embed, view=view)
         view.message = msg
 
@@ -276,7 +255,7 @@ class RocketCatch(commands.Cog):
             return
         self.pokemon_queue = self.pokemon_data.copy()
         random.shuffle(self.pokemon_queue)
-        await self.post_next_pokemon()
+        await self.post_next_pokemon(interaction.guild)
 
     @rocket_catch.error
     async def on_catch_error(self, interaction: discord.Interaction, error):
@@ -288,6 +267,12 @@ class RocketCatch(commands.Cog):
         else:
             await interaction.response.send_message(f"⚠️ Error: {error}", ephemeral=True)
 
+    @commands.Cog.listener()
+    async def on_legacy_import(self, source: str):
+        # RocketBackfill added catches counted by the old history-based leaderboard
+        if source == "catches":
+            CATCH_LEADERBOARD.invalidate()
+
     # --- Pokémon Catch Leaderboard ---
     @commands.group(name="pc", invoke_without_command=True)
     async def pc_group(self, ctx):
@@ -297,52 +282,27 @@ class RocketCatch(commands.Cog):
     @pc_group.command(name="lb", aliases=["leaderboard"])
     async def pc_lb(self, ctx):
         """📊 Show Pokémon Catch Leaderboard"""
-        if self._lb_running:
-            await ctx.send("⚠️ Leaderboard is already being calculated, please wait...")
-            return
-
-        self._lb_running = True
         try:
-            # Find the first channel containing "catch"
-            channel = None
-            for ch in self.bot.get_all_channels():
-                if isinstance(ch, discord.TextChannel) and CATCH_CHANNEL_NAME_KEYWORD in ch.name.lower():
-                    channel = ch
-                    break
-            if not channel:
-                await ctx.send("⚠️ Catch channel not found.")
-                return
-
-            temp_msg = await ctx.send("⏳ Calculating Pokémon Catch Leaderboard...")
-            counts = defaultdict(int)
-            pattern = re.compile(r"💎\s*(\S+)")
-
-            async for msg in channel.history(limit=500):
-                matches = pattern.findall(msg.content)
-                for name in matches:
-                    counts[name] += 1
-
-            if not counts:
-                await temp_msg.edit(content="⚠️ No gem messages found in the last 500 messages.")
+            top_catchers = await CATCH_LEADERBOARD.top(ctx.guild.id)
+            if not top_catchers:
+                await ctx.send("⚠️ No Pokémon have been caught yet.")
                 return
 
-            sorted_counts = sorted(counts.items(), key=lambda x: x[1], reverse=True)
-
-            leaderboard_lines = [
-                f"{MEDALS[i] if i < 3 else '🔹'} {name} — {score} 🎯"
-                for i, (name, score) in enumerate(sorted_counts)
-            ]
+            guild = ctx.guild
+            leaderboard_lines = []
+            for i, (uid, name, score) in enumerate(top_catchers):
+                member = guild.get_member(uid)
+                leaderboard_lines.append(
+                    f"{MEDALS[i] if i < 3 else '🔹'} {member.display_name if member else name or f'<@{uid}>'} — {score} 🎯"
+                )
             leaderboard_text = "\n".join(leaderboard_lines)
 
-            guild = ctx.guild
             role_name = "Legendary Catcher 🎯"
             legendary_role = discord.utils.get(guild.roles, name=role_name)
 
-            top_name, top_score = sorted_counts[0]
-            top_member = next(
-                (m for m in guild.members if m.display_name.lower() == top_name.lower() or m.name.lower() == top_name.lower()),
-                None
-            )
+            top_id, top_name, top_score = top_catchers[0]
+            top_member = guild.get_member(top_id)
+            top_name = top_name or f"<@{top_id}>"
 
             if not legendary_role:
                 legendary_role = await ctx.guild.create_role(
@@ -352,11 +312,7 @@ class RocketCatch(commands.Cog):
                 )
 
             if legendary_role:
-                for member in legendary_role.members:
-                    if member != top_member:
-                        await member.remove_roles(legendary_role, reason="Lost top spot")
-                if top_member:
-                    await top_member.add_roles(legendary_role, reason="New top catcher")
+                TITLE_ROLES.set_holders(legendary_role, {top_member.id} if top_member else set(), "New top catcher")
 
             congrats = (
                 f"🎉 {top_member.mention if top_member else top_name} is the **Top Pokémon Catcher!** "
@@ -370,14 +326,11 @@ class RocketCatch(commands.Cog):
             )
             embed.set_footer(text="💫 Congratulations to all trainers — keep catching to claim the top spot!")
 
-            await temp_msg.delete()
             await ctx.send(embed=embed)
 
         except Exception as e:
             await ctx.send(f"⚠️ An error occurred while generating the leaderboard: `{e}`")
             raise
-        finally:
-            self._lb_running = False
 
 
 async def setup(bot):
@@ -1,9 +1,8 @@
 import discord
 import random
-import json
 import os
 from discord.ext import commands
-from helpers import (award_points)
+from helpers import (award_points_many, CONTENT)
 
 # ----------- BUTTONS & VIEWS -----------
 class AnswerButton(discord.ui.Button):
@@ -67,6 +66,17 @@ class CompatibilityView(discord.ui.View):
         return len(self.answered) == 2
 
 
+def valid_test_data(data) -> bool:
+    """compatibility_test.json needs topics, each with questions that have options and a countdown."""
+    try:
+        return bool(data["topics"]) and all(
+            topic["title"] is not None and all("options" in q and "countdown" in q for q in topic["questions"])
+            for topic in data["topics"]
+        )
+    except (KeyError, TypeError):
+        return False
+
+
 # ----------- COG -----------
 class CompatibilityTest(commands.Cog):
     def __init__(self, bot):
@@ -77,23 +87,11 @@ class CompatibilityTest(commands.Cog):
         self.test_channel_id = int(os.getenv("ADMIN_COMPATIBILITY_TEST_CHANNEL_ID", 0))
         if not self.test_channel_id:
             print("[WARNING] ADMIN_COMPATIBILITY_TEST_CHANNEL_ID not set!")
+        CONTENT.watch(self.test_channel_id)
 
-    async def fetch_json_file(self, filename: str):
-        """Fetch and decode a JSON file from the configured channel."""
-        channel = self.bot.get_channel(self.test_channel_id)
-        if not channel:
-            return None
-        async for message in channel.history(limit=50):
-            if message.attachments:
-                for attachment in message.attachments:
-                    if attachment.filename == filename:
-                        data_bytes = await attachment.read()
-                        try:
-                            return json.loads(data_bytes.decode("utf-8"))
-                        except Exception as e:
-                            print(f"[ERROR] Failed to load {filename}: {e}")
-                            return None
-        return None
+    async def fetch_json_file(self, filename: str, validate=None):
+        """Parsed JSON file from the configured channel (cached until a new upload)."""
+        return await CONTENT.json_attachment(self.bot, self.test_channel_id, filename=filename, validate=validate)
 
     @commands.command(name="ct")
     async def compatibility_test(self, ctx, member: discord.Member = None):
@@ -113,8 +111,8 @@ class CompatibilityTest(commands.Cog):
         self.active_tests[ctx.channel.id] = True
 
         # Fetch JSONs
-        test_data = await self.fetch_json_file("compatibility_test.json")
-        gif_data = await self.fetch_json_file("compatibility_gifs.json")
+        test_data = await self.fetch_json_file("compatibility_test.json", valid_test_data)
+        gif_data = await self.fetch_json_file("compatibility_gifs.json", lambda d: isinstance(d, dict))
 
         if not test_data or not gif_data:
             await ctx.send("⚠️ Could not load compatibility data. Please upload both JSON files.")
@@ -183,8 +181,7 @@ class CompatibilityTest(commands.Cog):
         )
         percentage = (matches / len(questions)) * 100
         # Award points to both players (pass actual Member objects!)
-        await award_points(self.bot, ctx.author, 25, notify_channel=ctx.channel)
-        await award_points(self.bot, member, 25, notify_channel=ctx.channel)
+        await award_points_many(self.bot, [(ctx.author, 25), (member, 25)], notify_channel=ctx.channel)
         # Pick GIF/comment dynamically from GIF JSON
         if percentage == 100:
             key = "success"
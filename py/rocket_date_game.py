@@ -8,19 +8,19 @@ import discord
 from discord.ext import commands
 
 from helpers import (
-    ADMIN_IDS, DB_PATH,
+    ADMIN_IDS,
     ADMIN_DATE_LIMIT_PER_DAY, USER_DATE_LIMIT_PER_DAY,
-    init_db, is_admin, is_edate_gamer, get_gender_emoji, get_guild_contestants,
+    is_admin, is_edate_gamer, get_gender_emoji, get_guild_contestants,
     safe_send, TextPaginator, EmbedPaginator,
     count_sent_today, insert_record, get_pending_between, update_status,
-    fetch_incoming_history, load_json_file,award_points,
-    update_daily_quest, DAILY_QUEST_IDS, DAILY_QUEST_CHANNEL_ID,compute_points,reset_heartthrob_role
+    fetch_incoming_history, load_json_file,award_points, fetch_gems_leaderboard,
+    emit_quest_event, get_daily_quest_progress, claim_daily_quest_reward, DAILY_QUESTS, DAILY_QUEST_IDS,
+    DAILY_QUEST_REWARD, local_today_str, compute_points, TITLE_ROLES, ROLE_INDEX, MEMBERS, DIGEST, gem_notice
 )
 
 # Optional constants
 MEDALS = ["🥇", "🥈", "🥉"]
 PROTECTED_IDS = []  # Add protected user IDs here
-LEADERBOARD_CHANNEL_ID = int(os.getenv("LEADERBOARD_CHANNEL_ID", 0))
 
 class RocketDate(commands.Cog):
     def __init__(self, bot):
@@ -83,68 +83,21 @@ class RocketDate(commands.Cog):
     @tr.command(name="quest", aliases=["q", "daily"], description="Check your daily quest progress")
     async def tr_quest(self, ctx):
         """Show daily quest progress as a single embed with checkboxes and reward claim status."""
-        channel = self.bot.get_channel(DAILY_QUEST_CHANNEL_ID)
-        if not channel:
-            return await safe_send(ctx, "⚠️ Daily Quest channel not found!")
-
-        today_str = str(date.today())
-        latest_msg: discord.Message | None = None
-
-        # Look for today's message
-        async for msg in channel.history(limit=50):
-            if msg.content.startswith(f"Daily Quest — {today_str}"):
-                latest_msg = msg
-                break
-
-        # Create today's message if missing
-        if not latest_msg:
-            latest_msg = await channel.send(f"Daily Quest — {today_str}")
-
-        lines = latest_msg.content.splitlines()
-        user_id_str = str(ctx.author.id)
-        user_line_index: int | None = None
-
-        # Check if user line exists
-        for i, line in enumerate(lines[1:], start=1):
-            if user_id_str in line:
-                user_line_index = i
-                break
-
-        # If missing, create user line with all zeros and NO claim
-        if user_line_index is None:
-            quest_status = " | ".join(f"{qid}0" for qid in DAILY_QUEST_IDS)
-            lines.append(f"{ctx.author.display_name} — {user_id_str} | {quest_status} | NO")
-            user_line_index = len(lines) - 1
-            await latest_msg.edit(content="\n".join(lines))
-
-        # Get full quest status string
-        user_line = lines[user_line_index]
-        parts = [p.strip() for p in user_line.split("|")]
-        quest_status_raw = " | ".join(parts[1:1 + len(DAILY_QUEST_IDS)])  # a-d statuses
-        reward_claimed = parts[-1] if len(parts) > len(DAILY_QUEST_IDS) + 1 else "NO"
-
-        # Map quest IDs to emojis & descriptions
-        quest_map = {
-            "a": "⚡ Thunderbolt someone",
-            "b": "🔥 Roast someone",
-            "c": "🎭 Drama someone",
-            "d": "📰 Press quest"
-        }
+        today_str = local_today_str()
+        completed, reward_claimed = await get_daily_quest_progress(ctx.guild.id, ctx.author.id, today_str)
 
         # Build the description with checkboxes
         description_lines = []
-        for qid in DAILY_QUEST_IDS:
-            status = "✅" if re.search(rf"{qid}1", quest_status_raw) else "⬛"
-            description_lines.append(f"{status}  {quest_map[qid]}")
+        for qid, quest in DAILY_QUESTS.items():
+            status = "✅" if qid in completed else "⬛"
+            description_lines.append(f"{status}  {quest['label']}")
 
         # Check if all quests are done
-        all_done = all(re.search(rf"{qid}1", quest_status_raw) for qid in DAILY_QUEST_IDS)
-        award_gems = 100
+        all_done = all(qid in completed for qid in DAILY_QUEST_IDS)
+        award_gems = DAILY_QUEST_REWARD
         # Footer logic
-        if reward_claimed == "YES":
+        if reward_claimed:
             footer_text = "\n💎 You already claimed your reward. Come back tomorrow!"
-        elif all_done:
-            footer_text = f"\n💎 Complete all quests to earn {award_gems} gems! Resets tomorrow.\n⚡ Commands: `.tr thunderbolt` `.tr roast` `.tr drama` `.pq start`"
         else:
             footer_text = f"\n💎 Complete all quests to earn {award_gems} gems! Resets tomorrow.\n⚡ Commands: `.tr thunderbolt` `.tr roast` `.tr drama` `.pq start`"
 
@@ -157,12 +110,10 @@ class RocketDate(commands.Cog):
 
         await ctx.send(embed=embed)
 
-        # Award gems automatically if all done and not claimed
-        if all_done and reward_claimed != "YES":
-            await award_points(self.bot, ctx.author, award_gems, notify_channel=ctx.channel)
-            # Update user line to mark reward claimed
-            lines[user_line_index] = f"{parts[0]} | {quest_status_raw} | YES"
-            await latest_msg.edit(content="\n".join(lines))
+        # Award gems automatically if all done and not claimed (the ledger key makes this once per day)
+        if all_done and not reward_claimed:
+            if await claim_daily_quest_reward(self.bot, ctx.author, award_gems, today_str) is not None:
+                DIGEST.add(ctx.channel, [gem_notice(ctx.author.display_name, award_gems)])
 
     # ────────── TR LIST ──────────
     @tr.command(name="list", description="See all PokeCandidates 🚀")
@@ -174,20 +125,17 @@ class RocketDate(commands.Cog):
 
         contestants.sort(key=lambda m: m.display_name.lower())
 
-        # Define your catch role IDs
-        CATCH_ROLE_IDS = {
-            "Catching PokeMen": self.catch_pokemen_id,
-            "Catching PokeWomen": self.catch_pokewomen_id,
-            "Catching 'em all": self.catch_all_id
-        }
+        # Catch roles and their holders, looked up once
+        catch_roles = [
+            (role, ROLE_INDEX.holders(ctx.guild, role.id))
+            for role in (ctx.guild.get_role(rid) for rid in (self.catch_pokemen_id, self.catch_pokewomen_id, self.catch_all_id))
+            if role
+        ]
 
         lines = []
         for m in contestants:
-            # Find which Catching roles the member has
-            member_roles = [discord.utils.get(m.guild.roles, id=rid) for name, rid in CATCH_ROLE_IDS.items() if
-                            discord.utils.get(m.roles, id=rid)]
-            # Convert to mentions instead of names
-            role_text = ", ".join(role.mention for role in member_roles) if member_roles else ""
+            # Mentions of the Catching roles the member has
+            role_text = ", ".join(role.mention for role, holders in catch_roles if m.id in holders)
             lines.append(f"{get_gender_emoji(m)} {m.display_name} - {role_text}")
 
         page_size = 10
@@ -241,17 +189,17 @@ class RocketDate(commands.Cog):
 
         # Daily limit check (no exceptions)
         limit = ADMIN_DATE_LIMIT_PER_DAY if is_admin(sender) else USER_DATE_LIMIT_PER_DAY
-        sent_today = count_sent_today(ctx.guild.id, sender.id)
+        sent_today = await count_sent_today(ctx.guild.id, sender.id)
         if sent_today >= limit:
             return await safe_send(ctx, f"❌ Daily limit reached ({limit} per day). 💔")
 
         # Optional: prevent duplicate pending with the same user
-        pending_id = get_pending_between(ctx.guild.id, sender.id, member.id)  # ✅ consistent usage
+        pending_id = await get_pending_between(ctx.guild.id, sender.id, member.id)  # ✅ consistent usage
         if pending_id:
             return await safe_send(ctx, "❌ You already have a pending e-date with this user! 💌")
 
         # Record the request (pending)
-        insert_record(ctx.guild.id, user_id=member.id, sender_id=sender.id)
+        await insert_record(ctx.guild.id, user_id=member.id, sender_id=sender.id)
 
         embed = discord.Embed(
             title="💌 E-Date Request Sent!",
@@ -271,7 +219,7 @@ class RocketDate(commands.Cog):
     @commands.cooldown(5, 60, commands.BucketType.user)
     async def tr_date_yes(self, ctx, member: discord.Member):
         receiver = ctx.author
-        record_id = get_pending_between(ctx.guild.id, member.id, receiver.id)  # ✅ consistent usage
+        record_id = await get_pending_between(ctx.guild.id, member.id, receiver.id)  # ✅ consistent usage
 
         # Role checks for participation
         if not is_edate_gamer(receiver) or not is_edate_gamer(member):
@@ -284,7 +232,7 @@ class RocketDate(commands.Cog):
         if not record_id:
             return await safe_send(ctx, "❌ No pending request from this user! 💔")
 
-        update_status(record_id, status='yes')
+        await update_status(record_id, status='yes')
 
         embed = discord.Embed(
             title="💖 E-Date Accepted!",
@@ -300,7 +248,7 @@ class RocketDate(commands.Cog):
     @commands.cooldown(5, 60, commands.BucketType.user)
     async def tr_date_no(self, ctx, member: discord.Member, *, reason: str = ""):
         receiver = ctx.author
-        record_id = get_pending_between(ctx.guild.id, member.id, receiver.id)  # ✅ consistent usage
+        record_id = await get_pending_between(ctx.guild.id, member.id, receiver.id)  # ✅ consistent usage
 
         # Role checks for participation
         if not is_edate_gamer(receiver) or not is_edate_gamer(member):
@@ -313,7 +261,7 @@ class RocketDate(commands.Cog):
         if not record_id:
             return await safe_send(ctx, "❌ No pending request from this user! 💔")
 
-        update_status(record_id, status='no', reason=reason)
+        await update_status(record_id, status='no', reason=reason)
 
         embed = discord.Embed(
             title="💔 E-Date Rejected",
@@ -340,7 +288,7 @@ class RocketDate(commands.Cog):
                                    f"If you're interested in e-date games, go to <#{self.choose_roles_channel_id}> "
                                    f"and assign yourself the Catching roles you're interested in.")
 
-        rows = fetch_incoming_history(ctx.guild.id, member.id)
+        rows = await fetch_incoming_history(ctx.guild.id, member.id)
         if not rows:
             return await safe_send(ctx, f"{member.mention} has no incoming e-date history yet! 💔")
 
@@ -380,26 +328,27 @@ class RocketDate(commands.Cog):
         HEARTTHROB_ROLE_NAME = "Heartthrob 💘"
 
         # --- Compute dynamic points ---
-        user_points: dict[int, int] = compute_points(ctx.guild)
+        user_points: dict[int, int] = await compute_points(ctx.guild)
         if not user_points:
             return await safe_send(ctx, "❌ No e-date activity recorded yet!")
 
         # --- Sort by points descending ---
         sorted_users = sorted(user_points.items(), key=lambda x: x[1], reverse=True)
 
-        # --- Build leaderboard entries ---
+        # --- Build leaderboard entries (members resolved in one batch) ---
+        members = await MEMBERS.resolve(ctx.guild, [uid for uid, _ in sorted_users])
         lb_entries = []
         for i, (uid, pts) in enumerate(sorted_users, start=1):
             medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}️⃣"
-            member = ctx.guild.get_member(uid) or await ctx.guild.fetch_member(uid)
+            member = members.get(uid)
             name = member.display_name if member else str(uid)
             lb_entries.append(f"{medal} {name} — {pts} 💘")
 
         # --- Heartthrob role assignment ---
         top_member_id = sorted_users[0][0]  # top scorer
-        role = await reset_heartthrob_role(ctx.guild, HEARTTHROB_ROLE_NAME, top_member_id)
+        role = discord.utils.get(ctx.guild.roles, name=HEARTTHROB_ROLE_NAME)
 
-        top_member = ctx.guild.get_member(top_member_id) or await ctx.guild.fetch_member(top_member_id)
+        top_member = members.get(top_member_id)
         if top_member:
             if not role:
                 role = await ctx.guild.create_role(
@@ -407,8 +356,8 @@ class RocketDate(commands.Cog):
                     colour=discord.Colour.red(),
                     reason="Top e-date scorer"
                 )
-            if role not in top_member.roles:
-                await top_member.add_roles(role, reason="Top e-date scorer")
+        if role:
+            TITLE_ROLES.set_holders(role, {top_member.id} if top_member else set(), "Top e-date scorer")
 
         # --- Random Heartthrob announcement inside embed ---
         messages = [
@@ -448,43 +397,15 @@ class RocketDate(commands.Cog):
         # --- Send initial "calculating" message ---
         calculating_msg = await ctx.send("⏳ Calculating leaderboard, please wait...")
 
-        # --- Fetch latest leaderboard message ---
-        channel = self.bot.get_channel(LEADERBOARD_CHANNEL_ID)
-        if not channel:
-            await calculating_msg.edit(content="⚠️ Leaderboard channel not found.")
-            return
-
-        try:
-            msg = [m async for m in channel.history(limit=1, oldest_first=False)][0]
-        except IndexError:
-            await calculating_msg.edit(content="⚠️ No leaderboard message found.")
-            return
-
-        # --- Parse leaderboard ---
-        import re
-        leaderboard = []
-        for line in msg.content.splitlines():
-            parts = [p.strip() for p in line.split("-")]
-            if len(parts) != 3:
-                continue
-            name, uid_str, points_str = parts
-            try:
-                uid = int(re.sub(r"\D", "", uid_str))
-                points = int(re.sub(r"\D", "", points_str))
-            except ValueError:
-                continue
-            leaderboard.append((name, uid, points))
-
+        # --- Read balances from the gems ledger (already sorted, highest first) ---
+        leaderboard = await fetch_gems_leaderboard()
         if not leaderboard:
-            await calculating_msg.edit(content="⚠️ Leaderboard is empty or malformed.")
+            await calculating_msg.edit(content="⚠️ Leaderboard is empty.")
             return
 
-        # --- Sort by points descending ---
-        leaderboard.sort(key=lambda x: x[2], reverse=True)
-
         # --- Filter only members still in the server ---
         valid_leaderboard = []
-        for name, uid, points in leaderboard:
+        for uid, name, points in leaderboard:
             member = ctx.guild.get_member(uid)
             if member:  # only include members still in server
                 valid_leaderboard.append((member, uid, points))
@@ -515,25 +436,9 @@ class RocketDate(commands.Cog):
                 reason="Top 2–10 E-Games scorers"
             )
 
-        # --- Remove old roles ---
-        for member in ctx.guild.members:
-            try:
-                if champion_role in member.roles:
-                    await member.remove_roles(champion_role, reason="Reset Champion role")
-                if elite_role in member.roles:
-                    await member.remove_roles(elite_role, reason="Reset Elite role")
-            except:
-                pass
-
-        # --- Assign new roles ---
-        for idx, (member, uid, points) in enumerate(valid_leaderboard, start=1):
-            try:
-                if idx == 1:
-                    await member.add_roles(champion_role, reason="Top scorer Champion")
-                elif 2 <= idx <= 10:
-                    await member.add_roles(elite_role, reason="Top 2–10 Elite")
-            except:
-                continue
+        # --- Assign roles (applied in the background, only the changes) ---
+        TITLE_ROLES.set_holders(champion_role, {valid_leaderboard[0][1]}, "Top scorer Champion")
+        TITLE_ROLES.set_holders(elite_role, {uid for _, uid, _ in valid_leaderboard[1:10]}, "Top 2–10 Elite")
 
         # --- Build embeds ---
         embeds = []
@@ -605,7 +510,7 @@ class RocketDate(commands.Cog):
         await ctx.send(template.format(author=ctx.author.mention, target=member.mention))
 
         if not ctx.command.is_on_cooldown(ctx):
-            await update_daily_quest(self.bot, ctx.author, "b")
+            await emit_quest_event(ctx.author, "roast")
             await award_points(self.bot, ctx.author, 1, notify_channel=ctx.channel)
 
     @tr.command(name="scream", description="Scream to your enemy 📢")
@@ -652,7 +557,7 @@ class RocketDate(commands.Cog):
         await ctx.send(chosen.format(author=ctx.author.mention, target=member.mention))
 
         if not ctx.command.is_on_cooldown(ctx):
-            await update_daily_quest(self.bot, ctx.author, "c")
+            await emit_quest_event(ctx.author, "drama")
             await award_points(self.bot, ctx.author, 1, notify_channel=ctx.channel)
 
     @tr.command(name="thunderbolt", description="Zap someone ⚡")
@@ -679,7 +584,7 @@ class RocketDate(commands.Cog):
         await ctx.send(template.format(author=ctx.author.mention, target=member.mention))
 
         if not ctx.command.is_on_cooldown(ctx):
-            await update_daily_quest(self.bot, ctx.author, "a")
+            await emit_quest_event(ctx.author, "thunderbolt")
             await award_points(self.bot, ctx.author, 1, notify_channel=ctx.channel)
 
     # -------------------- SHOUTING SPRING --------------------
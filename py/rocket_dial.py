@@ -3,9 +3,22 @@ import discord
 from discord.ext import commands
 import asyncio
 import random
-from typing import Dict, Optional, Tuple, Any
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple, Any
 import datetime
 import os
+from helpers import (is_premium, relative_time, parse_report_line, load_dial_reports, save_dial_reports, delete_dial_report_message,
+                     load_dial_webhooks, save_dial_webhook, delete_dial_webhook, CHANNELS)
+
+REPORTED_CHANNEL_ID = int(os.getenv("ADMIN_REPORTED_MEMBERS", 0))
+REPORTER_CHANNEL_ID = int(os.getenv("ADMIN_REPORTER_MEMBERS", 0))
+
+# Relay outbox (messages forwarded to the other side of a call)
+RELAY_MERGE_WINDOW = 1.5   # seconds; consecutive messages from one alias inside it become one post
+RELAY_MAX_CONTENT = 2000
+RELAY_QUEUE_LIMIT = 30     # pending posts per call side before new messages are refused
+RELAY_MAX_RETRIES = 4
+RELAY_RETRY_BASE = 2.0     # seconds, doubled after every failed attempt
 
 # ---------------------------
 # Pokémon GIFs (kept exactly as you provided)
@@ -32,6 +45,96 @@ POKEMON_GIFS = [
     {"name": "Ditto", "url": "https://media.tenor.com/IA266nP_INIAAAAM/ditto-pokemon.gif"}
 ]
 
+# ---------------------------
+# Relay outbox
+# ---------------------------
+class RelayOutbox:
+    """Ordered queue of webhook posts from one side of a call to the partner channel.
+
+    One drain task sends posts strictly in arrival order. A message from the same
+    alias as the newest queued post, within RELAY_MERGE_WINDOW, is appended to that
+    post instead of becoming a new one. Rate limits and server errors are retried
+    with backoff; anything that still can't be delivered is reported to its senders.
+    """
+
+    def __init__(self, cog: "RocketDial", channel: discord.TextChannel):
+        self.cog = cog
+        self.channel = channel
+        self.queue: Deque[Dict[str, Any]] = deque()
+        self.task: Optional[asyncio.Task] = None
+
+    def put(self, source: discord.Message, content: str, username: str, avatar_url: str) -> bool:
+        """Queue a message; False if the outbox is full and the message was refused."""
+        now = asyncio.get_event_loop().time()
+        last = self.queue[-1] if self.queue else None
+        if (last and last["username"] == username and last["avatar_url"] == avatar_url
+                and now - last["queued_at"] <= RELAY_MERGE_WINDOW
+                and len(last["content"]) + 1 + len(content) <= RELAY_MAX_CONTENT):
+            last["content"] += "\n" + content
+            last["sources"].append(source)
+        else:
+            if len(self.queue) >= RELAY_QUEUE_LIMIT:
+                return False
+            self.queue.append({
+                "content": content, "username": username, "avatar_url": avatar_url,
+                "queued_at": now, "sources": [source],
+            })
+        if not self.task or self.task.done():
+            self.task = asyncio.create_task(self._drain())
+        return True
+
+    def close(self):
+        """Stop sending; anyone whose posts were still queued is told they weren't delivered."""
+        if self.task:
+            self.task.cancel()
+        pending = [source for post in self.queue for source in post["sources"]]
+        self.queue.clear()
+        if pending:
+            asyncio.create_task(self._report_drop(pending))
+
+    async def _drain(self):
+        loop = asyncio.get_event_loop()
+        while self.queue:
+            # Give the alias a moment to keep typing before its post goes out
+            wait = self.queue[0]["queued_at"] + RELAY_MERGE_WINDOW - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            post = self.queue.popleft()
+            if not await self._send(post):
+                await self._report_drop(post["sources"])
+
+    async def _send(self, post: Dict[str, Any]) -> bool:
+        for attempt in range(RELAY_MAX_RETRIES):
+            try:
+                await self.cog.send_via_webhook(
+                    self.channel,
+                    content=post["content"],
+                    username=post["username"],
+                    avatar_url=post["avatar_url"]
+                )
+                return True
+            except discord.HTTPException as e:
+                if e.status != 429 and e.status < 500:
+                    print(f"[RocketDial] relay dropped a post: {e}")
+                    return False
+                print(f"[RocketDial] relay send failed ({e.status}), retry {attempt + 1}/{RELAY_MAX_RETRIES}")
+            except Exception as e:
+                print(f"[RocketDial] relay dropped a post: {e}")
+                return False
+            await asyncio.sleep(RELAY_RETRY_BASE * 2 ** attempt)
+        return False
+
+    async def _report_drop(self, sources: List[discord.Message]):
+        mentions = sorted({m.author.mention for m in sources})
+        try:
+            await sources[0].channel.send(
+                f"⚠️ {', '.join(mentions)}, your message couldn't be delivered to the other side.",
+                delete_after=8
+            )
+        except Exception:
+            pass
+
+
 # ---------------------------
 # Cog
 # ---------------------------
@@ -44,6 +147,8 @@ class RocketDial(commands.Cog):
         self.calls: Dict[str, Dict[str, Any]] = {}
         # waiting_calls: key = guild_id (str), value = (channel, webhook, task)
         self.waiting_calls: Dict[str, Tuple[discord.TextChannel, discord.Webhook, asyncio.Task]] = {}
+        # webhook pool: key = dial channel id, value = webhook reused by every call (dial_webhooks table)
+        self.webhooks: Dict[int, discord.Webhook] = {}
         # map of pairs for convenience
         self.active_pairs: Dict[str, str] = {}
         # remember which member started a waiting call (so both sides are initiators)
@@ -51,6 +156,9 @@ class RocketDial(commands.Cog):
         # used to avoid spamming warning messages per user per call
         self.user_reports: Dict[int, int] = {}
         self.report_reset_day: Optional[datetime.date] = None
+        # report index: kind ('reported' | 'reporter') -> user_id -> count / admin message id
+        self.report_counts: Dict[str, Dict[int, int]] = {"reported": {}, "reporter": {}}
+        self.report_messages: Dict[str, Dict[int, Optional[int]]] = {"reported": {}, "reporter": {}}
 
         # lock to prevent race conditions when pairing waiting callers
         self.wait_lock = asyncio.Lock()
@@ -78,10 +186,7 @@ class RocketDial(commands.Cog):
         return " ".join(censored_words)
 
     def find_dial_channel(self, guild: discord.Guild) -> Optional[discord.TextChannel]:
-        for ch in guild.text_channels:
-            if "rocket-dial" in ch.name.lower():
-                return ch
-        return None
+        return CHANNELS.get(guild, "dial")
 
     def pick_two_unique_aliases(self):
         a, b = random.sample(POKEMON_GIFS, 2)
@@ -90,32 +195,50 @@ class RocketDial(commands.Cog):
 
     async def get_or_create_webhook(self, channel: discord.TextChannel, guild_id: int):
         """
-        Ensure each guild has one unique webhook named 'Rocket Dial - {guild_id}'.
+        Return the pooled webhook of a dial channel, named 'Rocket Dial - {guild_id}'.
         This is NOT a 'friend request' webhook — it's the per-server webhook used
         for all forwarded messages and friend requests (sent via alias/avatar).
+        Pooled webhooks are not checked here; send_via_webhook replaces one that
+        turns out to be deleted.
         """
+        wh = self.webhooks.get(channel.id)
+        if wh:
+            return wh
         name = f"Rocket Dial - {guild_id}"
         try:
             existing_webhooks = await channel.webhooks()
-            for wh in existing_webhooks:
-                if wh.user == self.bot.user and wh.name == name:
-                    return wh
-            wh = await channel.create_webhook(name=name)
-            print(f"[RocketDial] Created webhook '{name}' in channel {channel.name} ({channel.id}) -> {getattr(wh, 'url', 'no-url')}")
-            return wh
+            wh = next((w for w in existing_webhooks if w.user == self.bot.user and w.name == name and w.token), None)
+            if wh is None:
+                wh = await channel.create_webhook(name=name)
+                print(f"[RocketDial] Created webhook '{name}' in channel {channel.name} ({channel.id})")
         except discord.Forbidden:
             print(f"[RocketDial] No permission to create webhook in {channel.name}")
             return None
         except Exception as e:
             print(f"[RocketDial] get_or_create_webhook error: {e}")
             return None
-
-    async def safe_delete_webhook(self, wh: Optional[discord.Webhook]):
-        try:
-            if wh:
-                await wh.delete()
-        except Exception as e:
-            print(f"[RocketDial] safe_delete_webhook failed: {e}")
+        self.webhooks[channel.id] = wh
+        await save_dial_webhook(channel.id, wh.id, wh.token)
+        return wh
+
+    async def evict_webhook(self, channel_id: int):
+        self.webhooks.pop(channel_id, None)
+        await delete_dial_webhook(channel_id)
+
+    async def send_via_webhook(self, channel: discord.TextChannel, **kwargs):
+        """Send through the channel's pooled webhook. If it was deleted outside the
+        bot (404), drop it from the pool, create a new one and retry once."""
+        for attempt in range(2):
+            wh = await self.get_or_create_webhook(channel, channel.guild.id)
+            if wh is None:
+                raise RuntimeError(f"no webhook available in {channel.name}")
+            try:
+                return await wh.send(**kwargs)
+            except discord.NotFound:
+                print(f"[RocketDial] Webhook in {channel.name} ({channel.id}) was deleted, recreating")
+                await self.evict_webhook(channel.id)
+                if attempt:
+                    raise
 
     async def _hangup_pair(
             self,
@@ -143,18 +266,15 @@ class RocketDial(commands.Cog):
                 self.active_pairs.pop(str(partner), None)
             info_b = self.calls.pop(str(partner), None) if partner else None
 
-            # Cancel idle monitor & delete webhooks (ensure both sides cleaned up)
+            # Cancel idle monitor and relay outbox (webhooks stay in the pool for the next call)
             for info in [info_a, info_b]:
                 if info and info.get("idle_task"):
                     try:
                         info["idle_task"].cancel()
                     except Exception:
                         pass
-                if info and info.get("webhook"):
-                    try:
-                        await self.safe_delete_webhook(info["webhook"])
-                    except Exception:
-                        pass
+                if info and info.get("outbox"):
+                    info["outbox"].close()
 
             # Notify both sides — but only once per guild
             notified_guilds = set()
@@ -177,46 +297,68 @@ class RocketDial(commands.Cog):
             self._ending_calls.discard(gid_a)  # ensure flag is cleared
 
     # ---------------------------
-    # Helper to read admin reported channel and get report count
+    # Report index (dial_reports table + in-memory counts)
     # ---------------------------
-    async def get_report_count(self, user_id: int) -> int:
-        """
-        Reads the ADMIN_REPORTED_MEMBERS channel and returns the report count for user_id.
-        Format expected: "{user_id} | {alias} | {Nx} | Reason: ...".
-        Returns 0 if not found, capped at 3.
-        """
-        try:
-            reported_channel_id = int(os.environ.get("ADMIN_REPORTED_MEMBERS", 0))
-        except Exception:
-            return 0
-        if not reported_channel_id:
-            return 0
-        main_guild_id = int(os.environ.get("MY_MAIN_GUILD", 0)) if os.environ.get("MY_MAIN_GUILD") else 0
-        if not main_guild_id:
-            return 0
-        main_guild = self.bot.get_guild(main_guild_id)
-        if not main_guild:
-            return 0
-        channel = main_guild.get_channel(reported_channel_id)
-        if not channel:
-            return 0
+    async def cog_load(self):
+        for channel_id, webhook_id, token in await load_dial_webhooks():
+            self.webhooks[channel_id] = discord.Webhook.partial(webhook_id, token, client=self.bot)
+        for kind, user_id, count, message_id in await load_dial_reports():
+            self._index_report(kind, user_id, count, message_id)
+        print(f"[RocketDial] loaded {len(self.report_counts['reported'])} reported members")
+
+    def _index_report(self, kind: str, user_id: int, count: int, message_id: Optional[int]):
+        self.report_counts[kind][user_id] = count
+        self.report_messages[kind][user_id] = message_id
+
+    def _report_kind(self, channel_id: int) -> Optional[str]:
+        if REPORTED_CHANNEL_ID and channel_id == REPORTED_CHANNEL_ID:
+            return "reported"
+        if REPORTER_CHANNEL_ID and channel_id == REPORTER_CHANNEL_ID:
+            return "reporter"
+        return None
 
-        try:
-            async for msg in channel.history(limit=500):
-                parts = msg.content.split("|")
-                if not parts:
-                    continue
-                if parts[0].strip() == str(user_id):
-                    if len(parts) > 2:
-                        try:
-                            count_token = parts[2].strip()
-                            count = int(''.join(ch for ch in count_token if ch.isdigit()))
-                            return min(count, 3)
-                        except Exception:
-                            return 0
-            return 0
-        except Exception:
-            return 0
+    async def _record_report_message(self, kind: str, message_id: int, content: str):
+        parsed = parse_report_line(content)
+        if not parsed:
+            return
+        user_id, name, count, reason = parsed
+        await save_dial_reports([(kind, user_id, name, count, reason, message_id)])
+        self._index_report(kind, user_id, count, message_id)
+
+    async def _write_report_message(self, channel: discord.TextChannel, message_id: Optional[int], content: str) -> int:
+        """Edit the admin message for a user in place (no history scan), or post a new one."""
+        if message_id:
+            try:
+                await channel.get_partial_message(message_id).edit(content=content)
+                return message_id
+            except discord.NotFound:
+                pass
+        return (await channel.send(content)).id
+
+    @commands.Cog.listener()
+    async def on_legacy_import(self, source: str):
+        # RocketBackfill imported reports posted before dial_reports existed
+        if source in ("reported", "reporter"):
+            await self.cog_load()
+
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent):
+        kind = self._report_kind(payload.channel_id)
+        content = payload.data.get("content")
+        if kind and content is not None:
+            await self._record_report_message(kind, payload.message_id, content)
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        if not self._report_kind(payload.channel_id):
+            return
+        for kind, user_id in await delete_dial_report_message(payload.message_id):
+            self.report_counts[kind].pop(user_id, None)
+            self.report_messages[kind].pop(user_id, None)
+
+    def get_report_count(self, user_id: int) -> int:
+        """Report count for user_id from the in-memory index, capped at 3."""
+        return min(self.report_counts["reported"].get(user_id, 0), 3)
 
     # ---------------------------
     # rd group (command guide) — keep original message exactly
@@ -276,7 +418,7 @@ class RocketDial(commands.Cog):
             return await ctx.send("📞 You already placed a call, please wait for another server to answer.")
 
         # Check caller report status
-        caller_report_count = await self.get_report_count(caller_member_id)
+        caller_report_count = self.get_report_count(caller_member_id)
         if caller_report_count >= 3:
             return await ctx.send(
                 f"🚫 You are banned from Rocket Dial due to 3 reports.\n" 
@@ -294,7 +436,8 @@ class RocketDial(commands.Cog):
 
         # Send Dialing message immediately
         msg = await ctx.send(
-            "📞 **Dialing...**\n🚀 Waiting for another server to pick up. Call will auto-hangup in 30 seconds if unanswered."
+            f"📞 **Dialing...**\n🚀 Waiting for another server to pick up. "
+            f"Call will auto-hangup {relative_time(self.answer_timeout)} if unanswered."
         )
 
         # Find a waiting partner safely with a lock to avoid races
@@ -305,11 +448,10 @@ class RocketDial(commands.Cog):
                     continue
                 waiting_initiator_id = self.waiting_initiator.get(other_gid)
                 # Skip banned partners
-                if waiting_initiator_id and await self.get_report_count(waiting_initiator_id) >= 3:
+                if waiting_initiator_id and self.get_report_count(waiting_initiator_id) >= 3:
                     try:
-                        _, wh, t = self.waiting_calls.pop(other_gid)
+                        _, _, t = self.waiting_calls.pop(other_gid)
                         t.cancel()
-                        await self.safe_delete_webhook(wh)
                     except Exception:
                         pass
                     self.waiting_initiator.pop(other_gid, None)
@@ -346,10 +488,10 @@ class RocketDial(commands.Cog):
                 initiators.add(waiting_initiator_id)
 
             # Assign calls and active pairs
-            # Each side stores its own webhook (webhook for this guild, other_webhook for partner)
+            # Each side stores its own dial channel; messages to it go through that channel's pooled webhook
             self.calls[guild_id] = {
                 "partner": other_gid,
-                "webhook": webhook,
+                "channel": ctx.channel,
                 "user_aliases": {caller_member_id: alias_a},
                 "revealed_users": set(),
                 "idle_task": None,
@@ -360,7 +502,7 @@ class RocketDial(commands.Cog):
             }
             self.calls[other_gid] = {
                 "partner": guild_id,
-                "webhook": other_webhook,
+                "channel": other_channel,
                 "user_aliases": {},  # will be assigned when users type
                 "revealed_users": set(),
                 "idle_task": None,
@@ -399,7 +541,7 @@ class RocketDial(commands.Cog):
 
             # Warn if partner had 1-2 reports
             if waiting_initiator_id:
-                waiting_count = await self.get_report_count(waiting_initiator_id)
+                waiting_count = self.get_report_count(waiting_initiator_id)
                 if waiting_count in (1, 2):
                     try:
                         g = self.bot.get_guild(int(other_gid))
@@ -423,22 +565,10 @@ class RocketDial(commands.Cog):
         # No partner → start countdown and add to waiting_calls under lock
         async def precall_countdown_and_cleanup():
             try:
-                for remaining in range(self.answer_timeout, 0, -5):
-                    await asyncio.sleep(5)
-                    if guild_id not in self.waiting_calls:
-                        return
-                    try:
-                        await msg.edit(
-                            content=f"📞 **Dialing...**\n🚀 Waiting for another server to pick up. Auto-hangup in {remaining} seconds."
-                        )
-                    except Exception:
-                        pass
+                # The dialing message shows a relative hang-up time, so nothing to edit while waiting
+                await asyncio.sleep(self.answer_timeout)
                 if guild_id in self.waiting_calls:
-                    _, waiting_webhook, _ = self.waiting_calls.pop(guild_id)
-                    try:
-                        await self.safe_delete_webhook(waiting_webhook)
-                    except Exception:
-                        pass
+                    self.waiting_calls.pop(guild_id)
                     try:
                         await msg.edit(
                             content="📴 **No one picked up.** The Rocket Dial hung up automatically after 30 seconds."
@@ -476,12 +606,11 @@ class RocketDial(commands.Cog):
 
         # --- If the call is still in "waiting" (not yet connected)
         if guild_id in self.waiting_calls:
-            _, wh, task = self.waiting_calls.pop(guild_id)
+            _, _, task = self.waiting_calls.pop(guild_id)
             try:
                 task.cancel()
             except Exception:
                 pass
-            await self.safe_delete_webhook(wh)
             return await ctx.send("📴 Call canceled before connection.")
 
         # --- If there’s no active call
@@ -598,8 +727,6 @@ class RocketDial(commands.Cog):
         # -------------------------------
         try:
             main_guild_id = int(os.environ.get("MY_MAIN_GUILD", 0))
-            reported_channel_id = int(os.environ.get("ADMIN_REPORTED_MEMBERS", 0))
-            reporter_channel_id = int(os.environ.get("ADMIN_REPORTER_MEMBERS", 0))
         except Exception:
             return await ctx.send("⚠️ Admin channels not configured properly.")
 
@@ -607,39 +734,14 @@ class RocketDial(commands.Cog):
         if not main_guild:
             return await ctx.send("⚠️ Main guild not found.")
 
-        reported_channel = main_guild.get_channel(reported_channel_id)
-        reporter_channel = main_guild.get_channel(reporter_channel_id)
+        reported_channel = main_guild.get_channel(REPORTED_CHANNEL_ID)
+        reporter_channel = main_guild.get_channel(REPORTER_CHANNEL_ID)
 
         # -------------------------------
-        # Fetch existing messages once per channel
+        # Current counts from the report index
         # -------------------------------
-        reporter_count = 0
-        reported_count = 1
-        reporter_msg = None
-        reported_msg = None
-
-        if reporter_channel:
-            try:
-                async for msg in reporter_channel.history(limit=200):
-                    parts = msg.content.split("|", maxsplit=3)
-                    if parts[0].strip() == str(reporter_id):
-                        reporter_count = int(parts[2].strip().replace("x", ""))
-                        reporter_msg = msg
-                        break
-            except Exception:
-                pass
-
-        if reported_channel:
-            try:
-                async for msg in reported_channel.history(limit=200):
-                    parts = msg.content.split("|", maxsplit=3)
-                    if parts[0].strip() == str(partner_member_id):
-                        current_count = int(parts[2].strip().replace("x", ""))
-                        reported_count = min(current_count + 1, 3)
-                        reported_msg = msg
-                        break
-            except Exception:
-                pass
+        reporter_count = self.report_counts["reporter"].get(reporter_id, 0)
+        reported_count = min(self.report_counts["reported"].get(partner_member_id, 0) + 1, 3)
 
         # -------------------------------
         # Check max reports
@@ -653,25 +755,26 @@ class RocketDial(commands.Cog):
         # -------------------------------
         # Update reported channel
         # -------------------------------
+        reported_msg_id = self.report_messages["reported"].get(partner_member_id)
         if reported_channel:
             new_reported_content = f"{partner_member_id} | {reported_alias} | {reported_count}x | {reason}"
-            if reported_msg:
-                if reported_msg.content != new_reported_content:
-                    await reported_msg.edit(content=new_reported_content)
-            else:
-                await reported_channel.send(new_reported_content)
+            reported_msg_id = await self._write_report_message(reported_channel, reported_msg_id, new_reported_content)
 
         # -------------------------------
         # Update reporter channel
         # -------------------------------
         reporter_count += 1
+        reporter_msg_id = self.report_messages["reporter"].get(reporter_id)
         if reporter_channel:
             new_reporter_content = f"{reporter_id} | {reporter.display_name} | {reporter_count}x"
-            if reporter_msg:
-                if reporter_msg.content != new_reporter_content:
-                    await reporter_msg.edit(content=new_reporter_content)
-            else:
-                await reporter_channel.send(new_reporter_content)
+            reporter_msg_id = await self._write_report_message(reporter_channel, reporter_msg_id, new_reporter_content)
+
+        await save_dial_reports([
+            ("reported", partner_member_id, reported_alias, reported_count, reason, reported_msg_id),
+            ("reporter", reporter_id, reporter.display_name, reporter_count, "", reporter_msg_id),
+        ])
+        self._index_report("reported", partner_member_id, reported_count, reported_msg_id)
+        self._index_report("reporter", reporter_id, reporter_count, reporter_msg_id)
 
         # -------------------------------
         # Confirm report (duplication-proof)
@@ -700,7 +803,7 @@ class RocketDial(commands.Cog):
     async def rd_friend(self, ctx: commands.Context, *, message: str = None):
         """
         Send a friend request to the other caller using the caller's alias/avatar via the
-        existing per-guild webhook. No new webhooks are created.
+        pooled per-guild webhook of the partner channel.
         Optional 'message' text may be included after the command.
         """
         guild_id = str(ctx.guild.id)
@@ -715,8 +818,8 @@ class RocketDial(commands.Cog):
         if not partner_call_info:
             return await ctx.send("⚠️ Cannot find the member on the other server.")
 
-        partner_webhook = partner_call_info.get("webhook")
-        if not partner_webhook:
+        partner_channel = partner_call_info.get("channel")
+        if not partner_channel:
             return await ctx.send("⚠️ Cannot send friend request. Partner webhook not found.")
 
         sender_user = ctx.author
@@ -744,7 +847,8 @@ class RocketDial(commands.Cog):
 
         try:
             # Send via partner's webhook but as the caller alias (username/avatar)
-            await partner_webhook.send(
+            await self.send_via_webhook(
+                partner_channel,
                 content=content,
                 username=alias_name,
                 avatar_url=avatar_url
@@ -773,6 +877,12 @@ class RocketDial(commands.Cog):
     # ---------------------------
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
+        # Keep the report index current when admins post in the report channels
+        kind = self._report_kind(message.channel.id)
+        if kind:
+            await self._record_report_message(kind, message.id, message.content)
+            return
+
         # Ignore bots/webhooks/system messages
         if message.author.bot or not message.guild or message.webhook_id:
             return
@@ -800,15 +910,15 @@ class RocketDial(commands.Cog):
 
         member = message.author
         call_info["last_activity"] = asyncio.get_event_loop().time()
-        target_webhook = partner_info.get("webhook")
-        if not target_webhook:
-            print(f"[RocketDial] Partner webhook missing for guild {partner_id}")
+        target_channel = partner_info.get("channel")
+        if not target_channel:
+            print(f"[RocketDial] Partner channel missing for guild {partner_id}")
             return
 
         # ---------------------------
         # 1️⃣ Check banned users (3+ reports)
         # ---------------------------
-        report_count = await self.get_report_count(member.id)
+        report_count = self.get_report_count(member.id)
         if report_count >= 3:
             try:
                 await message.delete()
@@ -888,18 +998,7 @@ class RocketDial(commands.Cog):
             lower_msg = message.content.lower()
             # Allow Tenor links only for Gold Members
             if "tenor.com" in lower_msg:
-                gold_channel_id = int(os.getenv("ROCKET_DIAL_PREMIUM", 0))
-                gold_member_ids = set()
-                if gold_channel_id:
-                    gold_channel = self.bot.get_channel(gold_channel_id)
-                    if gold_channel:
-                        try:
-                            async for msg in gold_channel.history(limit=100):
-                                uid = int(msg.content.split("|")[0].strip())
-                                gold_member_ids.add(uid)
-                        except Exception:
-                            pass
-                if member.id not in gold_member_ids:
+                if not is_premium(member.id):
                     try:
                         await message.delete()
                     except Exception:
@@ -930,16 +1029,19 @@ class RocketDial(commands.Cog):
         censored_content = self.censor_message(message.content)
 
         # ---------------------------
-        # 7️⃣ Forward to partner (using partner's webhook)
+        # 7️⃣ Forward to partner (queued in order on this side's outbox, sent via partner's webhook)
         # ---------------------------
-        try:
-            await target_webhook.send(
-                content=censored_content,
-                username=display_name,
-                avatar_url=avatar_url
-            )
-        except Exception as e:
-            print(f"[RocketDial] forward message error: {e}")
+        outbox = call_info.get("outbox")
+        if outbox is None or outbox.channel != target_channel:
+            outbox = call_info["outbox"] = RelayOutbox(self, target_channel)
+        if not outbox.put(message, censored_content, display_name, avatar_url):
+            try:
+                await message.channel.send(
+                    f"🐢 {member.mention}, the line is busy. That message wasn't sent, slow down a little.",
+                    delete_after=8
+                )
+            except Exception:
+                pass
 
         # ---------------------------
         # 8️⃣ Ensure commands still work
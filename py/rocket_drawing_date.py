@@ -7,20 +7,16 @@ from dotenv import load_dotenv
 from PIL import Image
 import aiohttp
 import io
-from helpers import award_points,check_main_guild
+from helpers import (award_points_many,check_main_guild,latest_drawing,record_drawing_submission,
+                     delete_drawing_submissions)
 
 load_dotenv()
 SUBMISSION_CHANNEL_ID = int(os.getenv("DRAWING_SUBMISSION_CHANNEL", 0))
 
 
-# Helper to fetch last submitted image from fixed channel
-async def get_last_image(member: discord.Member, channel: discord.TextChannel):
-    async for msg in channel.history(limit=200):  # scan last 200 messages
-        if msg.author.id == member.id and msg.attachments:
-            for att in msg.attachments:
-                if att.content_type and att.content_type.startswith("image/"):
-                    return att.url
-    return None
+# Helper to get the last submitted image (drawing_submissions index, no history scan)
+async def get_last_image(bot, member: discord.Member):
+    return await latest_drawing(bot, member.id)
 
 
 # Helper to download image from URL
@@ -71,10 +67,11 @@ class DoneButton(discord.ui.View):
 
 
 class DateView:
-    def __init__(self, ctx, author: discord.Member, target: discord.Member):
+    def __init__(self, ctx, author: discord.Member, target: discord.Member, images: dict):
         self.ctx = ctx
         self.author = author
         self.target = target
+        self.images = images  # {member_id: portrait url}, resolved once when the date starts
         self.turn_images = {}  # {drawer_name: image_url}
         self.whiteboard_folder = "assets/drawing/whiteboard"
 
@@ -106,7 +103,7 @@ class DateView:
             await self.ctx.send("❌ Submission channel not found!")
             return
 
-        image_url = await get_last_image(use_photo_from, sub_channel)
+        image_url = self.images.get(use_photo_from.id)
         if not image_url:
             await self.ctx.send(
                 f"❌ {use_photo_from.mention} has not submitted an image in {sub_channel.mention} yet!"
@@ -144,13 +141,28 @@ class DateView:
         embed.set_footer(text="🎨 Jessie & James proudly present your art date 💕")
 
         await self.ctx.send(embed=embed, file=merged_file)
-        await award_points(self.ctx.bot, self.author, 15, notify_channel=self.ctx.channel)
-        await award_points(self.ctx.bot, self.target, 15, notify_channel=self.ctx.channel)
+        await award_points_many(self.ctx.bot, [(self.author, 15), (self.target, 15)], notify_channel=self.ctx.channel)
 
 class RocketDrawingDate(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    # Keep drawing_submissions current (RocketBackfill indexes older submissions once)
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        if SUBMISSION_CHANNEL_ID and message.channel.id == SUBMISSION_CHANNEL_ID:
+            await record_drawing_submission(message)
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        if SUBMISSION_CHANNEL_ID and payload.channel_id == SUBMISSION_CHANNEL_ID:
+            await delete_drawing_submissions([payload.message_id])
+
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent):
+        if SUBMISSION_CHANNEL_ID and payload.channel_id == SUBMISSION_CHANNEL_ID:
+            await delete_drawing_submissions(list(payload.message_ids))
+
     @commands.command(name="dd")
     async def dd(self, ctx, member: discord.Member = None):
 
@@ -168,8 +180,8 @@ class RocketDrawingDate(commands.Cog):
             return await ctx.send("❌ Submission channel not found!")
 
         # Check both have submitted images
-        author_image = await get_last_image(ctx.author, sub_channel)
-        target_image = await get_last_image(member, sub_channel)
+        author_image = await get_last_image(self.bot, ctx.author)
+        target_image = await get_last_image(self.bot, member)
 
         if not author_image or not target_image:
             missing = []
@@ -181,7 +193,7 @@ class RocketDrawingDate(commands.Cog):
                 f"❌ {' and '.join(missing)} must submit portrait in {sub_channel.mention} before starting a date!"
             )
 
-        game = DateView(ctx, ctx.author, member)
+        game = DateView(ctx, ctx.author, member, {ctx.author.id: author_image, member.id: target_image})
 
         # 1: Author phase
         await game.show_whiteboard(ctx.author, member)
@@ -1,11 +1,10 @@
 import discord
 from discord.ext import commands
-import json
 import asyncio
 import random
 import os
 import datetime
-from helpers import award_points,check_main_guild
+from helpers import award_points_many,check_main_guild,relative_time,CONTENT,MEMBERS,CHANNELS
 
 ESCAPE_ROOM_CHANNEL_ID = int(os.getenv("ESCAPE_ROOM_CHANNEL_ID", 0))
 
@@ -16,6 +15,7 @@ class RocketEscapeRoom(commands.Cog):
         self.testing_mode = True  # Set True for single-player testing
         # Get channel ID from env variable
         self.escape_story_channel_id = int(os.getenv("ADMIN_ESCAPE_STORY_CHANNEL_ID", 0))
+        CONTENT.watch(self.escape_story_channel_id)
 
     # ----------------- Commands -----------------
     @commands.group(name="er", invoke_without_command=True)
@@ -76,15 +76,11 @@ class RocketEscapeRoom(commands.Cog):
         await ctx.send(embed=embed)
         await ctx.send(f"👥 Minimum Players: {min_p} | Maximum Players: {max_p}")
 
-        wait_msg = await ctx.send(
-            f"Type `.er join` to join the escape mission! Waiting {join_countdown} seconds for players... ⏳"
+        await ctx.send(
+            f"Type `.er join` to join the escape mission! Joining closes {relative_time(join_countdown)} ⏳"
         )
 
-
-        for i in range(join_countdown, 0, -1):
-            await wait_msg.edit(
-                content=f"Type `.er join` to join the escape mission! Waiting {i} seconds for players... ⏳"
-            )
+        for _ in range(join_countdown):
             await asyncio.sleep(1)
             if len(self.active_rooms[guild_id]["players"]) >= max_p:
                 await ctx.send(f"👥 Maximum players ({max_p}) reached! Starting the mission early!")
@@ -137,18 +133,10 @@ class RocketEscapeRoom(commands.Cog):
     async def fetch_latest_story(self):
         if not self.escape_story_channel_id:
             return None
-        channel = self.bot.get_channel(self.escape_story_channel_id)
-        if not channel:
-            return None
-        try:
-            async for msg in channel.history(limit=50):
-                for att in msg.attachments:
-                    if att.filename.endswith(".json"):
-                        content = await att.read()
-                        return json.loads(content.decode("utf-8"))
-        except Exception as e:
-            print(f"[ERROR] fetch_latest_story: {e}")
-        return None
+        return await CONTENT.json_attachment(
+            self.bot, self.escape_story_channel_id,
+            validate=lambda d: isinstance(d, dict) and bool(d.get("escape_stories"))
+        )
 
     # ----------------- Puzzle logic -----------------
     async def run_puzzles(self, ctx, guild_id):
@@ -158,16 +146,9 @@ class RocketEscapeRoom(commands.Cog):
         guild = ctx.guild
         trapped_role = discord.utils.get(guild.roles, name="Trapped")
         pokecandidate_role = discord.utils.get(guild.roles, name="PokeCandidates")
-        # Get all player Member objects
-        players = []
-        for pid in room["players"]:
-            member = guild.get_member(pid)
-            if not member:
-                try:
-                    member = await guild.fetch_member(pid)
-                except discord.NotFound:
-                    continue
-            players.append(member)
+        # Get all player Member objects (players who left are skipped)
+        members = await MEMBERS.resolve(guild, room["players"])
+        players = [members[pid] for pid in room["players"] if pid in members]
 
         for puzzle in puzzles:
             embed = discord.Embed(
@@ -179,11 +160,10 @@ class RocketEscapeRoom(commands.Cog):
                 embed.set_thumbnail(url=puzzle["image"])
 
             view = VoteView(self.bot, puzzle, players)
-            msg = await ctx.send(embed=embed, view=view)
-
             countdown = puzzle.get("countdown", 30)
-            for i in range(countdown, 0, -1):
-                await msg.edit(content=f"⏳ Time left: {i} seconds", embed=embed)
+            msg = await ctx.send(content=f"⏳ Time's up {relative_time(countdown)}", embed=embed, view=view)
+
+            for _ in range(countdown):
                 await asyncio.sleep(1)
                 if len(view.votes) >= len(players):
                     break
@@ -198,37 +178,45 @@ class RocketEscapeRoom(commands.Cog):
                             await p.add_roles(pokecandidate_role)
                         except:
                             pass
-                for p in players:
-                    if p and (not p.guild_permissions.administrator or self.testing_mode):
-                        try:
-                            await award_points(self.bot, p, 3, notify_channel=ctx.channel)
-                            await self.freeze_player(ctx, p, duration=300)  # 5 minutes
-                        except:
-                            pass
+                frozen = [p for p in players if p and (not p.guild_permissions.administrator or self.testing_mode)]
+                try:
+                    await award_points_many(self.bot, [(p, 3) for p in frozen], notify_channel=ctx.channel)
+                except Exception as e:
+                    print(f"[ERROR] Escape room rewards failed: {e}")
+                for p in frozen:
+                    try:
+                        await self.freeze_player(ctx, p, duration=300)  # 5 minutes
+                    except:
+                        pass
                 await ctx.send(f"Game ended. 💥 \n {', '.join(fail_mentions)} have been frozen for 5 minutes! ❄️ Team Rocket laughs maniacally!"
                                f"\n💎 Players will be rewarded 3 gems for joining!")
                 if guild_id in self.active_rooms:
                     del self.active_rooms[guild_id]
                 return
 
+        winners = []
         for p in players:
             if p and trapped_role and trapped_role in p.roles:
                 try:
                     await p.remove_roles(trapped_role, reason="Escape mission success")
                     await p.add_roles(pokecandidate_role)
-                    await award_points(self.bot, p, 5, notify_channel=ctx.channel)
+                    winners.append(p)
                 except:
                     pass
+        try:
+            await award_points_many(self.bot, [(p, 5) for p in winners], notify_channel=ctx.channel)
+        except Exception as e:
+            print(f"[ERROR] Escape room rewards failed: {e}")
 
         member_mentions = [m.mention for m in players if m]
+        victory_img = story.get("victory_img")
         await ctx.send(
             f"🌟 **VICTORY!** Excellent work, {', '.join(member_mentions)}, flawless escape! 🎉 "
             f"Team Rocket blasts off 🚀, and no one got frozen! ❄️✨"
-            f"\n💎 Players will be rewarded 5 gems for winning!"
+            f"\n💎 Players will be rewarded 5 gems for winning!",
+            embed=discord.Embed(title="🎉 Victory!", color=discord.Color.green()).set_thumbnail(url=victory_img)
+            if victory_img else None
         )
-        victory_img = story.get("victory_img")
-        if victory_img:
-            await ctx.send(embed=discord.Embed(title="🎉 Victory!", color=discord.Color.green()).set_thumbnail(url=victory_img))
 
         if guild_id in self.active_rooms:
             del self.active_rooms[guild_id]
@@ -241,7 +229,7 @@ class RocketEscapeRoom(commands.Cog):
             await member.send(f"💥 You are frozen for {duration // 60} minutes! Team Rocket punishes you ❄️")
         except:
             pass
-        channel = discord.utils.get(ctx.guild.text_channels, name="freeze-status")
+        channel = CHANNELS.get(ctx.guild, "freeze-status")
         if channel:
             await channel.send(f"❄️ {member.mention} has been frozen for {duration // 60} minutes!")
 
@@ -262,27 +250,27 @@ class VoteView(discord.ui.View):
         if message:
             await message.edit(view=self)
 
-        await ctx.send("🛑 Voting ended. Results:")
+        # All results go out as one message
+        lines = ["🛑 Voting ended. Results:"]
         tally: dict[str, int] = {}
 
         for user, choice in self.votes.items():
             tally[choice] = tally.get(choice, 0) + 1
-            await ctx.send(f"{user.mention} voted **{choice}**")
+            lines.append(f"{user.mention} voted **{choice}**")
 
         if not tally:
-            await ctx.send("💀 No votes cast. Team Rocket fails!")
+            lines.append("💀 No votes cast. Team Rocket fails!")
+            await ctx.send("\n".join(lines))
             return False
 
         final_answer: str | None = max(tally, key=tally.get, default=None)
-        await ctx.send(f"🏆 Team's final answer: **{final_answer}**")
+        lines.append(f"🏆 Team's final answer: **{final_answer}**")
 
         correct_answer = next((a["text"] for a in self.puzzle["answers"] if a["correct"]), None)
-        if final_answer == correct_answer:
-            await ctx.send(f"✅ Correct!")
-            return True
-        else:
-            await ctx.send(f"💥 Wrong answer!")
-            return False
+        correct = final_answer == correct_answer
+        lines.append("✅ Correct!" if correct else "💥 Wrong answer!")
+        await ctx.send("\n".join(lines))
+        return correct
 
 class VoteButton(discord.ui.Button):
     def __init__(self, label, view):
@@ -5,7 +5,8 @@ import asyncio
 import os
 import re
 from collections import defaultdict
-from helpers import award_points
+from helpers import (award_points_many, add_lightning_scores, fetch_lightning_leaderboard, legacy_import_done, relative_time,
+                     TITLE_ROLES, CONTENT, MEMBERS)
 import random
 
 class LightningRound(commands.Cog):
@@ -17,6 +18,7 @@ class LightningRound(commands.Cog):
         self.participants = defaultdict(lambda: {"joined": False})
         self.round_scores = defaultdict(int)
         self.admin_channel_id = int(os.getenv("ADMIN_LIGHTNING_ROUND_ID", 0))
+        CONTENT.watch(self.admin_channel_id)
         self.current_view = None
         self.questions = []
 
@@ -42,14 +44,13 @@ class LightningRound(commands.Cog):
             self.active_game = False
             return
 
-        # Fetch last 3 messages: questions, config, leaderboard
-        msgs = [msg async for msg in admin_channel.history(limit=3, oldest_first=False)]
-        msgs.reverse()  # oldest first
+        # Last 3 messages (oldest first): questions, config, leaderboard
+        msgs = await CONTENT.recent_texts(self.bot, self.admin_channel_id, 3)
 
         # 1st message = questions
         self.questions = []
         if len(msgs) >= 1:
-            raw_lines = [line.strip() for line in msgs[0].content.splitlines() if line.strip()]
+            raw_lines = [line.strip() for line in msgs[0][1].splitlines() if line.strip()]
             for line in raw_lines:
                 parts = line.split("|")
                 if len(parts) >= 3:
@@ -67,7 +68,7 @@ class LightningRound(commands.Cog):
         ready_seconds = 10
         question_seconds = 5
         if len(msgs) >= 2:
-            config_text = msgs[1].content
+            config_text = msgs[1][1]
             match_ready = re.search(r'COUNTDOWN_READY\s*=\s*(\d+)', config_text, re.IGNORECASE)
             if match_ready: ready_seconds = int(match_ready.group(1))
             match_q = re.search(r'COUNTDOWN_QUESTIONS\s*=\s*(\d+)', config_text, re.IGNORECASE)
@@ -76,17 +77,16 @@ class LightningRound(commands.Cog):
         # Countdown embed
         embed = discord.Embed(
             title="⚡ Lightning Round Incoming!",
-            description=f"@everyone Get ready...\n\n⏳ {ready_seconds} seconds remaining...",
+            description=f"@everyone Get ready...\n\n⏳ Starting {relative_time(ready_seconds)}",
             color=discord.Color.red()
         )
         ready_msg = await ctx.send(embed=embed)
-        for remaining in range(ready_seconds - 1, -1, -1):
-            await asyncio.sleep(1)
-            try:
-                embed.description = f"@everyone Get ready...\n\n⏳ {remaining} seconds remaining..." if remaining > 0 else f"@everyone Get ready...\n\n🚀 **GO!**"
-                await ready_msg.edit(embed=embed)
-            except discord.HTTPException:
-                break
+        await asyncio.sleep(ready_seconds)
+        try:
+            embed.description = f"@everyone Get ready...\n\n🚀 **GO!**"
+            await ready_msg.edit(embed=embed)
+        except discord.HTTPException:
+            pass
 
         # Run questions
         for qnum, (question_text, choices, correct_idx) in enumerate(self.questions, 1):
@@ -135,39 +135,30 @@ class LightningRound(commands.Cog):
 
             embed = discord.Embed(
                 title=f"⚡ Lightning Round! (Q{qnum})",
-                description=f"@everyone {question_text}\nClick your answer below!\n\n⏳ {question_seconds} seconds remaining...",
+                description=f"@everyone {question_text}\nClick your answer below!\n\n⏳ Time's up {relative_time(question_seconds)}",
                 color=discord.Color.purple()
             )
             question_msg = await ctx.send(embed=embed, view=view)
 
-            for remaining in range(question_seconds - 1, -1, -1):
+            for _ in range(question_seconds):
                 await asyncio.sleep(1)
                 if answered_first is not None or not self.active_game:
                     break
+            else:
                 try:
-                    embed.description = f"@everyone {question_text}\nClick your answer below!\n\n⏳ {remaining} seconds remaining..." if remaining > 0 else f"@everyone {question_text}\nClick your answer below!\n\n⏰ **TIME’S UP!**"
+                    embed.description = f"@everyone {question_text}\nClick your answer below!\n\n⏰ **TIME’S UP!**"
                     await question_msg.edit(embed=embed, view=view)
                 except discord.HTTPException:
-                    break
+                    pass
 
             await view.wait()
             if answered_first is None:
                 await ctx.send("❌ No one clicked in time.")
 
         # --- Game finished: reward 15 💎 ---
-        reward_lines = []
-        for uid in self.participants:
-            member = ctx.guild.get_member(uid)
-            if member:
-                await award_points(self.bot, member, 15, notify_channel=ctx.channel)
-                reward_lines.append(f"🎉 <@{uid}> — +15 💎")
-
-        if reward_lines:
-            await ctx.send(embed=discord.Embed(
-                title="💎 Lightning Round Rewards",
-                description="\n".join(reward_lines),
-                color=discord.Color.green()
-            ))
+        members = [m for m in (ctx.guild.get_member(uid) for uid in self.participants) if m]
+        await award_points_many(self.bot, [(m, 15) for m in members], notify_channel=ctx.channel,
+                                title="💎 Lightning Round Rewards")
 
         # Update/create leaderboard (3rd message)
         await self.update_leaderboard(admin_channel)
@@ -186,19 +177,9 @@ class LightningRound(commands.Cog):
             self.current_view.stop()
             self.current_view = None
 
-        reward_lines = []
-        for uid in self.participants:
-            member = ctx.guild.get_member(uid)
-            if member:
-                await award_points(self.bot, member, 5, notify_channel=ctx.channel)
-                reward_lines.append(f"⚡ <@{uid}> — +5 💎")
-
-        if reward_lines:
-            await ctx.send(embed=discord.Embed(
-                title="💎 Lightning Round Rewards",
-                description="\n".join(reward_lines),
-                color=discord.Color.green()
-            ))
+        members = [m for m in (ctx.guild.get_member(uid) for uid in self.participants) if m]
+        await award_points_many(self.bot, [(m, 5) for m in members], notify_channel=ctx.channel,
+                                title="💎 Lightning Round Rewards")
 
         admin_channel = self.bot.get_channel(self.admin_channel_id)
         await self.update_leaderboard(admin_channel)
@@ -209,117 +190,53 @@ class LightningRound(commands.Cog):
 
     # ------------------------------
     async def update_leaderboard(self, admin_channel):
-        msgs = [msg async for msg in admin_channel.history(limit=3, oldest_first=False)]
-        msgs.reverse()
-        leaderboard_msg = msgs[2] if len(msgs) >= 3 else None
-
-        existing_scores = {}
-        if leaderboard_msg and leaderboard_msg.content.strip():
-            for line in leaderboard_msg.content.splitlines():
-                try:
-                    name_id, score = line.split("|")
-                    name, uid = name_id.rsplit("-", 1)
-                    existing_scores[int(uid.strip())] = int(score.strip())
-                except Exception as e:
-                    print(f"[ERROR] Failed to parse line '{line}': {e}")
-
+        """Add this round to lightning_scores, then refresh the leaderboard (3rd) admin message from it."""
+        round_scores = []
         for uid, score in self.round_scores.items():
-            if uid in existing_scores:
-                existing_scores[uid] += score
-            else:
-                existing_scores[uid] = score
-
-        lb_lines = []
-        for uid, score in existing_scores.items():
             member = admin_channel.guild.get_member(uid)
-            name = member.display_name if member else str(uid)
-            lb_lines.append(f"{name} - {uid} | {score}")
-        lb_text = "\n".join(lb_lines) if lb_lines else ""
+            round_scores.append((uid, member.display_name if member else str(uid), score))
+        await add_lightning_scores(round_scores)
+
+        lb_text = "\n".join(f"{name or uid} - {uid} | {score}" for uid, name, score in await fetch_lightning_leaderboard())
 
+        if not lb_text or not await legacy_import_done("lightning"):
+            return  # keep the legacy message intact until its scores are imported
+        msgs = await CONTENT.recent_texts(self.bot, admin_channel.id, 3)
+        leaderboard_msg = msgs[2] if len(msgs) >= 3 else None
         if leaderboard_msg:
-            await leaderboard_msg.edit(content=lb_text)
+            await admin_channel.get_partial_message(leaderboard_msg[0]).edit(content=lb_text)
+            CONTENT.upsert(admin_channel.id, leaderboard_msg[0], lb_text)
         else:
-            await admin_channel.send(lb_text)
+            sent = await admin_channel.send(lb_text)
+            CONTENT.upsert(admin_channel.id, sent.id, lb_text, [])
 
     async def show_leaderboard(self, ctx, admin_channel=None):
-        if not admin_channel:
-            admin_channel = self.bot.get_channel(self.admin_channel_id)
-
-        msgs = [msg async for msg in admin_channel.history(limit=3, oldest_first=False)]
-        msgs.reverse()
-        leaderboard_msg = msgs[2] if len(msgs) >= 3 else None
-
         lb_entries = []
         top_user_id = None
         top_member = None
-        parsed_scores = []
-
-        if leaderboard_msg and leaderboard_msg.content.strip():
-            for line in leaderboard_msg.content.splitlines():
-                try:
-                    name_id, score = line.split("|")
-                    name, uid = name_id.rsplit("-", 1)
-                    parsed_scores.append((name.strip(), int(uid.strip()), int(score.strip())))
-                except Exception as e:
-                    print(f"[ERROR] Failed to parse line '{line}': {e}")
-
-            parsed_scores.sort(key=lambda x: x[2], reverse=True)
+        parsed_scores = [(name or str(uid), uid, score) for uid, name, score in await fetch_lightning_leaderboard()]
 
+        if parsed_scores:
             for i, (name, uid, score) in enumerate(parsed_scores):
                 medal = "🥇" if i == 0 else "🥈" if i == 1 else "🥉" if i == 2 else f"{i + 1}️⃣"
                 lb_entries.append(f"{medal} {name} — {score} ⭐")
 
-            if parsed_scores:
-                top_user_id = parsed_scores[0][1]
-
-                top_member = ctx.guild.get_member(top_user_id)
-                if not top_member:
-                    try:
-                        top_member = await ctx.guild.fetch_member(top_user_id)
-                        print(f"[INFO] Fetched top member {top_member.display_name} from API")
-                    except discord.NotFound:
-                        print(f"[ERROR] Top member with ID {top_user_id} not found in guild")
-                        top_member = None
-                    except Exception as e:
-                        print(f"[ERROR] Unexpected error fetching top member {top_user_id}: {e}")
-                        top_member = None
+            top_user_id = parsed_scores[0][1]
+
+            top_member = await MEMBERS.get(ctx.guild, top_user_id)
+            if not top_member:
+                print(f"[ERROR] Top member with ID {top_user_id} not found in guild")
         else:
             lb_entries.append("No scores yet. Type `.lr start` to play!")
 
-        # ---------------- Role Assignment with Debug ----------------
+        # ---------------- Role Assignment ----------------
         role_name = "Lightning Ace ⚡"
         lr_role = discord.utils.get(ctx.guild.roles, name=role_name)
 
-        print("---- DEBUG LIGHTNING ROUND ----")
-        print("Top member ID:", top_user_id)
-        print("Top member object:", top_member)
-        print("All guild roles:", [r.name for r in ctx.guild.roles])
-        bot_member = ctx.guild.get_member(self.bot.user.id)
-        print("Bot top role:", bot_member.top_role.name if bot_member else "None")
-
         if not lr_role:
             print(f"[ERROR] Role '{role_name}' does not exist! Cannot assign Lightning Ace.")
         else:
-            for member in ctx.guild.members:
-                if lr_role in member.roles:
-                    try:
-                        await member.remove_roles(lr_role, reason="Reset Lightning Ace role")
-                        print(f"[INFO] Removed role '{role_name}' from {member.display_name}")
-                    except discord.Forbidden:
-                        print(f"[ERROR] Cannot remove role from {member.display_name}, check bot hierarchy or permissions.")
-                    except Exception as e:
-                        print(f"[ERROR] Unexpected error removing role from {member.display_name}: {e}")
-
-            if top_member:
-                try:
-                    await top_member.add_roles(lr_role, reason="Top scorer Lightning Round")
-                    print(f"[INFO] Assigned role '{role_name}' to {top_member.display_name}")
-                except discord.Forbidden:
-                    print(f"[ERROR] Cannot assign role to {top_member.display_name}, check bot hierarchy or permissions.")
-                except Exception as e:
-                    print(f"[ERROR] Unexpected error assigning role to {top_member.display_name}: {e}")
-            else:
-                print("[INFO] No top member found to assign the role.")
+            TITLE_ROLES.set_holders(lr_role, {top_member.id} if top_member else set(), "Top scorer Lightning Round")
 
         embed = discord.Embed(
             title="🏆 Lightning Round Leaderboard",
@@ -5,7 +5,7 @@ import asyncio, random, os, time
 from collections import defaultdict
 from datetime import timedelta
 from discord.utils import utcnow
-from helpers import (award_points)
+from helpers import award_points_many, relative_time, LIVE
 # ---------------- Config ----------------
 MIN_TEAM_SIZE = 1
 MAX_TEAM_SIZE = 10
@@ -90,18 +90,21 @@ class MontageChallenge(commands.Cog):
         sess = self.active_session
         sess.join_open = True
 
+        closes = relative_time(JOIN_DURATION)
         join_msg = await ctx.send(f"🎮 {ctx.author.mention} started a Montage Challenge!\n"
                                   f"Team A: {ctx.author.mention}\nTeam B: (empty)\n"
-                                  f"Join with `.mc join` ({JOIN_DURATION}s left)...")
+                                  f"⏳ Join with `.mc join` (closes {closes})...")
 
-        for remaining in range(JOIN_DURATION, 0, -1):
+        # The timestamp counts down client-side; the message is only edited when the teams change
+        for _ in range(JOIN_DURATION):
+            await asyncio.sleep(1)
             team_a = ", ".join([m.mention for m in sess.teams["A"]]) or "None"
             team_b = ", ".join([m.mention for m in sess.teams["B"]]) or "None"
-            await join_msg.edit(content=f"🎮 Montage Challenge!\nTeam A: {team_a}\nTeam B: {team_b}\n"
-                                        f"⏳ Join with `.mc join` ({remaining}s left)...")
-            await asyncio.sleep(1)
+            LIVE.update(join_msg, content=f"🎮 Montage Challenge!\nTeam A: {team_a}\nTeam B: {team_b}\n"
+                                          f"⏳ Join with `.mc join` (closes {closes})...")
 
         sess.join_open = False
+        await LIVE.finish(join_msg)
         await self.launch_game(ctx)
 
     @mc.command(name="join",help="Join a team (A / B)")
@@ -168,7 +171,7 @@ class MontageChallenge(commands.Cog):
             description="👀 Spot duplicates! Press 🚨 BUZZER when you see one.",
             color=discord.Color.blurple()
         )
-        embed.add_field(name="Time Remaining", value=f"{ROUND_DURATION}s", inline=False)
+        embed.add_field(name="Time Remaining", value=f"Ends {relative_time(ROUND_DURATION)}", inline=False)
         embed.add_field(name="Buzzer 🔔", value="No buzzes yet.", inline=False)
         embed.add_field(name="Duplicates Remaining", value=str(sess.current_duplicate_count), inline=False)
 
@@ -186,8 +189,6 @@ class MontageChallenge(commands.Cog):
                     break
                 await asyncio.sleep(1)
                 remaining_time -= 1
-                embed.set_field_at(0, name="Time Remaining", value=f"{remaining_time}s", inline=False)
-                await msg.edit(embed=embed)
 
             sess.teams_buzzed_current.clear()
             if remaining_time <= 0 or sess.current_duplicate_count <= 0:
@@ -290,14 +291,9 @@ class MontageChallenge(commands.Cog):
         await ctx.send(embed=win_embed)
 
         # ➕ Give rewards
-        for member in sess.teams[winner]:
-            await award_points(self.bot, member, 5, notify_channel=ctx.channel)
-        for member in sess.teams[loser]:
-            await award_points(self.bot, member, 3, notify_channel=ctx.channel)
-
-        await ctx.send(f"💎 Rewards distributed!\n"
-                       f"Team {winner}: **+5 gems each**\n"
-                       f"Team {loser}: **+3 gems each**")
+        awards = [(member, 5) for member in sess.teams[winner]] + [(member, 3) for member in sess.teams[loser]]
+        await award_points_many(self.bot, awards, notify_channel=ctx.channel,
+                                title=f"💎 Rewards distributed! Team {winner}: +5 each · Team {loser}: +3 each")
 
         # Timeout losing team (skip admins)
         timeout_seconds = len(sess.flashed_images) * IMAGE_DURATION
@@ -5,14 +5,9 @@ import asyncio
 from collections import defaultdict
 import os
 import re
-from helpers import (award_points,update_daily_quest)
+from helpers import (award_points,emit_quest_event,relative_time,CONTENT)
 
 
-def progress_bar(current, total, length=12):
-    filled = int(length * current / total)
-    empty = length - filled
-    return "■" * filled + "□" * empty
-
 class PressQuest(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -49,26 +44,24 @@ class PressQuest(commands.Cog):
 
         # fetch last 2 messages from admin channel
         channel_id = int(os.getenv("ADMIN_PRESS_QUEST_ID", 0))
-        channel = self.bot.get_channel(channel_id)
         questions = []
         countdown_seconds = 30  # default
 
-        if channel:
+        if channel_id:
             try:
-                # newest first, then reverse to get oldest first
-                msgs = [msg async for msg in channel.history(limit=2, oldest_first=False)]
-                msgs.reverse()
+                # last 2 messages, oldest first
+                msgs = await CONTENT.recent_texts(self.bot, channel_id, 2)
 
                 if len(msgs) >= 1:
                     # first message = questions
-                    raw_lines = [line.strip() for line in msgs[0].content.split("\n") if line.strip()]
+                    raw_lines = [line.strip() for line in msgs[0][1].split("\n") if line.strip()]
                     for line in raw_lines:
                         q = re.sub(r"^\s*\d+[\.\)]\s*", "", line)
                         questions.append(q)
 
                 if len(msgs) >= 2:
                     # second message = countdown
-                    match = re.search(r'COUNTDOWN\s*=\s*(\d+)', msgs[1].content.strip(), re.IGNORECASE)
+                    match = re.search(r'COUNTDOWN\s*=\s*(\d+)', msgs[1][1].strip(), re.IGNORECASE)
                     if match:
                         countdown_seconds = int(match.group(1))
             except Exception as e:
@@ -87,11 +80,10 @@ class PressQuest(commands.Cog):
         # initial embed
         embed = discord.Embed(
             title=f"Press Quest (Quick Blast-Off Survey)",
-            description=f"{ctx.author.mention}, {questions[0]}",
+            description=f"{ctx.author.mention}, {questions[0]}\n\n⏳ Time's up {relative_time(countdown_seconds)}",
             color=discord.Color.purple()
         )
-        bar = progress_bar(countdown_seconds, countdown_seconds)
-        embed.set_footer(text=f"💡 Tip: press ✅ for YES or ❌ for NO | Q1/{len(questions)}\n⏳ [{bar}] {countdown_seconds}s")
+        embed.set_footer(text=f"💡 Tip: press ✅ for YES or ❌ for NO | Q1/{len(questions)}")
 
         view = View(timeout=None)
         yes_btn = Button(emoji="✅", style=discord.ButtonStyle.secondary, custom_id="press_yes")
@@ -121,7 +113,7 @@ class PressQuest(commands.Cog):
             # 🎉 Bonus comes AFTER summary
             if answers and all(a not in ["⏳ No Response"] for _, a in answers):
                 await award_points(self.bot, ctx.author, 15, notify_channel=ctx.channel)
-                await update_daily_quest(self.bot, ctx.author, "d")
+                await emit_quest_event(ctx.author, "press_quest")
                 await ctx.send(
                     f"🎉 {ctx.author.mention}, you completed the full Press Quest and earned **15 💎!**")
             elif answers:
@@ -135,19 +127,15 @@ class PressQuest(commands.Cog):
             result = {"answered": False}
 
             async def countdown():
-                for remaining in range(countdown_seconds, 0, -1):
-                    if result["answered"]:
-                        return
-                    bar = progress_bar(remaining, countdown_seconds)
-                    embed.description = f"{ctx.author.mention}, {question_text}"
-                    embed.set_footer(
-                        text=f"💡 Tip: press ✅ for YES or ❌ for NO | Q{index+1}/{total}\n⏳ [{bar}] {remaining}s"
-                    )
+                # One edit per question; the relative timestamp counts down client-side
+                if index > 0:
+                    embed.description = f"{ctx.author.mention}, {question_text}\n\n⏳ Time's up {relative_time(countdown_seconds)}"
+                    embed.set_footer(text=f"💡 Tip: press ✅ for YES or ❌ for NO | Q{index+1}/{total}")
                     try:
                         await msg.edit(embed=embed, view=view)
                     except discord.NotFound:
                         return
-                    await asyncio.sleep(1)
+                await asyncio.sleep(countdown_seconds)
                 if not result["answered"]:
                     answers.append((question_text, "⏳ No Response"))
                     result["answered"] = True
@@ -174,6 +162,9 @@ class PressQuest(commands.Cog):
             for task in [timer_task, click_task]:
                 if not task.done():
                     task.cancel()
+            if not result["answered"]:
+                answers.append((question_text, "⏳ No Response"))
+                result["answered"] = True
 
         # run all questions dynamically
         for idx, question in enumerate(questions):
@@ -4,16 +4,12 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from dotenv import load_dotenv
+from helpers import latest_drawing
 
 load_dotenv()
 PROFILE_FORUM_ID = int(os.getenv("PROFILE_FORUM_ID", 0)) if os.getenv("PROFILE_FORUM_ID") else None
 DRAWING_SUBMISSION_CHANNEL = int(os.getenv("DRAWING_SUBMISSION_CHANNEL", 0)) if os.getenv("DRAWING_SUBMISSION_CHANNEL") else None
 
-# Example storage for user's drawing submissions (replace with your DB/JSON)
-# Format: {user_id: message_id}
-user_drawings = {}
-
-
 class RocketRegistrationForm(discord.ui.Modal, title="🚀 Team Rocket Registration"):
     age = discord.ui.TextInput(label="🎂 Age", placeholder="Must be 18+")
     looking_for = discord.ui.TextInput(label="👀 Looking For", placeholder="💫Age range: , 🌍Location preference:")
@@ -60,20 +56,14 @@ class RocketRegistrationForm(discord.ui.Modal, title="🚀 Team Rocket Registrat
         file_to_attach = None
         if DRAWING_SUBMISSION_CHANNEL:
             try:
-                drawing_channel = interaction.client.get_channel(DRAWING_SUBMISSION_CHANNEL)
-                if drawing_channel:
-                    async for msg in drawing_channel.history(limit=100, oldest_first=False):
-                        if msg.author.id == interaction.user.id and msg.attachments:
-                            attachment = msg.attachments[0]
-                            file_bytes = await attachment.read()
-                            file_to_attach = discord.File(
-                                fp=io.BytesIO(file_bytes),
-                                filename=attachment.filename
-                            )
-                            print(f"[DEBUG] Found latest drawing: {attachment.filename}")
-                            break
-                else:
-                    print(f"[DEBUG] Drawing channel {DRAWING_SUBMISSION_CHANNEL} not found")
+                attachment = await latest_drawing(interaction.client, interaction.user.id)
+                if attachment:
+                    file_bytes = await attachment.read()
+                    file_to_attach = discord.File(
+                        fp=io.BytesIO(file_bytes),
+                        filename=attachment.filename
+                    )
+                    print(f"[DEBUG] Found latest drawing: {attachment.filename}")
             except Exception as e:
                 print(f"[DEBUG] Failed to fetch latest drawing: {e}")
 
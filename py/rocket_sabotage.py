@@ -1,11 +1,8 @@
 import discord
 from discord.ext import commands
 import os
-import re
-from helpers import award_points,check_main_guild
+from helpers import transfer, check_main_guild, get_user_gems, INVENTORY, INVENTORY_MIRROR
 
-INVENTORY_CHANNEL_ID = int(os.getenv("INVENTORY_CHANNEL_ID", 0))
-LEADERBOARD_CHANNEL_ID = int(os.getenv("LEADERBOARD_CHANNEL_ID", 0))
 SHOP_PUBLIC_CHANNEL_ID = int(os.getenv("SHOP_PUBLIC_CHANNEL_ID", 0))
 
 POKEBAG_THUMBNAIL_URL = "https://i.postimg.cc/Y2YGLRZ8/0b656b4c-d7e8-4679-8dc2-af9419bb7f38-removalai-preview.png"
@@ -14,154 +11,35 @@ class RocketSabotage(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.shop_channel = None
-        self.cached_inventory_msg = None
-        self.cached_leaderboard_msg = None
-        self.inventory_data = {}  # uid -> {"name": str, "items": {(emoji,item_name): count}}
-        self.leaderboard_data = {}  # uid -> gems
 
     async def cog_load(self):
         self.shop_channel = self.bot.get_channel(SHOP_PUBLIC_CHANNEL_ID)
-        await self.load_inventory()
-        await self.load_leaderboard()
 
     # ------------------------
-    # Loaders
+    # Inventory deduct
     # ------------------------
-    async def load_inventory(self):
-        channel = self.bot.get_channel(INVENTORY_CHANNEL_ID)
-        if not channel:
-            print("[DEBUG] INVENTORY_CHANNEL_ID not found")
-            return
-        try:
-            msg = [m async for m in channel.history(limit=1, oldest_first=False)][0]
-            self.cached_inventory_msg = msg
-            self.inventory_data = self.parse_inventory(msg.content)
-        except IndexError:
-            self.cached_inventory_msg = None
-            self.inventory_data = {}
-
-    async def load_leaderboard(self):
-        channel = self.bot.get_channel(LEADERBOARD_CHANNEL_ID)
-        if not channel:
-            print("[DEBUG] LEADERBOARD_CHANNEL_ID not found")
-            return
-        try:
-            msg = [m async for m in channel.history(limit=1, oldest_first=False)][0]
-            self.cached_leaderboard_msg = msg
-            self.leaderboard_data = self.parse_leaderboard(msg.content)
-        except IndexError:
-            self.cached_leaderboard_msg = None
-            self.leaderboard_data = {}
-
-    # ------------------------
-    # Parsers
-    # ------------------------
-    def parse_inventory(self, text):
-        data = {}
-        for line in text.splitlines():
-            if "|" not in line:
-                continue
-            name_id_part, *items_part = line.split("|")
-            if "-" not in name_id_part:
-                continue
-            name, uid = [x.strip() for x in name_id_part.split("-", 1)]
-            items = {}
-            for itemtxt in items_part:
-                match = re.match(r"(\S+)\s+(\d+)x\s+(.+)", itemtxt.strip())
-                if match:
-                    emoji, count, item_name = match.groups()
-                    item_name_clean = item_name.strip().replace("’", "'")
-                    items[(emoji, item_name_clean)] = int(count)
-            data[uid] = {"name": name, "items": items}
-        return data
-
-    def parse_leaderboard(self, text):
-        data = {}
-        for line in text.splitlines():
-            if "-" not in line:
-                continue
-            parts = [x.strip() for x in line.split("-")]
-            if len(parts) < 3:
-                continue
-            uid = parts[1].strip()
-            try:
-                gems = int(re.sub(r"\D", "", parts[2]))
-            except:
-                gems = 0
-            data[uid] = gems
-        return data
-
-    # ------------------------
-    # Inventory update / deduct
-    # ------------------------
-    async def update_inventory_message(self):
-        lines = []
-        for uid, data in self.inventory_data.items():
-            item_strs = [f"{emoji} {count}x {iname}" for (emoji, iname), count in data["items"].items()]
-            line = f"{data['name']} - {uid} | " + " | ".join(item_strs) if item_strs else f"{data['name']} - {uid} |"
-            lines.append(line)
-        content = "\n".join(lines) if lines else "No inventory yet."
-
-        channel = self.bot.get_channel(INVENTORY_CHANNEL_ID)
-        if not channel:
-            print("[DEBUG] INVENTORY_CHANNEL_ID not found")
-            return
-
-        if not self.cached_inventory_msg:
-            self.cached_inventory_msg = await channel.send(content)
-        else:
-            await self.cached_inventory_msg.edit(content=content)
-
     async def deduct_item(self, user_id: int, emoji: str) -> bool:
         """Deduct one item from inventory by emoji. Return True if deducted, False if not enough."""
-        uid = str(user_id)
-        user_data = self.inventory_data.get(uid, {"name": str(user_id), "items": {}})
-        items = user_data["items"]
-
-        key_found = None
-        for (e, n), count in items.items():
-            if e == emoji and count > 0:
-                key_found = (e, n)
-                break
-
-        if not key_found:
+        if not await INVENTORY.use_item(user_id, emoji):
             return False
-
-        items[key_found] -= 1
-        if items[key_found] <= 0:
-            del items[key_found]
-
-        await self.update_inventory_message()
+        INVENTORY_MIRROR.mark_dirty(self.bot)
         return True
 
+    async def send_missing_item(self, ctx, item_name):
+        """Tell the user they don't have an item and link the shop."""
+        shop_channel = self.bot.get_channel(SHOP_PUBLIC_CHANNEL_ID)
+        msg = f"❌ You don’t have **{item_name}**!"
+        if shop_channel:
+            msg += f" 🛒 Buy it from the shop: {shop_channel.mention}"
+        await ctx.send(msg)
+
     async def check_and_deduct(self, ctx, emoji, item_name):
         """Check if user has an item by emoji, deduct one, else show shop link."""
-        # Reload inventory to get fresh data
-        await self.load_inventory()
-
-        uid = str(ctx.author.id)
-        items = self.inventory_data.get(uid, {}).get("items", {})
-
-        key_found = None
-        for (e, n), count in items.items():
-            if e == emoji and n.strip().lower() == item_name.strip().lower() and count > 0:
-                key_found = (e, n)
-                break
-
-        shop_channel = self.bot.get_channel(SHOP_PUBLIC_CHANNEL_ID)
-        if not key_found:
-            msg = f"❌ You don’t have **{item_name}**!"
-            if shop_channel:
-                msg += f" 🛒 Buy it from the shop: {shop_channel.mention}"
-            await ctx.send(msg)
+        if not await INVENTORY.use_item(ctx.author.id, emoji, item_name):
+            await self.send_missing_item(ctx, item_name)
             return False
 
-        # Deduct the item
-        items[key_found] -= 1
-        if items[key_found] <= 0:
-            del items[key_found]
-
-        await self.update_inventory_message()
+        INVENTORY_MIRROR.mark_dirty(self.bot)
         return True
 
     # ------------------------
@@ -173,17 +51,13 @@ class RocketSabotage(commands.Cog):
         if not await check_main_guild(ctx):
             return  # stop execution if not in main server
 
-        await self.load_inventory()
-        await self.load_leaderboard()
         target = member or ctx.author
-        uid = str(target.id)
-        user_data = self.inventory_data.get(uid, {"name": target.display_name, "items": {}})
-        items = user_data["items"]
+        items = await INVENTORY.get_items(target.id)
         visible_items = [f"{e} {c}x {n}" for (e,n),c in items.items() if n.lower() != "wobbuffet shield"]
         inv_text = "\n".join(visible_items) if visible_items else "\nNo visible items."
-        user_gems = self.leaderboard_data.get(uid, 0)
+        user_gems = await get_user_gems(target.id)
         embed = discord.Embed(
-            title=f"{user_data['name']}'s Pokebag",
+            title=f"{target.display_name}'s Pokebag",
             description=f"**📦 Items:**\n{inv_text}\n\n**💎 {user_gems:,}**",
             color=discord.Color.green()
         )
@@ -238,9 +112,7 @@ class RocketSabotage(commands.Cog):
         await ctx.invoke(self.pokebag, member=member)
 
         # Get target's Wobbuffet Shield count
-        uid = str(member.id)
-        user_items = self.inventory_data.get(uid, {}).get("items", {})
-        shield_count = sum(count for (e, n), count in user_items.items() if n.lower() == "wobbuffet shield")
+        shield_count = await INVENTORY.count_item(member.id, "Wobbuffet Shield")
 
         # Add ShieldView so the user can click to check protection
         view = ShieldView(protection_count=shield_count, owner_id=ctx.author.id, bot=self.bot)
@@ -276,22 +148,20 @@ class RocketSabotage(commands.Cog):
             await ctx.send("❌ You need to mention a player to use the vacuum.", ephemeral=True)
             return
 
-        # Check if user has a vacuum
-        if not await self.check_and_deduct(ctx, "🧹", "Meowth's Rare Gem Vacuum"):
+        # Check if user has a vacuum; it is only taken once the outcome is known
+        vacuum = (ctx.author.id, "🧹", "Meowth's Rare Gem Vacuum")
+        if await INVENTORY.count_item(ctx.author.id, vacuum[2]) <= 0:
+            await self.send_missing_item(ctx, vacuum[2])
             return
 
-        uid_target = str(member.id)
-        uid_actor = str(ctx.author.id)
-
-        # Reload leaderboard to get accurate gem counts
-        await self.load_leaderboard()
-        target_gems_before = self.leaderboard_data.get(uid_target, 0)
-        actor_gems_before = self.leaderboard_data.get(uid_actor, 0)
+        target_gems_before = await get_user_gems(member.id)
+        actor_gems_before = await get_user_gems(ctx.author.id)
 
         # Check if target has Wobbuffet Shield
-        target_items = self.inventory_data.get(uid_target, {}).get("items", {})
-        shield_count = sum(count for (e, n), count in target_items.items() if n.lower() == "wobbuffet shield")
+        shield_count = await INVENTORY.count_item(member.id, "Wobbuffet Shield")
         if shield_count > 0:
+            if not await self.check_and_deduct(ctx, "🧹", vacuum[2]):
+                return
             await ctx.send(f"🛡️ {member.display_name} has a **Wobbuffet Shield**! Your vacuum failed.", ephemeral=True)
             return
 
@@ -301,14 +171,18 @@ class RocketSabotage(commands.Cog):
             await ctx.send(f"💨 {member.display_name} has no gems to steal!", ephemeral=True)
             return
 
-        # Use award_points to update both users
-        await award_points(self.bot, ctx.author, stolen_gems, notify_channel=ctx.channel)
-        await award_points(self.bot, member, -stolen_gems, notify_channel=ctx.channel)
-
-        # Reload leaderboard to reflect updated totals
-        await self.load_leaderboard()
-        actor_gems_after = self.leaderboard_data.get(uid_actor, 0)
-        target_gems_after = self.leaderboard_data.get(uid_target, 0)
+        # Use the vacuum and move the gems in one transaction; nothing changes if the
+        # target spent the gems or the vacuum was used elsewhere in the meantime
+        balances = await transfer(self.bot, member, ctx.author, stolen_gems,
+                                  key=f"vacuum:{ctx.message.id}", consume=vacuum)
+        if balances is None:
+            if await INVENTORY.count_item(ctx.author.id, vacuum[2]) <= 0:
+                await self.send_missing_item(ctx, vacuum[2])
+            else:
+                await ctx.send(f"💨 {member.display_name} has no gems to steal! Your vacuum wasn't used.", ephemeral=True)
+            return
+        actor_gems_after = balances[ctx.author.id]
+        target_gems_after = balances[member.id]
 
         # Build embed
         embed = discord.Embed(
@@ -346,36 +220,7 @@ class RocketSabotage(commands.Cog):
     )
     @commands.cooldown(rate=20, per=300, type=commands.BucketType.user)
     async def pi_gems(self, ctx: commands.Context):
-
-
-
-        rocket_shop_cog = self.bot.get_cog("RocketShop")
-        if not rocket_shop_cog:
-            return await safe_send(ctx, "⚠️ RocketShop cog is not loaded.")
-
-        channel = self.bot.get_channel(LEADERBOARD_CHANNEL_ID)
-        if not channel:
-            return await safe_send(ctx, "⚠️ Leaderboard channel not found!")
-
-        try:
-            msg = [m async for m in channel.history(limit=1, oldest_first=False)][0]
-        except IndexError:
-            return await safe_send(ctx, "⚠️ No leaderboard message found!")
-
-        user_id_str = str(ctx.author.id)
-        gems = 0
-
-        for line in msg.content.splitlines():
-            parts = [p.strip() for p in line.split("-")]
-            if len(parts) == 3:
-                _, uid, gems_str = parts
-                if uid == user_id_str:
-                    try:
-                        gems = int(re.sub(r"\D", "", gems_str))
-                    except ValueError:
-                        gems = 0
-                    break
-
+        gems = await get_user_gems(ctx.author.id)
         await ctx.send(f"💎 {ctx.author.mention}, you currently have **{gems:,} gems**!")  # <-- commas here
 # ------------------------
 # Shield Button View
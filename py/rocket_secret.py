@@ -4,8 +4,7 @@ import random
 from datetime import datetime
 import re
 import asyncio
-from helpers import award_points
-import os
+from helpers import award_points, is_premium, CHANNELS
 # ----------------------
 # Config
 # ----------------------
@@ -76,49 +75,11 @@ def extract_image_url_from_text(text: str) -> str | None:
 class SecretNotes(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self._gold_member_cache = set()
 
     # Helper to find a “secret” channel automatically
     def find_secret_channel(self, guild: discord.Guild):
-        for ch in guild.text_channels:
-            if "secret" in ch.name.lower():
-                return ch
-        return None
+        return CHANNELS.get(guild, "secret")
 
-    async def is_premium_member(self, user_id: int) -> bool:
-        """Check if a user is a Premium Member."""
-        # If we already have cached IDs, just check
-        if self._gold_member_cache:
-            return user_id in self._gold_member_cache
-
-        gold_channel_id = os.getenv("ADMIN_GOLD_MEMBERS")
-        if not gold_channel_id:
-            return False  # no gold channel configured
-
-        try:
-            # Try cached channel first
-            gold_channel = self.bot.get_channel(int(gold_channel_id))
-            if not gold_channel:
-                # Fetch from Discord API if not cached
-                gold_channel = await self.bot.fetch_channel(int(gold_channel_id))
-
-            if not gold_channel:
-                print(f"⚠️ Could not find gold-members channel with ID {gold_channel_id}")
-                return False
-
-            # Fetch all history to populate cache
-            async for msg in gold_channel.history(limit=None):  # None fetches all messages
-                parts = msg.content.split("|")
-                if parts:
-                    uid_str = parts[0].strip()
-                    if uid_str.isdigit():
-                        self._gold_member_cache.add(int(uid_str))
-
-            return user_id in self._gold_member_cache
-
-        except Exception as e:
-            print(f"⚠️ Error reading gold members: {e}")
-            return False
     # ----------------------
     # Main command group
     # ----------------------
@@ -380,7 +341,7 @@ class SecretNotes(commands.Cog):
             return
 
         # ✅ Check if user is a premium member
-        if not await self.is_premium_member(ctx.author.id):
+        if not is_premium(ctx.author.id):
             await ctx.send(
                 f"🚫 Sorry {ctx.author.mention}, only **Premium Members** can use this command.\n"
                 "Visit RocketBot’s official page to get Premium access.",
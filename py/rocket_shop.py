@@ -4,11 +4,10 @@ from discord import ui
 import os
 import re
 import time
+from helpers import get_user_gems, purchase, MEMBERS
 
 SHOP_PRIVATE_CHANNEL_ID = int(os.getenv("SHOP_PRIVATE_CHANNEL_ID", 0))
 SHOP_PUBLIC_CHANNEL_ID = int(os.getenv("SHOP_PUBLIC_CHANNEL_ID", 0))
-LEADERBOARD_CHANNEL_ID = int(os.getenv("LEADERBOARD_CHANNEL_ID", 0))
-INVENTORY_CHANNEL_ID = int(os.getenv("INVENTORY_CHANNEL_ID", 0))
 
 GRAY_COLOR = "#2F3136"
 
@@ -21,17 +20,11 @@ class RocketShop(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.shop_items = []
-        self.cached_inventory_msg = None
-        self.cached_leaderboard_msg = None
-        self.inventory_data = {}  # user_id -> {"name": str, "items": {(emoji,item_name): count}}
-        self.leaderboard_data = {}
         self.user_reaction_counts = {}  # user_id -> [count, first_reaction_time]
         self.user_cooldowns = {}  # user_id -> cooldown_end_timestamp
 
     async def cog_load(self):
         await self.load_shop_items()
-        await self.load_inventory()
-        await self.load_leaderboard()
 
     # -------------------------
     # Load messages
@@ -49,69 +42,9 @@ class RocketShop(commands.Cog):
         self.shop_items = self.parse_shop_message(msg.content)
         print(f"[DEBUG] Loaded {len(self.shop_items)} shop items")
 
-    async def load_inventory(self):
-        channel = self.bot.get_channel(INVENTORY_CHANNEL_ID)
-        if not channel:
-            return
-        try:
-            msg = [m async for m in channel.history(limit=1, oldest_first=False)][0]
-        except IndexError:
-            self.cached_inventory_msg = None
-            self.inventory_data = {}
-            return
-        self.cached_inventory_msg = msg
-        self.inventory_data = self.parse_inventory(msg.content)
-
-    async def load_leaderboard(self):
-        channel = self.bot.get_channel(LEADERBOARD_CHANNEL_ID)
-        if not channel:
-            return
-        try:
-            msg = [m async for m in channel.history(limit=1, oldest_first=False)][0]
-        except IndexError:
-            self.cached_leaderboard_msg = None
-            self.leaderboard_data = {}
-            return
-        self.cached_leaderboard_msg = msg
-        self.leaderboard_data = self.parse_leaderboard(msg.content)
-
     # -------------------------
     # Parsers
     # -------------------------
-    def parse_inventory(self, text):
-        data = {}
-        for line in text.splitlines():
-            if "|" not in line:
-                continue
-            name_id_part, *items_part = line.split("|")
-            if "-" not in name_id_part:
-                continue
-            name, uid = [x.strip() for x in name_id_part.split("-", 1)]
-            inv = {}
-            for itemtxt in items_part:
-                match = re.match(r"(\S+)\s+(\d+)x\s+(.+)", itemtxt.strip())
-                if match:
-                    emoji, count, item_name = match.groups()
-                    inv[(emoji, item_name.strip())] = int(count)
-            data[uid] = {"name": name, "items": inv}
-        return data
-
-    def parse_leaderboard(self, text):
-        data = {}
-        for line in text.splitlines():
-            if "-" not in line:
-                continue
-            parts = [x.strip() for x in line.split("-")]
-            if len(parts) < 3:
-                continue
-            uid = parts[1].strip()
-            try:
-                gems = int(re.sub(r"\D", "", parts[2]))
-            except:
-                gems = 0
-            data[uid] = gems
-        return data
-
     def parse_shop_message(self, text):
         items = []
         for line in text.splitlines():
@@ -137,60 +70,7 @@ class RocketShop(commands.Cog):
     # Helper functions
     # -------------------------
     async def get_user_gems(self, user_id: int):
-        return self.leaderboard_data.get(str(user_id), 0)
-
-    async def update_user_gems(self, user_id: int, new_gems: int):
-        self.leaderboard_data[str(user_id)] = new_gems
-        if not self.cached_leaderboard_msg:
-            return
-        lines = self.cached_leaderboard_msg.content.splitlines()
-        new_lines = []
-        found = False
-        for line in lines:
-            parts = [x.strip() for x in line.split("-")]
-            if len(parts) == 3 and parts[1] == str(user_id):
-                new_lines.append(f"{parts[0]} - {parts[1]} - {new_gems}")
-                found = True
-            else:
-                new_lines.append(line)
-        if not found:
-            new_lines.append(f"{self.bot.get_user(user_id).display_name} - {user_id} - {new_gems}")
-        await self.cached_leaderboard_msg.edit(content="\n".join(new_lines))
-
-    async def add_item_to_inventory(self, user_id: int, item_name: str, user_name: str, item_emoji: str):
-        uid = str(user_id)
-        user_data = self.inventory_data.get(uid, {"name": user_name, "items": {}})
-        items = user_data["items"]
-        key = (item_emoji, item_name)
-        items[key] = items.get(key, 0) + 1
-        self.inventory_data[uid] = {"name": user_name, "items": items}
-
-        # Fetch channel
-        channel = self.bot.get_channel(INVENTORY_CHANNEL_ID) or await self.bot.fetch_channel(INVENTORY_CHANNEL_ID)
-        if not channel:
-            print("[DEBUG] Inventory channel not found")
-            return
-
-        # Build content
-        lines = []
-        for u, data in self.inventory_data.items():
-            name = data["name"]
-            items = data["items"]
-            item_str = " | ".join(f"{emoji} {count}x {iname}" for (emoji, iname), count in items.items())
-            lines.append(f"{name} - {u} | {item_str}" if item_str else f"{name} - {u} |")
-        content = "\n".join(lines)
-
-        # Check last message in channel
-        try:
-            last_msg = [m async for m in channel.history(limit=1)][0]
-        except IndexError:
-            last_msg = None
-
-        if last_msg:
-            self.cached_inventory_msg = last_msg
-            await last_msg.edit(content=content)
-        else:
-            self.cached_inventory_msg = await channel.send(content)
+        return await get_user_gems(user_id)
 
     # -------------------------
     # Reaction listener with spam/cooldown
@@ -208,7 +88,7 @@ class RocketShop(commands.Cog):
         if now < cooldown_end:
             remaining = int(cooldown_end - now)
             guild = self.bot.get_guild(payload.guild_id)
-            member = guild.get_member(user_id) or await guild.fetch_member(user_id)
+            member = payload.member or await MEMBERS.get(guild, user_id)
             if member:
                 channel = self.bot.get_channel(payload.channel_id)
                 await channel.send(f"{member.mention} ❌ You are on cooldown for {remaining} more seconds.",
@@ -227,7 +107,7 @@ class RocketShop(commands.Cog):
             self.user_cooldowns[user_id] = now + COOLDOWN_SECONDS
             self.user_reaction_counts[user_id] = [0, 0]
             guild = self.bot.get_guild(payload.guild_id)
-            member = guild.get_member(user_id) or await guild.fetch_member(user_id)
+            member = payload.member or await MEMBERS.get(guild, user_id)
             if member:
                 channel = self.bot.get_channel(payload.channel_id)
                 await channel.send(
@@ -236,12 +116,11 @@ class RocketShop(commands.Cog):
             return
 
         guild = self.bot.get_guild(payload.guild_id)
-        member = guild.get_member(user_id) or await guild.fetch_member(user_id)
+        member = payload.member or await MEMBERS.get(guild, user_id)
         if not member:
             return
 
         await self.load_shop_items()
-        await self.load_leaderboard()
 
         # find item by emoji
         for item in self.shop_items:
@@ -295,28 +174,32 @@ class ConfirmPurchaseView(ui.View):
 
     @ui.button(label="Buy", style=discord.ButtonStyle.green)
     async def buy(self, interaction: discord.Interaction, button: ui.Button):
-        user_gems = await self.cog.get_user_gems(self.member.id)
-        if user_gems < self.item["gems"]:
-            self.disable_all_buttons()
-            if interaction.message:
-                await interaction.message.delete()
-            await interaction.response.send_message(
+        # Disable the buttons first so a second click can't start another purchase
+        self.disable_all_buttons()
+        await interaction.response.edit_message(view=self)
+
+        # Debit and item grant commit together; the key is this confirmation message,
+        # so a repeated click on it replays the same result instead of buying again
+        balances = await purchase(
+            self.cog.bot, self.member, self.item["gems"], self.item["emoji"], self.item["name"],
+            key=f"buy:{interaction.message.id}"
+        )
+        if balances is None:
+            user_gems = await self.cog.get_user_gems(self.member.id)
+            await interaction.followup.send(
                 f"❌ Not enough gems for **{self.item['name']}**.\n💎 You have {user_gems:,} gems.",
                 ephemeral=True
             )
-            self.stop()
-            return
-
-        remain_gems = user_gems - self.item["gems"]
-        await self.cog.update_user_gems(self.member.id, remain_gems)
-        await self.cog.add_item_to_inventory(
-            self.member.id, self.item["name"], self.member.display_name, self.item["emoji"]
-        )
-        await interaction.response.send_message(
-            f"✅ You bought **{self.item['name']}**! Remaining gems: {remain_gems:,}", ephemeral=True
-        )
+        else:
+            remain_gems = balances[self.member.id]
+            await interaction.followup.send(
+                f"✅ You bought **{self.item['name']}**! Remaining gems: {remain_gems:,}", ephemeral=True
+            )
         if interaction.message:
-            await interaction.message.delete()
+            try:
+                await interaction.message.delete()
+            except discord.NotFound:
+                pass
         self.stop()
 
     @ui.button(label="Cancel", style=discord.ButtonStyle.red)
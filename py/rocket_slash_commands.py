@@ -1,13 +1,11 @@
 import discord
 import random
-import json
 import os
 import time
 from discord import app_commands
 from discord.ext import commands
 from discord.ui import View
-from helpers import is_admin, award_points
-import re
+from helpers import is_admin, credit, fetch_gems_leaderboard, gem_notice, CONTENT, DIGEST
 # ----------------- Button Styles ------------
 STYLE_MAP = {
     "success": discord.ButtonStyle.success,
@@ -17,7 +15,6 @@ STYLE_MAP = {
 
 # ----------------- Cooldown -----------------
 CLICK_TRACKER: dict[int, dict[str, list[float]]] = {}
-LEADERBOARD_CHANNEL_ID = int(os.getenv("LEADERBOARD_CHANNEL_ID", 0))
 # ----------------- Command Button -----------------
 class CommandButton(discord.ui.Button):
     def __init__(self, label: str, command: str, style: discord.ButtonStyle, bot: commands.Bot,
@@ -144,19 +141,7 @@ class RocketSlash(commands.Cog):
         channel_id = os.getenv("ADMIN_ROCKET_LIST_CHANNEL_ID")
         if not channel_id or not channel_id.isdigit():
             return None
-        channel = self.bot.get_channel(int(channel_id))
-        if not channel:
-            return None
-        async for msg in channel.history(limit=50):
-            if msg.attachments:
-                for att in msg.attachments:
-                    if att.filename.endswith(".json"):
-                        data_bytes = await att.read()
-                        try:
-                            return json.loads(data_bytes.decode("utf-8"))
-                        except Exception:
-                            continue
-        return None
+        return await CONTENT.json_attachment(self.bot, int(channel_id))
 
 
     # ----------------- Rocket Members -----------------
@@ -186,7 +171,8 @@ class RocketSlash(commands.Cog):
         if gems == 0:
             return await interaction.response.send_message("⚠️ Gems cannot be 0.", ephemeral=True)
 
-        await award_points(self.bot, member, gems, notify_channel=interaction.channel)
+        await credit(self.bot, member, gems, key=f"grant:{interaction.id}")
+        DIGEST.add(interaction.channel, [gem_notice(member.display_name, gems)])
 
         action = "rewarded to" if gems > 0 else "deducted from"
         await interaction.response.send_message(
@@ -204,47 +190,17 @@ class RocketSlash(commands.Cog):
             # Public announcement
             await interaction.response.defer(ephemeral=False)
 
-            channel = self.bot.get_channel(LEADERBOARD_CHANNEL_ID)
-            if not channel:
-                return await interaction.followup.send("⚠️ Leaderboard channel not found.")
-
-            # Fetch latest message
-            msg = None
-            async for m in channel.history(limit=5, oldest_first=False):
-                if m.content:
-                    msg = m
-                    break
-
-            if not msg:
-                return await interaction.followup.send("⚠️ No leaderboard message found.")
-
-            # Parse leaderboard
-            leaderboard = []
-            for line in msg.content.splitlines():
-                parts = [p.strip() for p in line.split("-")]
-                if len(parts) < 3:
-                    continue
-                name_str, uid_str, points_str = parts[-3], parts[-2], parts[-1]
-                try:
-                    uid = int(re.sub(r"\D", "", uid_str))
-                    points = int(re.sub(r"\D", "", points_str))
-                except ValueError:
-                    continue
-                leaderboard.append((name_str, uid, points))
-
+            # Top 10 balances straight from the gems ledger
+            leaderboard = await fetch_gems_leaderboard(limit=10)
             if not leaderboard:
-                return await interaction.followup.send("⚠️ Leaderboard is empty or malformed.")
-
-            # Sort by points descending, keep top 10
-            leaderboard.sort(key=lambda x: x[2], reverse=True)
-            leaderboard = leaderboard[:10]
+                return await interaction.followup.send("⚠️ Leaderboard is empty.")
 
             guild = interaction.guild
             lines = []
 
             lines.append("# 🎖️ TOP 🔟 ROCKET ELITES 🎖️\n")
 
-            for idx, (name, uid, points) in enumerate(leaderboard):
+            for idx, (uid, name, points) in enumerate(leaderboard):
                 member = guild.get_member(uid) if guild else None
                 # Only announce if member is still in the server
                 if not member:
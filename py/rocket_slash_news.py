@@ -3,9 +3,11 @@ import discord
 from discord import app_commands, Embed, Color, Button
 from discord.ext import commands
 from discord.ui import View
+from discord.ext import tasks
 import asyncio
 import random
-from helpers import check_main_guild
+from datetime import datetime, timezone, timedelta
+from helpers import check_main_guild, db
 # ---------------- Admin IDs from ENV ----------------
 ADMIN_IDS = set()
 admin_ids_str = os.getenv("ADMIN_IDS", "")
@@ -34,6 +36,24 @@ if channel_id_str.isdigit():
 else:
     ANNOUNCEMENT_CHANNEL_ID = 0
 
+# ---------------- Ticker engine ----------------
+TICKER_EDITS_PER_MINUTE = 6                  # shared by every active ticker
+TICKER_STEP = 16                             # characters per frame, snapped forward to a space
+TICKER_MAX_DURATION = timedelta(hours=1)     # stop animating after this long...
+TICKER_IDLE_TIMEOUT = timedelta(minutes=15)  # ...or once nobody has reacted for this long
+
+
+def ticker_frame(text: str, position: int) -> str:
+    text = text + "   "
+    return text[position:] + text[:position]
+
+
+def next_ticker_position(text: str, position: int) -> int:
+    text = text + "   "
+    position = (position + TICKER_STEP) % len(text)
+    space = text.find(" ", position)
+    return (space + 1) % len(text) if space != -1 else 0
+
 
 class RocketSlashNews(commands.Cog):
     MAX_ACTIVE_SCROLLS = 2  # limit simultaneous tickers
@@ -41,7 +61,107 @@ class RocketSlashNews(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.active_users_per_message = {}  # track reactions per announcement
-        self.active_scrolls = []
+        self.tickers = {}  # message_id -> ticker state (mirrors news_tickers)
+        self._next_ticker = 0
+
+    async def cog_load(self):
+        for row in await db.fetchall(
+            "SELECT message_id, channel_id, title, details, ticker, position, started_at, last_activity_at FROM news_tickers"
+        ):
+            message_id, channel_id, title, details, ticker, position, started_at, last_activity_at = row
+            self.tickers[message_id] = {
+                "channel_id": channel_id, "title": title, "details": details, "ticker": ticker,
+                "position": position, "started_at": datetime.fromisoformat(started_at),
+                "last_activity_at": datetime.fromisoformat(last_activity_at),
+            }
+        self.ticker_loop.start()
+
+    async def cog_unload(self):
+        self.ticker_loop.cancel()
+
+    # ---------------- Ticker scheduler ----------------
+    async def start_ticker(self, message: discord.Message, title: str, details: str, ticker: str):
+        if len(self.tickers) >= self.MAX_ACTIVE_SCROLLS:
+            return
+        now = datetime.now(timezone.utc)
+        self.tickers[message.id] = {
+            "channel_id": message.channel.id, "title": title, "details": details, "ticker": ticker,
+            "position": 0, "started_at": now, "last_activity_at": now,
+        }
+        await db.execute(
+            """
+            INSERT OR REPLACE INTO news_tickers
+                (message_id, channel_id, title, details, ticker, position, started_at, last_activity_at)
+            VALUES (?, ?, ?, ?, ?, 0, ?, ?)
+            """,
+            (message.id, message.channel.id, title, details, ticker, now.isoformat(), now.isoformat())
+        )
+
+    async def stop_ticker(self, message_id: int, final_edit: bool = True):
+        """Stop animating; the announcement is left showing the full ticker text."""
+        state = self.tickers.pop(message_id, None)
+        await db.execute("DELETE FROM news_tickers WHERE message_id=?", (message_id,))
+        if state and final_edit:
+            await self._render(message_id, state, 0)
+
+    async def _render(self, message_id: int, state: dict, position: int) -> bool:
+        channel = self.bot.get_channel(state["channel_id"])
+        if channel is None:
+            return False
+        embed = Embed(
+            title=state["title"],
+            description=f"{state['details']}\n\n📢 {ticker_frame(state['ticker'], position)}",
+            color=Color.red()
+        )
+        await channel.get_partial_message(message_id).edit(embed=embed)
+        return True
+
+    @tasks.loop(seconds=60 / TICKER_EDITS_PER_MINUTE)
+    async def ticker_loop(self):
+        """One edit per tick, round-robin over the active tickers, so the edit rate
+        stays at TICKER_EDITS_PER_MINUTE however many announcements are animating."""
+        # An unhandled error would end the loop and freeze every ticker until restart
+        try:
+            await self._tick()
+        except Exception as e:
+            print(f"[RocketNews] Ticker tick failed: {e}")
+
+    async def _tick(self):
+        if not self.tickers:
+            return
+        ids = sorted(self.tickers)
+        message_id = ids[self._next_ticker % len(ids)]
+        self._next_ticker += 1
+        state = self.tickers[message_id]
+
+        now = datetime.now(timezone.utc)
+        if now - state["started_at"] > TICKER_MAX_DURATION or now - state["last_activity_at"] > TICKER_IDLE_TIMEOUT:
+            try:
+                await self.stop_ticker(message_id)
+            except discord.HTTPException:
+                pass
+            return
+
+        position = next_ticker_position(state["ticker"], state["position"])
+        try:
+            rendered = await self._render(message_id, state, position)
+        except discord.NotFound:
+            rendered = False
+        except discord.HTTPException as e:
+            print(f"[RocketNews] Ticker edit failed: {e}")
+            return
+        if not rendered:
+            await self.stop_ticker(message_id, final_edit=False)
+            return
+        state["position"] = position
+        await db.execute(
+            "UPDATE news_tickers SET position=?, last_activity_at=? WHERE message_id=?",
+            (position, state["last_activity_at"].isoformat(), message_id)
+        )
+
+    @ticker_loop.before_loop
+    async def before_ticker_loop(self):
+        await self.bot.wait_until_ready()
 
     # ---------------- Rocket News Command ----------------
     @app_commands.command(
@@ -135,27 +255,18 @@ class RocketSlashNews(commands.Cog):
                 pass
 
         # ---------------- Scroll ticker ----------------
-        async def scroll_ticker():
-            if len(self.active_scrolls) >= self.MAX_ACTIVE_SCROLLS:
-                return
-            self.active_scrolls.append(embed_msg.id)
-            text = full_ticker + "   "
-            try:
-                while True:
-                    for i in range(len(text)):
-                        scroll = text[i:] + text[:i]
-                        embed.description = f"{details}\n\n📢 {scroll}"
-                        try:
-                            await embed_msg.edit(embed=embed)
-                        except discord.NotFound:
-                            return
-                        await asyncio.sleep(0.8)
-            finally:
-                self.active_scrolls.remove(embed_msg.id)
-
-        asyncio.create_task(scroll_ticker())
+        await self.start_ticker(embed_msg, embed.title, details, full_ticker)
 
     # ---------------- Reaction Listener ----------------
+    @commands.Cog.listener()
+    async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent):
+        # Raw, so tickers resumed after a restart (messages not in cache) still see activity
+        if payload.message_id not in self.tickers or payload.user_id == self.bot.user.id:
+            return
+        if payload.member and payload.member.bot:
+            return
+        self.tickers[payload.message_id]["last_activity_at"] = datetime.now(timezone.utc)
+
     @commands.Cog.listener()
     async def on_reaction_add(self, reaction: discord.Reaction, user: discord.User):
         if user.bot:
@@ -199,12 +310,8 @@ class RocketSlashNews(commands.Cog):
 
         rocket_texts = []
         for idx, uid in enumerate(tracker["users"]):
-            try:
-                member = reaction.message.guild.get_member(uid) or await reaction.message.guild.fetch_member(uid)
-                mention = member.mention
-            except discord.NotFound:
-                mention = f"<@{uid}>"
-            rocket_texts.append(f"{emojis[idx]} {idx+1}. {mention} — {order_texts[idx]}")
+            # A mention only needs the id, no member lookup
+            rocket_texts.append(f"{emojis[idx]} {idx+1}. <@{uid}> — {order_texts[idx]}")
 
         rocket_text = "\n".join(rocket_texts)
         chosen_gif = random.choice(GIF_CHOICES)
@@ -0,0 +1,67 @@
+import asyncio
+import os
+import sqlite3
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import helpers  # noqa: E402
+
+# e_date_records as the pre-migration bot created it (user_version 0)
+BASELINE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS e_date_records (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        guild_id INTEGER,
+        date TEXT,
+        user_id INTEGER,
+        e_date_sender_id INTEGER,
+        status TEXT,
+        reason TEXT,
+        timestamp TEXT
+    )
+"""
+
+
+def make_baseline_db(path, records=()):
+    """A rocket.db as the baseline bot left it: e_date_records only, user_version 0."""
+    conn = sqlite3.connect(path)
+    conn.execute(BASELINE_SCHEMA)
+    conn.executemany(
+        "INSERT INTO e_date_records (guild_id, date, user_id, e_date_sender_id, status, reason, timestamp) "
+        "VALUES (?, '2024-01-01', ?, ?, ?, '', '2024-01-01T00:00:00')",
+        records
+    )
+    conn.commit()
+    conn.close()
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def user(user_id, name=None):
+    """The parts of a discord user the gem helpers read."""
+    return SimpleNamespace(id=user_id, display_name=name or f"user{user_id}")
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """Point helpers at an empty database file and keep mirrors from touching Discord."""
+    path = str(tmp_path / "rocket.db")
+    monkeypatch.setattr(helpers, "db", helpers.Database(path))
+    monkeypatch.setattr(helpers.LEADERBOARD_MIRROR, "channel_id", 0)
+    monkeypatch.setattr(helpers.INVENTORY_MIRROR, "channel_id", 0)
+    helpers.INVENTORY._cache.clear()
+    return path
+
+
+@pytest.fixture
+def migrated_db(db_path):
+    """An empty database with every migration applied and no backfill left running."""
+    async def setup():
+        await (await helpers.init_db())
+    run(setup())
+    return db_path
@@ -0,0 +1,72 @@
+import helpers
+from conftest import run, user
+
+SENDER, RECEIVER = user(1, "Jessie"), user(2, "James")
+VACUUM = (SENDER.id, "🧹", "Meowth's Rare Gem Vacuum")
+
+
+def balance(user_id):
+    return run(helpers.get_user_gems(user_id))
+
+
+def test_require_funds_refuses_overdraft_and_writes_nothing(migrated_db):
+    run(helpers.credit(None, SENDER, 10))
+
+    assert run(helpers.debit(None, SENDER, 15)) is None
+    assert balance(SENDER.id) == 10
+    assert run(helpers.debit(None, SENDER, 10)) == {SENDER.id: 0}
+
+
+def test_negative_credit_is_allowed_without_require_funds(migrated_db):
+    assert run(helpers.credit(None, SENDER, -5)) == {SENDER.id: -5}
+
+
+def test_replayed_key_returns_stored_result_without_applying_again(migrated_db):
+    first = run(helpers.credit(None, SENDER, 7, key="grant:1"))
+    run(helpers.credit(None, SENDER, 3))
+    replay = run(helpers.credit(None, SENDER, 7, key="grant:1"))
+
+    assert first == replay == {SENDER.id: 7}
+    assert balance(SENDER.id) == 10
+
+
+def test_refused_transaction_does_not_burn_its_key(migrated_db):
+    assert run(helpers.debit(None, SENDER, 5, key="buy:1")) is None
+    run(helpers.credit(None, SENDER, 5))
+
+    assert run(helpers.debit(None, SENDER, 5, key="buy:1")) == {SENDER.id: 0}
+
+
+def test_purchase_debits_and_grants_the_item_together(migrated_db):
+    run(helpers.credit(None, SENDER, 50))
+
+    assert run(helpers.purchase(None, SENDER, 30, "🧹", VACUUM[2], key="buy:2")) == {SENDER.id: 20}
+    assert run(helpers.purchase(None, SENDER, 30, "🧹", VACUUM[2], key="buy:2")) == {SENDER.id: 20}
+    assert run(helpers.INVENTORY.count_item(SENDER.id, VACUUM[2])) == 1
+
+
+def test_transfer_consumes_the_item_with_the_gems(migrated_db):
+    run(helpers.credit(None, RECEIVER, 100))
+    run(helpers.INVENTORY.add_item(SENDER.id, SENDER.display_name, "🧹", VACUUM[2]))
+
+    balances = run(helpers.transfer(None, RECEIVER, SENDER, 20, key="vacuum:1", consume=VACUUM))
+
+    assert balances == {SENDER.id: 20, RECEIVER.id: 80}
+    assert run(helpers.INVENTORY.count_item(SENDER.id, VACUUM[2])) == 0
+
+
+def test_transfer_without_the_item_moves_nothing(migrated_db):
+    run(helpers.credit(None, RECEIVER, 100))
+
+    assert run(helpers.transfer(None, RECEIVER, SENDER, 20, key="vacuum:2", consume=VACUUM)) is None
+    assert balance(RECEIVER.id) == 100
+    assert balance(SENDER.id) == 0
+
+
+def test_transfer_without_funds_keeps_the_item(migrated_db):
+    run(helpers.credit(None, RECEIVER, 5))
+    run(helpers.INVENTORY.add_item(SENDER.id, SENDER.display_name, "🧹", VACUUM[2]))
+
+    assert run(helpers.transfer(None, RECEIVER, SENDER, 20, key="vacuum:3", consume=VACUUM)) is None
+    assert run(helpers.INVENTORY.count_item(SENDER.id, VACUUM[2])) == 1
+    assert balance(RECEIVER.id) == 5
@@ -0,0 +1,42 @@
+import pytest
+
+from helpers import parse_legacy_line, legacy_int, paginate_lines
+
+UID = 123456789012345678
+
+
+@pytest.mark.parametrize("line, expected", [
+    (f"Jessie - {UID} - 120", (UID, "Jessie", ["120"])),
+    (f"Jessie - {UID} - -50", (UID, "Jessie", ["-50"])),
+    (f"Mr. Mime-Fan - {UID} - 7", (UID, "Mr. Mime-Fan", ["7"])),
+    (f"James - {UID} | 🎁 2x Rose | 🧹 1x Meowth's Rare Gem Vacuum",
+     (UID, "James", ["🎁 2x Rose", "🧹 1x Meowth's Rare Gem Vacuum"])),
+    (f"Meowth - {UID} | -3", (UID, "Meowth", ["-3"])),
+    (f"Jessie — {UID} | a1 | b0 | c1 | d0 | YES", (UID, "Jessie", ["a1", "b0", "c1", "d0", "YES"])),
+    (f"{UID} | Rocket | 3x | spam", (UID, "", ["Rocket", "3x", "spam"])),
+    (f"Wobbuffet - {UID}", (UID, "Wobbuffet", [])),
+])
+def test_parse_legacy_line(line, expected):
+    assert parse_legacy_line(line) == expected
+
+
+@pytest.mark.parametrize("line", ["", "Daily Quest — 2024-05-01", "Jessie - 12345 - 10"])
+def test_parse_legacy_line_needs_a_user_id(line):
+    assert parse_legacy_line(line) is None
+
+
+@pytest.mark.parametrize("text, expected", [("120", 120), ("1,250 💎", 1250), ("3x", 3), ("-50", -50), ("none", None)])
+def test_legacy_int(text, expected):
+    assert legacy_int(text) == expected
+
+
+def test_paginate_lines_never_splits_a_line():
+    lines = [f"line {i} " + "x" * 30 for i in range(100)]
+    pages = paginate_lines(lines, limit=200)
+
+    assert all(len(page) <= 200 for page in pages)
+    assert "\n".join(pages).split("\n") == lines
+
+
+def test_paginate_lines_truncates_overlong_lines():
+    assert paginate_lines(["a" * 10, "b"], limit=4) == ["aaaa", "b"]
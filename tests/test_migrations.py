@@ -0,0 +1,107 @@
+import asyncio
+import sqlite3
+
+import helpers
+from conftest import make_baseline_db, run
+
+GUILD = 1
+
+
+def recount_points(path):
+    """e_date_points as they should be: one point per accepted record for each side."""
+    conn = sqlite3.connect(path)
+    rows = conn.execute(
+        """
+        SELECT guild_id, uid, COUNT(*) FROM (
+            SELECT guild_id, user_id AS uid FROM e_date_records WHERE status='yes'
+            UNION ALL
+            SELECT guild_id, e_date_sender_id FROM e_date_records WHERE status='yes'
+        ) GROUP BY guild_id, uid
+        """
+    ).fetchall()
+    conn.close()
+    return {(g, u): n for g, u, n in rows}
+
+
+def stored_points(path):
+    conn = sqlite3.connect(path)
+    rows = conn.execute("SELECT guild_id, user_id, points FROM e_date_points WHERE points != 0").fetchall()
+    conn.close()
+    return {(g, u): n for g, u, n in rows}
+
+
+def user_version(path):
+    conn = sqlite3.connect(path)
+    (version,) = conn.execute("PRAGMA user_version").fetchone()
+    conn.close()
+    return version
+
+
+def test_migrations_reach_latest_version_from_baseline(db_path):
+    make_baseline_db(db_path, [(GUILD, 10, 20, "yes"), (GUILD, 10, 30, "no"), (GUILD, 20, 30, "yes")])
+
+    async def migrate():
+        await (await helpers.init_db())
+    run(migrate())
+
+    assert user_version(db_path) == len(helpers.MIGRATIONS) == 12
+    assert stored_points(db_path) == {(GUILD, 10): 1, (GUILD, 20): 2, (GUILD, 30): 1}
+    conn = sqlite3.connect(db_path)
+    (done_at,) = conn.execute("SELECT done_at FROM schema_backfills WHERE name='e_date_points'").fetchone()
+    assert done_at is not None
+    assert conn.execute("SELECT COUNT(*) FROM e_date_records").fetchone() == (3,)
+    conn.close()
+
+
+def test_init_db_again_changes_nothing(db_path):
+    make_baseline_db(db_path, [(GUILD, 10, 20, "yes")])
+
+    async def migrate():
+        await (await helpers.init_db())
+    run(migrate())
+    run(migrate())
+
+    assert user_version(db_path) == len(helpers.MIGRATIONS)
+    assert stored_points(db_path) == {(GUILD, 10): 1, (GUILD, 20): 1}
+
+
+def test_backfill_pending_covers_only_unprocessed_rows(migrated_db):
+    conn = sqlite3.connect(migrated_db)
+    conn.execute("INSERT OR REPLACE INTO schema_backfills (name, last_id, end_id) VALUES ('demo', 5, 10)")
+    c = conn.cursor()
+    assert not helpers.backfill_pending(c, "demo", 5)   # already processed
+    assert helpers.backfill_pending(c, "demo", 6)
+    assert helpers.backfill_pending(c, "demo", 10)
+    assert not helpers.backfill_pending(c, "demo", 11)  # newer than the backfill, live path owns it
+    conn.execute("UPDATE schema_backfills SET done_at='x' WHERE name='demo'")
+    assert not helpers.backfill_pending(c, "demo", 6)
+    conn.close()
+
+
+def test_update_status_during_backfill_counts_each_record_once(db_path, monkeypatch):
+    # Pending requests spread over the whole range the backfill will walk
+    records = [(GUILD, 100 + i % 5, 200 + i % 7, "yes" if i % 3 == 0 else "pending") for i in range(1, 61)]
+    make_baseline_db(db_path, records)
+
+    async def scenario():
+        # Migrate without starting the backfill, then run it in small chunks next to live writes
+        run_backfills = helpers.run_backfills
+        monkeypatch.setattr(helpers, "run_backfills", lambda: asyncio.sleep(0))
+        await (await helpers.init_db())
+        backfill = asyncio.create_task(run_backfills(chunk_size=4))
+
+        for record_id in range(1, 61):
+            if record_id % 3 == 1:
+                await helpers.update_status(record_id, "yes")
+            elif record_id % 3 == 0 and record_id % 2 == 0:
+                await helpers.update_status(record_id, "no")  # un-accept a counted record
+            await asyncio.sleep(0)
+        # Requests created after the backfill was queued are always the live path's
+        await helpers.insert_record(GUILD, 100, 300)
+        (new_id,) = await helpers.db.fetchone("SELECT MAX(id) FROM e_date_records")
+        await helpers.update_status(new_id, "yes")
+        await backfill
+
+    run(scenario())
+
+    assert stored_points(db_path) == recount_points(db_path)